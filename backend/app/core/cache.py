@@ -0,0 +1,269 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe in-process cache for rarely changing reference data (weights, skill list, ...).
+
+    - ttl: seconds an entry stays fresh (0 = until invalidated)
+    - max_entries: least recently used entry is evicted past this size (0 = unbounded)
+
+        weights_cache: TTLCache[str, Weights] = register_cache("weights")
+        weights = weights_cache.get_or_load("current", _load_weights)
+        ...
+        weights_cache.invalidate()  # after a write
+
+    Writers must call invalidate() after committing; the TTL only bounds staleness for
+    writes that bypass the service layer (imports, manual SQL).
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 0):
+        self.name = name
+        self.ttl = max(0.0, float(ttl))
+        self.max_entries = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: Dict[K, Tuple[V, float]] = {}  # key -> (value, loaded_at)
+        self._generation = 0  # bumped by invalidate(); stale loads are not stored
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return self.ttl == 0 or (time.monotonic() - loaded_at) < self.ttl
+
+    def _hit(self, key: K) -> Optional[Tuple[V, float]]:
+        """Fresh entry for key (moved to most-recently-used), else None. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None or not self._fresh(entry[1]):
+            return None
+        self._entries[key] = self._entries.pop(key)
+        self._stats["hits"] += 1
+        return entry
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._hit(key)
+            if entry is not None:
+                return entry[0]
+            self._stats["misses"] += 1
+            return None
+
+    def get_or_load(self, key: K, loader: Callable[[], V]) -> V:
+        with self._lock:
+            entry = self._hit(key)
+            if entry is not None:
+                return entry[0]
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        # load outside the lock; concurrent misses may both hit the database, which is fine here
+        value = loader()
+        self.set(key, value, generation)
+        return value
+
+    def set(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return  # invalidated while loading: don't cache a possibly stale value
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.monotonic())
+            if self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        """Drop one key, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+            size = len(self._entries)
+        lookups = s["hits"] + s["misses"]
+        return {
+            "ttl_s": self.ttl,
+            "max_entries": self.max_entries,
+            "size": size,
+            **s,
+            "hit_ratio": round(s["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+class DiskLRUCache:
+    """
+    Size-bounded cache of JSON documents on disk (e.g. PDF checker reports), shared by
+    every process that uses the same directory.
+
+    - directory: entries live in <directory>/<key[:2]>/<key>.json (created on first write)
+    - max_bytes: past this total the least recently used entries (file mtime, refreshed
+      on every hit) are deleted down to 90% of it; 0 disables the cache
+
+        report = reports_cache.get(key)
+        if report is None:
+            report = run_checker(...)
+            reports_cache.set(key, report)
+
+    Keys must be filename-safe (hex digests). Writes go to a temp file and are renamed
+    into place, so readers never see partial entries. The running size is an estimate per
+    process; crossing the limit triggers a directory scan that recomputes it exactly.
+    """
+
+    LOW_WATER = 0.9
+
+    def __init__(self, name: str, directory: str, max_bytes: int):
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # lazily scanned
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _scan(self) -> list:
+        """[(mtime, size, path)] of all entries, oldest first."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for f in os.scandir(sub.path):
+                if f.name.endswith(".json"):
+                    try:
+                        st = f.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, f.path))
+        entries.sort()
+        return entries
+
+    def _evict(self) -> None:
+        """Delete oldest entries down to LOW_WATER * max_bytes. Caller holds the lock."""
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.LOW_WATER
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                self._stats["evictions"] += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.max_bytes:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            value = None
+        except (OSError, ValueError):  # unreadable / truncated entry: drop it
+            value = None
+            with self._lock:
+                self._stats["errors"] += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.max_bytes:
+            return
+        data = json.dumps(value).encode("utf-8")
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Warning: could not write cache entry {path}: {e}")
+            with self._lock:
+                self._stats["errors"] += 1
+            return
+        with self._lock:
+            self._stats["writes"] += 1
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, path in self._scan():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+            size = self._size
+        lookups = s["hits"] + s["misses"]
+        return {
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "size_bytes": size,
+            **s,
+            "hit_ratio": round(s["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+_registry: Dict[str, Any] = {}  # name -> TTLCache / DiskLRUCache
+_registry_lock = threading.Lock()
+
+
+def register_cache(name: str, ttl: Optional[float] = None, max_entries: int = 0) -> TTLCache:
+    """Create (or return the existing) named cache; ttl defaults to settings.CACHE_TTL_S."""
+    with _registry_lock:
+        cache = _registry.get(name)
+        if cache is None:
+            cache = TTLCache(name, settings.CACHE_TTL_S if ttl is None else ttl, max_entries)
+            _registry[name] = cache
+        return cache
+
+
+def register_disk_cache(name: str, directory: str, max_bytes: int) -> DiskLRUCache:
+    """Create (or return the existing) named on-disk cache; listed in get_cache_stats()."""
+    with _registry_lock:
+        cache = _registry.get(name)
+        if cache is None:
+            cache = DiskLRUCache(name, directory, max_bytes)
+            _registry[name] = cache
+        return cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {c.name: c.stats() for c in caches}
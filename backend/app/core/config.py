@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import List
 from urllib.parse import urlparse
 from dotenv import load_dotenv
@@ -79,6 +80,55 @@ class Settings:
     def DB_NAME(self) -> str:
         return self._db_cfg["name"]
 
+    # Connection pool (see app.core.database.ConnectionPool)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_POOL_MAX_OVERFLOW: int = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait when exhausted
+    DB_POOL_MAX_LIFETIME: float = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))  # recycle after N seconds
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    # Rows per multi-row INSERT in bulk writes (see app.core.database.execute_batched)
+    DB_BULK_CHUNK_SIZE: int = int(os.getenv("DB_BULK_CHUNK_SIZE", "500"))
+
+    # Reference-data cache (see app.core.cache.TTLCache); 0 = keep until invalidated
+    CACHE_TTL_S: float = float(os.getenv("CACHE_TTL_S", "300"))
+    # Memoized assignment results kept (LRU, keyed by input fingerprint)
+    ASSIGNMENT_CACHE_SIZE: int = int(os.getenv("ASSIGNMENT_CACHE_SIZE", "16"))
+
+    # Background jobs (see app.core.jobs.JobManager)
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_HISTORY_SIZE: int = int(os.getenv("JOB_HISTORY_SIZE", "100"))  # finished jobs kept for polling
+    # GET /run-assignment waits this long for the run, then answers 202 with the job id
+    RUN_ASSIGNMENT_WAIT_S: float = float(os.getenv("RUN_ASSIGNMENT_WAIT_S", "20"))
+
+    # PDF checkers: processes for per-page analysis (0 = one per CPU, 1 = sequential)
+    CHECKER_PAGE_WORKERS: int = int(os.getenv("CHECKER_PAGE_WORKERS", "0"))
+    # Single-file checks waiting or running before routes answer 503 + Retry-After
+    CHECKER_QUEUE_DEPTH: int = int(os.getenv("CHECKER_QUEUE_DEPTH", "8"))
+    # Checker uploads: size limit per PDF, kept in memory up to CHECKER_INMEMORY_UPLOAD_MB,
+    # otherwise spilled to CHECKER_SCRATCH_DIR (removed after the check; the janitor removes
+    # leftovers older than SCRATCH_MAX_AGE_S every SCRATCH_JANITOR_INTERVAL_S)
+    CHECKER_MAX_UPLOAD_MB: float = float(os.getenv("CHECKER_MAX_UPLOAD_MB", "50"))
+    CHECKER_INMEMORY_UPLOAD_MB: float = float(os.getenv("CHECKER_INMEMORY_UPLOAD_MB", "16"))
+    CHECKER_SCRATCH_DIR: str = os.getenv(
+        "CHECKER_SCRATCH_DIR", os.path.join(tempfile.gettempdir(), "checker_scratch")
+    )
+    SCRATCH_MAX_AGE_S: float = float(os.getenv("SCRATCH_MAX_AGE_S", "3600"))
+    SCRATCH_JANITOR_INTERVAL_S: float = float(os.getenv("SCRATCH_JANITOR_INTERVAL_S", "600"))
+    # Batch endpoint: files checked at once across all batch requests (0 = CHECKER_PAGE_WORKERS),
+    # max files per batch, and batch requests in progress before new ones get 503 + Retry-After
+    CHECKER_BATCH_CONCURRENCY: int = int(os.getenv("CHECKER_BATCH_CONCURRENCY", "0"))
+    CHECKER_BATCH_MAX_FILES: int = int(os.getenv("CHECKER_BATCH_MAX_FILES", "500"))
+    CHECKER_BATCH_QUEUE_DEPTH: int = int(os.getenv("CHECKER_BATCH_QUEUE_DEPTH", "2"))
+    # Checker report cache on disk, keyed by PDF content hash (0 MB = disabled)
+    CHECKER_CACHE_DIR: str = os.getenv(
+        "CHECKER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "checker_report_cache")
+    )
+    CHECKER_CACHE_MAX_MB: float = float(os.getenv("CHECKER_CACHE_MAX_MB", "256"))
+    # Per-stage wall time and allocated bytes in checker reports ("timings") and the
+    # /api/metrics/checker-timings histograms; costs some speed (tracemalloc), off by default
+    CHECKER_TIMINGS: bool = os.getenv("CHECKER_TIMINGS", "false").lower() in ("1", "true", "yes")
+
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecret")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     
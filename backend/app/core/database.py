@@ -1,12 +1,21 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
 from app.core.config import settings
 
 
 def get_db_connection():
     """
-    Creates and returns a new database connection.
+    Creates and returns a new (unpooled) database connection.
     Automatically pulls credentials from settings.py
+
+    Services should use db_connection() instead; this is the raw factory the pool uses.
     """
     try:
         connection = mysql.connector.connect(
@@ -23,3 +32,267 @@ def get_db_connection():
     except Error as e:
         print("Database connection error:", e)
         raise e
+
+
+class ConnectionPool:
+    """
+    Thread-safe MySQL connection pool.
+
+    - size: connections kept open when idle
+    - max_overflow: extra connections opened under load, closed again on release
+    - timeout: seconds to wait for a free connection once size + max_overflow are in use
+      (0 = fail immediately); raises PoolError when exceeded
+    - max_lifetime: seconds before a connection is recycled (0 = never)
+    - pre_ping: check idle connections are alive before handing them out
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_overflow: int,
+        timeout: float,
+        max_lifetime: float,
+        pre_ping: bool = True,
+        connect=get_db_connection,
+    ):
+        self.size = max(1, int(size))
+        self.max_overflow = max(0, int(max_overflow))
+        self.timeout = max(0.0, float(timeout))
+        self.max_lifetime = max(0.0, float(max_lifetime))
+        self.pre_ping = pre_ping
+        self._connect = connect
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: Deque[Tuple[Any, float]] = deque()  # (connection, created_at)
+        self._created_at: Dict[int, float] = {}  # id(connection) -> created_at, for checked-out ones
+        self._open = 0  # idle + checked out
+
+        self._stats = {
+            "acquired": 0,
+            "created": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "timeouts": 0,
+            "discarded": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    # ---- internal ----
+    def _expired(self, created_at: float) -> bool:
+        return self.max_lifetime > 0 and (time.monotonic() - created_at) > self.max_lifetime
+
+    def _close_quietly(self, conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _open_new(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["created"] += 1
+            self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    # ---- public ----
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            stale = None
+            with self._cond:
+                while not self._idle and self._open >= self.size + self.max_overflow:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolError(
+                            f"Connection pool exhausted ({self._open} open, waited {self.timeout:.1f}s)"
+                        )
+                    self._cond.wait(remaining)
+
+                waited_ms = (time.monotonic() - start) * 1000.0
+
+                if self._idle:
+                    conn, created_at = self._idle.pop()
+                else:
+                    conn, created_at = None, 0.0
+                    self._open += 1  # reserve a slot before connecting outside the lock
+
+            if conn is None:
+                conn = self._open_new()
+                break
+
+            # health checks outside the lock
+            if self._expired(created_at):
+                stale = "recycled"
+            elif self.pre_ping and not conn.is_connected():
+                stale = "ping_failures"
+
+            if stale is None:
+                with self._cond:
+                    self._created_at[id(conn)] = created_at
+                break
+
+            self._close_quietly(conn)
+            with self._cond:
+                self._stats[stale] += 1
+                self._open -= 1
+                self._cond.notify()
+
+        with self._cond:
+            self._stats["acquired"] += 1
+            self._stats["wait_ms_total"] += waited_ms
+            self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], waited_ms)
+        return conn
+
+    def release(self, conn) -> None:
+        with self._cond:
+            created_at = self._created_at.pop(id(conn), None)
+        if created_at is None:
+            return  # not ours / already released
+
+        keep = True
+        try:
+            # drop any uncommitted work so the next user starts a fresh transaction/snapshot
+            conn.rollback()
+            # and undo a USE <other schema> the borrower may have run (COM_INIT_DB)
+            conn.database = settings.DB_NAME
+        except Exception:
+            keep = False
+
+        with self._cond:
+            if keep and len(self._idle) < self.size and not self._expired(created_at):
+                self._idle.append((conn, created_at))
+                conn = None
+            else:
+                self._stats["discarded"] += 1
+                self._open -= 1
+            self._cond.notify()
+
+        if conn is not None:
+            self._close_quietly(conn)
+
+    def dispose(self) -> None:
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            s = dict(self._stats)
+            in_use = len(self._created_at)
+            idle = len(self._idle)
+            opened = self._open
+        acquired = s["acquired"]
+        return {
+            "size": self.size,
+            "max_overflow": self.max_overflow,
+            "timeout_s": self.timeout,
+            "max_lifetime_s": self.max_lifetime,
+            "pre_ping": self.pre_ping,
+            "open": opened,
+            "in_use": in_use,
+            "idle": idle,
+            "overflow": max(0, opened - self.size),
+            **s,
+            "wait_ms_total": round(s["wait_ms_total"], 3),
+            "wait_ms_max": round(s["wait_ms_max"], 3),
+            "wait_ms_avg": round(s["wait_ms_total"] / acquired, 3) if acquired else 0.0,
+        }
+
+
+pool = ConnectionPool(
+    size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+    timeout=settings.DB_POOL_TIMEOUT,
+    max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+    pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+
+@contextmanager
+def db_connection() -> Iterator[Any]:
+    """
+    Borrow a pooled connection:
+
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            ...
+            conn.commit()
+
+    Uncommitted work is rolled back when the block exits. Do not close the connection yourself.
+    """
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    return pool.stats()
+
+
+def fetch_related(
+    cursor,
+    query: str,
+    ids: Sequence[Any],
+    key: str,
+    chunk_size: int = 1000,
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    Batched relation loader (avoids one query per parent row, i.e. N+1).
+
+    `query` must contain an "{ids}" placeholder inside IN (...) and select the `key` column,
+    and `cursor` must be a dictionary cursor:
+
+        prefs = fetch_related(cursor, '''
+            SELECT ppt.professor_id, t.ta_id, t.name
+            FROM professor_preferred_ta ppt JOIN ta t ON ppt.ta_id = t.ta_id
+            WHERE ppt.professor_id IN ({ids})
+        ''', professor_ids, key="professor_id")
+
+    Runs one statement per `chunk_size` ids and returns {key value: [row, ...]} with the
+    key column removed from each row. Row order within a group follows the result set.
+    """
+    grouped: Dict[Any, List[Dict[str, Any]]] = {}
+    unique_ids = list(dict.fromkeys(ids))
+    for start in range(0, len(unique_ids), chunk_size):
+        chunk = unique_ids[start:start + chunk_size]
+        cursor.execute(query.format(ids=",".join(["%s"] * len(chunk))), chunk)
+        for row in (cursor.fetchall() or []):
+            grouped.setdefault(row.pop(key), []).append(row)
+    return grouped
+
+
+def execute_batched(
+    cursor,
+    query: str,
+    rows: Sequence[Sequence[Any]],
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    Batched writer (avoids one INSERT round trip per row).
+
+    `query` is a single-row statement, e.g. "INSERT INTO t (a, b) VALUES (%s, %s)". Rows are
+    sent through cursor.executemany in chunks of `chunk_size` (default
+    settings.DB_BULK_CHUNK_SIZE); mysql-connector rewrites each chunk into one multi-row
+    INSERT. Runs inside the caller's transaction and does not commit.
+    Returns the number of rows sent.
+    """
+    size = max(1, int(chunk_size or settings.DB_BULK_CHUNK_SIZE))
+    rows = list(rows)
+    for start in range(0, len(rows), size):
+        cursor.executemany(query, rows[start:start + size])
+    return len(rows)
@@ -0,0 +1,130 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class ExecutorBusy(Exception):
+    """Raised by BoundedExecutor.run when its queue is full; retry_after is in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking work called from async routes, with admission control.
+
+    - workers: threads running tasks
+    - max_pending: tasks queued or running; past this run() raises ExecutorBusy right away
+      instead of letting the queue (and every caller's wait) grow without bound
+
+        try:
+            report = await checker_executor.run(run_checker_cached, "comp590", pdf_path)
+        except ExecutorBusy as e:
+            raise HTTPException(503, str(e), headers={"Retry-After": str(e.retry_after)})
+
+    Retry-After is estimated from the average task time and the current backlog.
+    """
+
+    def __init__(self, name: str, workers: int, max_pending: int):
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.max_pending = max(self.workers, int(max_pending))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._avg_s: Optional[float] = None  # moving average of task durations
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+    def _retry_after(self) -> int:
+        """Seconds until a slot is likely free. Caller holds the lock."""
+        per_task = self._avg_s if self._avg_s is not None else 1.0
+        return max(1, math.ceil(per_task * self._pending / self.workers))
+
+    def _call(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._running += 1
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - t0
+            with self._lock:
+                self._running -= 1
+                self._stats["completed" if ok else "failed"] += 1
+                self._avg_s = elapsed if self._avg_s is None else 0.8 * self._avg_s + 0.2 * elapsed
+
+    def _release(self, _future: Any) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue fn(*args, **kwargs); raises ExecutorBusy when full. The future's done
+        callbacks also fire if the task is cancelled before it starts (use them for cleanup)."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise ExecutorBusy(self._retry_after())
+            self._pending += 1
+            self._stats["submitted"] += 1
+        future = self._executor.submit(self._call, fn, args, kwargs)
+        future.add_done_callback(self._release)
+        return future
+
+    def retry_after(self) -> int:
+        """Current Retry-After estimate (seconds), e.g. for callers doing their own admission."""
+        with self._lock:
+            return self._retry_after()
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run fn(*args, **kwargs) on the pool and await it; raises ExecutorBusy when full."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                **self._stats,
+                "avg_task_ms": round(self._avg_s * 1000.0, 1) if self._avg_s is not None else None,
+            }
+
+
+_registry: Dict[str, BoundedExecutor] = {}
+_registry_lock = threading.Lock()
+
+
+def register_executor(name: str, workers: int, max_pending: int) -> BoundedExecutor:
+    """Create (or return the existing) named executor; listed in get_executor_stats()."""
+    with _registry_lock:
+        executor = _registry.get(name)
+        if executor is None:
+            executor = BoundedExecutor(name, workers, max_pending)
+            _registry[name] = executor
+        return executor
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    with _registry_lock:
+        executors = list(_registry.values())
+    return {e.name: e.stats() for e in executors}
+
+
+def shutdown_executors() -> None:
+    with _registry_lock:
+        executors = list(_registry.values())
+    for e in executors:
+        e.shutdown()
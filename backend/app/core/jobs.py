@@ -0,0 +1,156 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+
+class JobManager:
+    """
+    In-process background jobs (no Redis/broker): a thread pool plus a status table.
+
+    - workers: concurrent jobs; further submissions wait in the executor's queue
+    - history: finished jobs kept for polling (oldest dropped first)
+
+        job, coalesced = jobs.submit("run-assignment", work, phases=("load", "persist"),
+                                     coalesce_key="run-assignment:my_db")
+        ...
+        def work(report):
+            report("load")
+            ...
+            return result
+
+    With a coalesce_key, at most one queued/running job exists per key; submitting
+    again while it is active returns that job (coalesced=True) instead of starting another.
+    Jobs live in this process only: they are lost on restart and not shared between workers.
+    """
+
+    def __init__(self, workers: int, history: int):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="job")
+        self.history = max(1, int(history))
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._active_by_key: Dict[str, str] = {}
+
+    # ---- internal ----
+    def _update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond `history`. Caller holds the lock."""
+        finished = [jid for jid, j in self._jobs.items() if j["status"] in ("succeeded", "failed")]
+        for jid in finished[:max(0, len(finished) - self.history)]:
+            self._jobs.pop(jid, None)
+            self._futures.pop(jid, None)
+
+    def _run(self, job_id: str, fn: Callable[[Callable[[str], None]], Any]) -> Any:
+        def report(phase: str) -> None:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                job["phase"] = phase
+                job["phase_history"].append({"phase": phase, "at": time.time()})
+                if phase in job["phases"]:
+                    job["progress"] = round(job["phases"].index(phase) / len(job["phases"]), 3)
+
+        self._update(job_id, status="running", started_at=time.time())
+        try:
+            result = fn(report)
+        except Exception as e:
+            traceback.print_exc()
+            self._finish(job_id, status="failed", error=str(e))
+            raise
+        self._finish(job_id, status="succeeded", result=result, progress=1.0)
+        return result
+
+    def _finish(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields, finished_at=time.time())
+            key = job.get("coalesce_key")
+            if key is not None and self._active_by_key.get(key) == job_id:
+                del self._active_by_key[key]
+            self._prune()
+
+    # ---- public ----
+    def submit(
+        self,
+        kind: str,
+        fn: Callable[[Callable[[str], None]], Any],
+        phases: Sequence[str] = (),
+        coalesce_key: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Queue fn(report); returns (job snapshot, coalesced)."""
+        with self._lock:
+            if coalesce_key is not None:
+                active_id = self._active_by_key.get(coalesce_key)
+                if active_id is not None and active_id in self._jobs:
+                    return self._public(self._jobs[active_id]), True
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "kind": kind,
+                "params": dict(params or {}),
+                "coalesce_key": coalesce_key,
+                "status": "queued",
+                "phases": list(phases),
+                "phase": None,
+                "phase_history": [],
+                "progress": 0.0,
+                "result": None,
+                "error": None,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+            }
+            if coalesce_key is not None:
+                self._active_by_key[coalesce_key] = job_id
+            # submit under the lock so a fast job can't finish before it is registered
+            self._futures[job_id] = self._executor.submit(self._run, job_id, fn)
+            return self._public(self._jobs[job_id]), False
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._public(job, include_result) if job is not None else None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """Block until the job finishes; returns its result or re-raises its exception."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is None:
+            raise KeyError(job_id)
+        return future.result(timeout=timeout)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest first, without results."""
+        with self._lock:
+            recent = list(self._jobs.values())[-int(limit):] if limit > 0 else []
+            return [self._public(j, include_result=False) for j in reversed(recent)]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _public(job: Dict[str, Any], include_result: bool = True) -> Dict[str, Any]:
+        out = {k: v for k, v in job.items() if k != "coalesce_key"}
+        out["phase_history"] = list(job["phase_history"])
+        if not include_result:
+            out.pop("result", None)
+        return out
+
+
+jobs = JobManager(workers=settings.JOB_WORKERS, history=settings.JOB_HISTORY_SIZE)
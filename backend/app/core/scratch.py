@@ -0,0 +1,201 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+from app.core.config import settings
+
+
+class UploadTooLarge(Exception):
+    """An upload exceeded its size limit while being received."""
+
+    def __init__(self, limit_bytes: int):
+        super().__init__(f"File too large (max {limit_bytes // (1024 * 1024)} MB).")
+        self.limit_bytes = limit_bytes
+
+
+_lock = threading.Lock()
+_active: Dict[str, "ScratchArea"] = {}  # id -> area, for bytes-in-flight and the janitor
+_stats = {
+    "bytes_in_flight": 0,
+    "peak_bytes_in_flight": 0,
+    "uploads_in_memory": 0,
+    "uploads_on_disk": 0,
+    "rejected_too_large": 0,
+    "janitor_runs": 0,
+    "janitor_removed_dirs": 0,
+    "janitor_last_run_at": None,
+}
+
+
+def scratch_root() -> str:
+    return settings.CHECKER_SCRATCH_DIR
+
+
+class ScratchArea:
+    """
+    Per-request scratch space for uploads: a directory under CHECKER_SCRATCH_DIR (created
+    on first use) plus accounting of the bytes it holds, in memory or on disk.
+
+        area = ScratchArea("pdf_")
+        try:
+            data, digest = await area.receive(upload, max_bytes=..., memory_limit=...)
+            ...
+        finally:
+            area.cleanup()
+
+    cleanup() is idempotent. If the process dies first, the janitor removes the
+    directory once it is older than SCRATCH_MAX_AGE_S.
+    """
+
+    def __init__(self, prefix: str = "upload_"):
+        self.prefix = prefix
+        self.bytes = 0
+        self._path: Optional[str] = None
+        self._closed = False
+        with _lock:
+            _active[str(id(self))] = self
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            os.makedirs(scratch_root(), exist_ok=True)
+            self._path = tempfile.mkdtemp(prefix=self.prefix, dir=scratch_root())
+        return self._path
+
+    def add_bytes(self, n: int) -> None:
+        with _lock:
+            self.bytes += n
+            _stats["bytes_in_flight"] += n
+            _stats["peak_bytes_in_flight"] = max(_stats["peak_bytes_in_flight"], _stats["bytes_in_flight"])
+
+    async def receive(
+        self,
+        upload: Any,
+        max_bytes: int,
+        memory_limit: int = 0,
+        filename: str = "upload.pdf",
+        chunk_size: int = 1024 * 1024,
+    ) -> Tuple[Union[bytes, str], str]:
+        """
+        Read upload (anything with `await read(n)`) in chunks, hashing as it goes.
+        Returns (bytes, sha256) when it fits in memory_limit, else (path in this area, sha256)
+        after spilling to disk. Raises UploadTooLarge past max_bytes.
+        """
+        digest = hashlib.sha256()
+        buf = bytearray()
+        f = None
+        path = None
+        total = 0
+        try:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > max_bytes:
+                    with _lock:
+                        _stats["rejected_too_large"] += 1
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                self.add_bytes(len(chunk))
+                if f is None and total <= memory_limit:
+                    buf += chunk
+                    continue
+                if f is None:  # spill what we have so far
+                    path = os.path.join(self.path, os.path.basename(filename) or "upload.pdf")
+                    f = open(path, "wb")
+                    f.write(buf)
+                    buf = bytearray()
+                f.write(chunk)
+        finally:
+            if f is not None:
+                f.close()
+
+        with _lock:
+            _stats["uploads_on_disk" if path else "uploads_in_memory"] += 1
+        return (path if path else bytes(buf)), digest.hexdigest()
+
+    def cleanup(self) -> None:
+        with _lock:
+            if self._closed:
+                return
+            self._closed = True
+            _active.pop(str(id(self)), None)
+            _stats["bytes_in_flight"] -= self.bytes
+        if self._path is not None:
+            shutil.rmtree(self._path, ignore_errors=True)
+
+
+def sweep(max_age_s: Optional[float] = None) -> int:
+    """Remove scratch directories older than max_age_s that no live area owns; returns count."""
+    max_age = settings.SCRATCH_MAX_AGE_S if max_age_s is None else max_age_s
+    root = scratch_root()
+    with _lock:
+        live = {a._path for a in _active.values() if a._path}
+    removed = 0
+    cutoff = time.time() - max_age
+    if os.path.isdir(root):
+        for entry in os.scandir(root):
+            try:
+                if entry.path in live or entry.stat().st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+            removed += 1
+    with _lock:
+        _stats["janitor_runs"] += 1
+        _stats["janitor_removed_dirs"] += removed
+        _stats["janitor_last_run_at"] = time.time()
+    return removed
+
+
+_janitor: Optional[threading.Thread] = None
+_janitor_stop = threading.Event()
+
+
+def start_janitor() -> None:
+    """Sweep now (leftovers from a crash) and then every SCRATCH_JANITOR_INTERVAL_S."""
+    global _janitor
+    if _janitor is not None:
+        return
+    _janitor_stop.clear()
+
+    def loop():
+        while True:
+            try:
+                removed = sweep()
+                if removed:
+                    print(f"Scratch janitor: removed {removed} stale upload dir(s)")
+            except Exception as e:
+                print(f"Warning: scratch janitor failed: {e}")
+            if _janitor_stop.wait(settings.SCRATCH_JANITOR_INTERVAL_S):
+                return
+
+    _janitor = threading.Thread(target=loop, name="scratch-janitor", daemon=True)
+    _janitor.start()
+
+
+def stop_janitor() -> None:
+    global _janitor
+    _janitor_stop.set()
+    _janitor = None
+
+
+def get_scratch_stats() -> Dict[str, Any]:
+    with _lock:
+        return {
+            "directory": scratch_root(),
+            "active_uploads": len(_active),
+            **_stats,
+        }
@@ -2,7 +2,11 @@ import os
 from pathlib import Path
 from fastapi import FastAPI
 from app.core.config import settings
-from app.core.database import get_db_connection
+from app.core.database import get_db_connection, pool
+from app.core.executor import shutdown_executors
+from app.core.scratch import start_janitor, stop_janitor
+from app.core.jobs import jobs
+from app.services.checker_pool import shutdown_page_pool
 from app.routes import algorithm
 from app.routes import algorithm_excel
 from app.routes import assignment
@@ -24,6 +28,8 @@ from app.routes import register_finish
 from app.routes import users
 from app.routes.assignment_history import router as assignment_history_router
 from app.routes import import_excel
+from app.routes import metrics
+from app.routes import jobs as jobs_routes
 from fastapi.middleware.cors import CORSMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
@@ -43,31 +49,35 @@ def init_database_schema():
             print(f"⚠️  Schema file not found at {schema_path}, skipping schema initialization.")
             return
         
+        # a raw connection, closed afterwards: schema.sql runs USE <its schema>, which must
+        # not leak into a pooled connection
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
         try:
-            with open(schema_path, "r") as f:
-                sql_commands = f.read()
+            cursor = conn.cursor()
+        
+            try:
+                with open(schema_path, "r") as f:
+                    sql_commands = f.read()
             
-            # Execute each command (split by semicolon)
-            for command in sql_commands.split(";"):
-                command = command.strip()
-                if command and not command.startswith("--"):
-                    try:
-                        cursor.execute(command)
-                    except Exception as e:
-                        # Ignore errors for CREATE DATABASE IF NOT EXISTS if DB already exists
-                        if "database exists" not in str(e).lower() and "already exists" not in str(e).lower():
-                            print(f"⚠️  SQL execution warning: {e}")
+                # Execute each command (split by semicolon)
+                for command in sql_commands.split(";"):
+                    command = command.strip()
+                    if command and not command.startswith("--"):
+                        try:
+                            cursor.execute(command)
+                        except Exception as e:
+                            # Ignore errors for CREATE DATABASE IF NOT EXISTS if DB already exists
+                            if "database exists" not in str(e).lower() and "already exists" not in str(e).lower():
+                                print(f"⚠️  SQL execution warning: {e}")
             
-            conn.commit()
-            print("✓ Database schema initialized successfully.")
-        except Exception as e:
-            print(f"⚠️  Error initializing schema: {e}")
-            conn.rollback()
+                conn.commit()
+                print("✓ Database schema initialized successfully.")
+            except Exception as e:
+                print(f"⚠️  Error initializing schema: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
         finally:
-            cursor.close()
             conn.close()
     except Exception as e:
         print(f"⚠️  Could not initialize database schema: {e}")
@@ -76,8 +86,19 @@ def init_database_schema():
 
 @app.on_event("startup")
 async def startup_event():
-    """Run database schema initialization on startup."""
+    """Run database schema initialization on startup and start the upload scratch janitor."""
     init_database_schema()
+    start_janitor()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background job / checker workers and close idle pooled database connections."""
+    jobs.shutdown()
+    shutdown_executors()
+    stop_janitor()
+    shutdown_page_pool()
+    pool.dispose()
 
 # Add ProxyHeadersMiddleware FIRST to handle X-Forwarded-Proto from Railway
 # This ensures redirects and URLs use HTTPS instead of HTTP
@@ -120,6 +141,8 @@ app.include_router(checkers.router, prefix="/api/checkers", tags=["checkers"])
 app.include_router(register_finish.router)
 app.include_router(import_excel.router)
 app.include_router(users.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
+app.include_router(jobs_routes.router, prefix="/api", tags=["Jobs"])
 
 
 
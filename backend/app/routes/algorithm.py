@@ -1,44 +1,69 @@
-from fastapi import APIRouter, HTTPException
-from app.services.assignmentAlgorithm import run_assignment_algorithm, updateDB
-from app.services.activity_log_service import add_log
-from app.services.assignment_history_services import save_assignment_run_from_db, save_run_items_from_active
-import traceback
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.jobs import jobs
+from app.services.assignmentAlgorithm import ASSIGNMENT_MODES
+from app.services.assignment_jobs import RunInProgress, submit_assignment_run
 
 router = APIRouter()
 
-@router.get("/run-assignment")
-def run_assignment(user: str = "System"):
-    """
-    Run the TA assignment algorithm and return the assignments & workloads.
-    """
-    try:
-        # Run algorithm
-        result = run_assignment_algorithm()
 
-        # Update DB with assignments
-        updateDB(result["assignments"])
-        run_id = save_assignment_run_from_db(created_by=user, notes="Algorithm run")
-        save_run_items_from_active(run_id)
+def _job_payload(job: Dict[str, Any], coalesced: bool) -> Dict[str, Any]:
+    """Job id and status, plus the mode/user the run actually uses (job["params"])."""
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "coalesced": coalesced,
+        "mode": job["params"].get("mode"),
+        "user": job["params"].get("user"),
+        "status_url": f"/api/jobs/{job['job_id']}",
+    }
 
 
+def _submit(user: str, mode: str):
+    if mode not in ASSIGNMENT_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {list(ASSIGNMENT_MODES)}")
+    try:
+        return submit_assignment_run(user=user, mode=mode)
+    except RunInProgress as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), **_job_payload(e.job, True)})
 
-        # Log success
-        add_log(
-            action=f"TA assignment run completed (Run #{run_id})",            
-            user=user,
-            type="success"
-        )
 
-        return result
+@router.get("/run-assignment")
+def run_assignment(response: Response, user: str = "System", mode: str = "greedy"):
+    """
+    Run the TA assignment algorithm and return the assignments & workloads.
+    mode: "greedy" (default) or "optimal"; result["stats"] reports objective and solve time.
 
+    Runs as a background job and waits up to RUN_ASSIGNMENT_WAIT_S for it; a longer run
+    answers 202 with the job payload (poll status_url). Concurrent clicks share one run;
+    409 (with the active job) if the run in progress uses another mode. X-Assignment-Mode /
+    X-Assignment-User name the run's effective mode and user.
+    Clients should prefer POST /run-assignment/jobs, which never waits.
+    """
+    job, coalesced = _submit(user, mode)
+    headers = {"X-Assignment-Mode": str(job["params"].get("mode")), "X-Assignment-User": str(job["params"].get("user"))}
+    try:
+        result = jobs.wait(job["job_id"], timeout=settings.RUN_ASSIGNMENT_WAIT_S)
+    except FutureTimeout:
+        current = jobs.get(job["job_id"], include_result=False) or job
+        return JSONResponse(status_code=202, content=_job_payload(current, coalesced), headers=headers)
     except Exception as e:
-        traceback.print_exc()   
+        # traceback already printed by the job worker
+        raise HTTPException(status_code=500, detail=str(e))
+    response.headers.update(headers)
+    return result
 
-        # Log failure
-        add_log(
-            action=f"TA assignment run failed: {str(e)}",
-            user=user,
-            type="warning"
-        )
 
-        raise HTTPException(status_code=500, detail=str(e))
+@router.post("/run-assignment/jobs", status_code=202)
+def submit_assignment_job(user: str = "System", mode: str = "greedy"):
+    """
+    Queue an assignment run and return its job id; poll GET /api/jobs/{job_id}.
+    If a run in the same mode is already queued/running it is returned instead
+    (coalesced=true; mode/user are that run's). 409 with the active job if its mode differs.
+    """
+    job, coalesced = _submit(user, mode)
+    return _job_payload(job, coalesced)
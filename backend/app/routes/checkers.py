@@ -1,34 +1,138 @@
+import asyncio
 import os
-import tempfile
+from typing import Callable, List
+
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.services.signaturechecker import run_signature_checker
-from app.services.internship_report_checker import run_internship_checker
+from app.core.config import settings
+from app.core.executor import ExecutorBusy
+from app.core.scratch import ScratchArea, UploadTooLarge
+from app.services.checker_batch import BatchInputError, admit_batch, collect_pdfs, release_batch, stream_batch
+from app.services.checker_cache import get_cached_report, run_checker_cached
+from app.services.checker_pool import checker_executor
 
 router = APIRouter()
 
-def _save_upload_to_temp_pdf(upload: UploadFile) -> str:
+MB = 1024 * 1024
+
+
+async def _run_checker(checker: str, upload: UploadFile):
     # UploadFile.content_type is sometimes missing; don't be too strict
-    filename = upload.filename or "upload.pdf"
+    filename = os.path.basename(upload.filename or "") or "upload.pdf"
     if not filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Please upload a PDF file.")
 
-    tmpdir = tempfile.mkdtemp(prefix="pdf_")
-    pdf_path = os.path.join(tmpdir, filename)
-
-    with open(pdf_path, "wb") as f:
-        f.write(upload.file.read())
-
-    return pdf_path
+    # small PDFs stay in memory (pdfium reads bytes directly), larger ones go to scratch
+    area = ScratchArea("pdf_")
+    try:
+        pdf, digest = await area.receive(
+            upload,
+            max_bytes=int(settings.CHECKER_MAX_UPLOAD_MB * MB),
+            memory_limit=int(settings.CHECKER_INMEMORY_UPLOAD_MB * MB),
+            filename=filename,
+        )
+        # repeat uploads are answered from the report cache without queueing behind a cold
+        # check (or counting against CHECKER_QUEUE_DEPTH)
+        report = await asyncio.to_thread(get_cached_report, checker, digest, filename)
+        if report is not None:
+            area.cleanup()
+            return report
+        # CPU-bound: runs on the bounded checker executor, never on the event loop; looks
+        # the cache up once more in case an identical upload finished meanwhile
+        future = checker_executor.submit(run_checker_cached, checker, pdf, digest, filename)
+    except UploadTooLarge as e:
+        area.cleanup()
+        raise HTTPException(status_code=413, detail=str(e))
+    except ExecutorBusy as e:
+        area.cleanup()
+        raise _busy(e)
+    except BaseException:
+        area.cleanup()
+        raise
+    # released once the report is produced, even if the client has gone away by then
+    future.add_done_callback(lambda _: area.cleanup())
+    return await asyncio.wrap_future(future)
 
 
 @router.post("/comp590")
 async def check_comp590(file: UploadFile = File(...)):
-    pdf_path = _save_upload_to_temp_pdf(file)
-    return run_signature_checker(pdf_path, debug=False)
+    return await _run_checker("comp590", file)
 
 
 @router.post("/comp291-391")
 async def check_comp291_391(file: UploadFile = File(...)):
-    pdf_path = _save_upload_to_temp_pdf(file)
-    return run_internship_checker(pdf_path, debug=False)
\ No newline at end of file
+    return await _run_checker("comp291-391", file)
+
+
+def _busy(e: ExecutorBusy) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="The PDF checker is busy. Please try again shortly.",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+class _BatchStream(StreamingResponse):
+    """Runs on_done once the response is over, also when the client left before the
+    stream started (the generator's own cleanup never runs then)."""
+
+    def __init__(self, *args, on_done: Callable[[], None], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_done = on_done
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_done()
+
+
+async def _batch_response(checker: str, files: List[UploadFile]) -> StreamingResponse:
+    # uploads are closed once the handler returns, so they are copied out before streaming;
+    # the batch is admitted first, and released when the response is over
+    area = ScratchArea("batch_")
+    try:
+        admit_batch()
+    except ExecutorBusy as e:
+        area.cleanup()
+        raise _busy(e)
+
+    released = False
+
+    def finish() -> None:
+        nonlocal released
+        area.cleanup()
+        if not released:
+            released = True
+            release_batch()
+
+    try:
+        pdfs = await asyncio.to_thread(collect_pdfs, [(f.filename or "", f.file) for f in files], area)
+    except BatchInputError as e:
+        finish()
+        raise HTTPException(status_code=400, detail=str(e))
+    except UploadTooLarge as e:
+        finish()
+        raise HTTPException(status_code=413, detail=str(e))
+    except BaseException:
+        finish()
+        raise
+    return _BatchStream(
+        stream_batch(checker, pdfs, on_close=finish),
+        on_done=finish,
+        media_type="application/x-ndjson",
+        headers={"X-Batch-Files": str(len(pdfs))},
+    )
+
+
+@router.post("/comp590/batch")
+async def check_comp590_batch(files: List[UploadFile] = File(...)):
+    """PDFs and/or zips of PDFs; streams one NDJSON line per file as it finishes."""
+    return await _batch_response("comp590", files)
+
+
+@router.post("/comp291-391/batch")
+async def check_comp291_391_batch(files: List[UploadFile] = File(...)):
+    """PDFs and/or zips of PDFs; streams one NDJSON line per file as it finishes."""
+    return await _batch_response("comp291-391", files)
@@ -3,7 +3,8 @@ from typing import List
 from app.models import Course, CourseCreate, CourseDetails
 from app.services.course_services import get_courses, get_courses_by_professor_username, CourseUpdate, update_course_in_db, create_course_with_professor, remove_course_from_professor_and_delete_if_orphan, get_course_details, get_courses_by_ta_username
 from app.services.activity_log_service import add_log
-from app.core.database import get_db_connection
+from app.services.professors_services import get_professor_display_name
+from app.core.database import db_connection
 
 router = APIRouter()
 
@@ -30,15 +31,14 @@ def update_course_route(data: CourseUpdate, user: str = Query(..., description="
     try:
         result = update_course_in_db(data)
 
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT course_code FROM course WHERE course_id = %s",
-            (data.course_id,)
-        )
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                "SELECT course_code FROM course WHERE course_id = %s",
+                (data.course_id,)
+            )
+            row = cursor.fetchone()
+            cursor.close()
 
         course_name = row["course_code"] if row else f"ID {data.course_id}"
 
@@ -54,20 +54,6 @@ def update_course_route(data: CourseUpdate, user: str = Query(..., description="
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-def get_professor_display_name(username: str) -> str:
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("""
-        SELECT p.name AS name
-        FROM user u
-        JOIN professor p ON u.professor_id = p.professor_id
-        WHERE u.username = %s
-    """, (username,))
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    return row["name"] if row and row.get("name") else username
-
 @router.post("/add")
 def create_course(
     data: CourseCreate,
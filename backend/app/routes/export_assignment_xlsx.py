@@ -4,7 +4,7 @@ from fastapi.responses import StreamingResponse
 from io import BytesIO
 from openpyxl import Workbook
 
-from app.core.database import get_db_connection
+from app.core.database import db_connection
 
 router = APIRouter()
 
@@ -15,26 +15,25 @@ def export_assignments_xlsx():
     1) Courses: Course, Professor, Assigned TAs
     2) TAs: TA, Load, Courses
     """
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Pull assignments from DB (ta_assignment + course + course_professor + professor + ta)
-    cursor.execute("""
-        SELECT
-          c.course_code,
-          p.name AS professor_name,
-          t.name AS ta_name
-        FROM ta_assignment a
-        JOIN course c ON a.course_id = c.course_id
-        LEFT JOIN course_professor cp ON cp.course_id = c.course_id
-        LEFT JOIN professor p ON p.professor_id = cp.professor_id
-        JOIN ta t ON t.ta_id = a.ta_id
-        ORDER BY c.course_code ASC, p.name ASC, t.name ASC;
-    """)
-    rows = cursor.fetchall()
-
-    cursor.close()
-    conn.close()
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        # Pull assignments from DB (ta_assignment + course + course_professor + professor + ta)
+        cursor.execute("""
+            SELECT
+              c.course_code,
+              p.name AS professor_name,
+              t.name AS ta_name
+            FROM ta_assignment a
+            JOIN course c ON a.course_id = c.course_id
+            LEFT JOIN course_professor cp ON cp.course_id = c.course_id
+            LEFT JOIN professor p ON p.professor_id = cp.professor_id
+            JOIN ta t ON t.ta_id = a.ta_id
+            ORDER BY c.course_code ASC, p.name ASC, t.name ASC;
+        """)
+        rows = cursor.fetchall()
+
+        cursor.close()
 
     # Build maps
     course_map = {}   # course_code -> {professor, tas[]}
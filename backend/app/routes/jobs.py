@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException
+from app.core.jobs import jobs
+
+router = APIRouter()
+
+@router.get("/jobs")
+def list_jobs(limit: int = 50):
+    """Recent background jobs, newest first (without results)."""
+    return jobs.recent(limit=limit)
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Job status: queued / running / succeeded / failed, current phase, progress (0..1),
+    phase timestamps, and the result (or error) once finished.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,54 @@
+from fastapi import APIRouter
+from app.core.cache import get_cache_stats
+from app.core.database import get_pool_stats
+from app.core.executor import get_executor_stats
+from app.core.scratch import get_scratch_stats
+from app.services.checker_timings import get_timing_stats
+
+router = APIRouter()
+
+@router.get("/db-pool")
+def db_pool_stats():
+    """
+    Connection pool statistics: open / in-use / idle connections,
+    overflow, recycles, timeouts and acquire wait times (ms).
+    """
+    return get_pool_stats()
+
+
+@router.get("/cache")
+def cache_stats():
+    """
+    Statistics per cache: in-memory reference-data caches (size, hits / misses / hit
+    ratio, invalidations, evictions) and the on-disk checker report cache (bytes used,
+    hits / misses, writes, evictions).
+    """
+    return get_cache_stats()
+
+
+@router.get("/executors")
+def executor_stats():
+    """
+    Bounded executors (e.g. the PDF checker): workers, pending / running tasks,
+    completed / failed / rejected (503) counts and average task time.
+    """
+    return get_executor_stats()
+
+
+@router.get("/scratch")
+def scratch_stats():
+    """
+    Checker upload scratch space: bytes in flight (received, not yet released) and peak,
+    uploads kept in memory vs spilled to disk, 413 rejections, janitor runs and removals.
+    """
+    return get_scratch_stats()
+
+
+@router.get("/checker-timings")
+def checker_timing_stats():
+    """
+    PDF checker stages (open, textpage, render, grayscale, binarize, line_removal,
+    components) per checker: samples, ms sum / avg / max, allocated bytes and cumulative ms
+    buckets. Only checks run with timings (CHECKER_TIMINGS) are counted.
+    """
+    return get_timing_stats()
@@ -4,17 +4,23 @@
 #
 # FAST GREEDY VERSION:
 # - Hard TA course limit (MAX_COURSES_PER_TA = 3)
-# - Caches weights ONCE (no repeated DB calls)
-# - Precomputes STATIC base scores for (TA, Course) once
+# - Loads all inputs (incl. weights) ONCE, in a single snapshot (assignment_problem.py)
+# - Precomputes STATIC base scores for (TA, Course) once, as one NumPy matrix
 # - During greedy assignment, only recomputes the workload component
 # - Optional Top-K pruning per course to speed up further
+# - Heap-based greedy engine: only courses touched by the last pick are re-scored
 
-from typing import Dict, List, Any, Tuple, Optional
+import copy
+import heapq
+import time
+from typing import Dict, List, Any, Tuple, Optional, Callable
 
-from app.core.database import get_db_connection
-from .ta_services import get_all_tas
-from .professors_services import get_all_professors
-from .weight_services import get_weights
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from app.core.database import db_connection, execute_batched
+from .assignment_cache import assignment_results_cache, forget_persisted_run
+from .assignment_problem import AssignmentProblem, load_assignment_problem
 
 
 # ----------------------------
@@ -24,6 +30,9 @@ from .weight_services import get_weights
 MAX_COURSES_PER_TA = 3
 TOP_K_PER_COURSE = 15  # set to None to disable pruning, or tune (10-25 is common)
 
+ASSIGNMENT_MODES = ("greedy", "optimal")
+OPTIMAL_TIME_BUDGET_S = 20.0  # wall-clock budget for mode="optimal" repair rounds
+
 
 # ----------------------------
 # Helpers
@@ -61,115 +70,6 @@ def workload_score(current_workload: float, avg_workload: float) -> float:
     return max(0.0, 1.0 - (diff / denom))
 
 
-# ----------------------------
-# DB Fetchers (internal helpers)
-# ----------------------------
-
-def fetch_course_data() -> Dict[int, Dict[str, Any]]:
-    """
-    Returns courses keyed by course_id:
-      courses[course_id] = {
-        "course_id": int,
-        "course_code": str,
-        "num_tas_requested": int,
-        "professors": [ {"professor_id": int, "name": str}, ... ],
-        "skills": [str, ...],
-      }
-    """
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("""
-        SELECT course_id, course_code, COALESCE(num_tas_requested, 0) AS num_tas_requested
-        FROM course
-        ORDER BY course_code ASC
-    """)
-    courses = cursor.fetchall() or []
-
-    course_map: Dict[int, Dict[str, Any]] = {}
-    for c in courses:
-        cid = int(c["course_id"])
-        course_map[cid] = {
-            "course_id": cid,
-            "course_code": c["course_code"],
-            "num_tas_requested": int(c.get("num_tas_requested") or 0),
-            "professors": [],
-            "skills": [],
-        }
-
-    if not course_map:
-        cursor.close()
-        conn.close()
-        return {}
-
-    course_ids = list(course_map.keys())
-
-    # professors per course
-    cursor.execute(f"""
-        SELECT cp.course_id, p.professor_id, p.name
-        FROM course_professor cp
-        JOIN professor p ON p.professor_id = cp.professor_id
-        WHERE cp.course_id IN ({",".join(["%s"] * len(course_ids))})
-    """, course_ids)
-    for r in (cursor.fetchall() or []):
-        cid = int(r["course_id"])
-        if cid in course_map:
-            course_map[cid]["professors"].append({
-                "professor_id": int(r["professor_id"]),
-                "name": r["name"],
-            })
-
-    # skills per course
-    cursor.execute(f"""
-        SELECT course_id, skill
-        FROM course_skill
-        WHERE course_id IN ({",".join(["%s"] * len(course_ids))})
-    """, course_ids)
-    for r in (cursor.fetchall() or []):
-        cid = int(r["course_id"])
-        if cid in course_map:
-            course_map[cid]["skills"].append(r["skill"])
-
-    cursor.close()
-    conn.close()
-
-    return course_map
-
-
-def fetch_ta_skills() -> Dict[int, List[str]]:
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT ta_id, skill FROM ta_skill")
-    rows = cursor.fetchall() or []
-    cursor.close()
-    conn.close()
-
-    m: Dict[int, List[str]] = {}
-    for r in rows:
-        m.setdefault(int(r["ta_id"]), []).append(r["skill"])
-    return m
-
-
-def fetch_ta_course_interests() -> Dict[Tuple[int, int], str]:
-    """
-    Returns mapping (ta_id, course_id) -> interest_level
-    """
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("""
-        SELECT ta_id, course_id, interest_level
-        FROM ta_preferred_course
-    """)
-    rows = cursor.fetchall() or []
-    cursor.close()
-    conn.close()
-
-    m: Dict[Tuple[int, int], str] = {}
-    for r in rows:
-        m[(int(r["ta_id"]), int(r["course_id"]))] = r["interest_level"]
-    return m
-
-
 # ----------------------------
 # Static base score (everything except workload)
 # ----------------------------
@@ -240,57 +140,316 @@ def compute_base_pair_score(
 
 
 # ----------------------------
-# Main algorithm
+# Vectorized base score matrix (same math as compute_base_pair_score)
 # ----------------------------
 
-def run_assignment_algorithm(max_same_prof: int = 2):
-    # ---- Load TAs ----
-    tas_db = get_all_tas()
-    if not tas_db:
-        return {"assignments": {}, "workloads": {}}
+def build_base_score_matrix(
+    tas: List[Dict[str, Any]],
+    courses: List[Dict[str, Any]],
+    ta_pref_map: Dict[str, List[str]],
+    prof_pref_map: Dict[str, List[str]],
+    ta_skills_map: Dict[int, List[str]],
+    ta_course_interest_map: Dict[Tuple[int, int], str],
+    weights: Any,
+) -> np.ndarray:
+    """
+    Returns base[i, j] == compute_base_pair_score(tas[i], courses[j], ...) as a T x C float64 matrix.
 
-    tas: List[Dict[str, Any]] = []
-    for t in tas_db:
-        tas.append({
-            "ta_id": int(t["ta_id"]),
-            "name": t["name"],
-            "preferred_professors": [p["name"] for p in (t.get("preferred_professors") or [])],
-        })
-
-    # ---- Load professors (name -> preferred TA names) ----
-    profs_db = get_all_professors()
-    prof_pref_map: Dict[str, List[str]] = {}
-    for p in (profs_db or []):
-        prof_pref_map[p["name"]] = [ta["name"] for ta in (p.get("preferred_tas") or [])]
-
-    # TA preference map by TA name
-    ta_pref_map: Dict[str, List[str]] = {t["name"]: (t.get("preferred_professors") or []) for t in tas}
-
-    # ---- Load courses ----
-    courses_map = fetch_course_data()
-    courses = list(courses_map.values())
-    if not courses:
-        return {"assignments": {}, "workloads": {t["name"]: 0 for t in tas}}
+    Skills, interests and preference ranks are encoded as integer-indexed arrays once,
+    then every term is an elementwise op over the whole matrix. Operation order mirrors
+    the scalar function so results are bit-identical.
+    """
+    n_t = len(tas)
+    n_c = len(courses)
+    if n_t == 0 or n_c == 0:
+        return np.zeros((n_t, n_c), dtype=np.float64)
 
-    # ---- Extra signals ----
-    ta_skills_map = fetch_ta_skills()
-    ta_course_interest_map = fetch_ta_course_interests()
+    ta_idx: Dict[int, int] = {int(t["ta_id"]): i for i, t in enumerate(tas)}
+    course_idx: Dict[int, int] = {int(c["course_id"]): j for j, c in enumerate(courses)}
 
-    # ---- Load weights ONCE (critical for speed) ----
-    weights = get_weights()
+    # ---- course interest ----
+    interest = np.zeros((n_t, n_c), dtype=np.float64)
+    for (tid, cid), level in ta_course_interest_map.items():
+        i = ta_idx.get(tid)
+        j = course_idx.get(cid)
+        if i is not None and j is not None:
+            interest[i, j] = interest_to_score(level)
+
+    # ---- skill match: matched = ta_has_skill @ course_skill_count.T ----
+    skill_idx: Dict[str, int] = {}
+    for c in courses:
+        for sk in (c.get("skills", []) or []):
+            skill_idx.setdefault(sk, len(skill_idx))
+
+    ta_has = np.zeros((n_t, max(1, len(skill_idx))), dtype=np.int64)
+    for i, t in enumerate(tas):
+        for sk in (ta_skills_map.get(int(t["ta_id"]), []) or []):
+            k = skill_idx.get(sk)
+            if k is not None:
+                ta_has[i, k] = 1
+
+    course_req = np.zeros((n_c, ta_has.shape[1]), dtype=np.int64)
+    n_required = np.zeros(n_c, dtype=np.int64)
+    for j, c in enumerate(courses):
+        for sk in (c.get("skills", []) or []):
+            course_req[j, skill_idx[sk]] += 1
+            n_required[j] += 1
+
+    matched = ta_has @ course_req.T
+    skill = np.ones((n_t, n_c), dtype=np.float64)
+    has_req = n_required > 0
+    skill[:, has_req] = matched[:, has_req] / n_required[has_req].astype(np.float64)
+
+    course_pref = 0.6 * interest + 0.4 * skill
 
-    # ---- Tracking ----
-    assigned_by_course: Dict[int, List[int]] = {c["course_id"]: [] for c in courses}
-    remaining_need: Dict[int, int] = {c["course_id"]: int(c.get("num_tas_requested") or 0) for c in courses}
+    # ---- professor preference (avg across course professors) ----
+    prof_idx: Dict[str, int] = {}
+    course_prof_names: List[List[str]] = []
+    for c in courses:
+        names = [p["name"] for p in (c.get("professors", []) or [])]
+        course_prof_names.append(names)
+        for name in names:
+            prof_idx.setdefault(name, len(prof_idx))
+    n_p = len(prof_idx)
+
+    ta_prof = np.zeros((n_t, n_c), dtype=np.float64)
+    prof_ta = np.zeros((n_t, n_c), dtype=np.float64)
+
+    if n_p > 0:
+        ta_names = [t["name"] for t in tas]
+        tas_by_name: Dict[str, List[int]] = {}
+        for i, name in enumerate(ta_names):
+            tas_by_name.setdefault(name, []).append(i)
+
+        # TA side: rank of each professor in the TA's list (len(list) if absent)
+        ta_list_len = np.array([len(ta_pref_map.get(name, []) or []) for name in ta_names], dtype=np.int64)
+        ta_rank = np.repeat(ta_list_len[:, None], n_p, axis=1)
+        for i, name in enumerate(ta_names):
+            seen = set()
+            for r, pname in enumerate(ta_pref_map.get(name, []) or []):
+                k = prof_idx.get(pname)
+                if k is not None and k not in seen:
+                    seen.add(k)
+                    ta_rank[i, k] = r
+
+        # Professor side: rank of each TA name in the professor's list
+        prof_names = list(prof_idx.keys())
+        prof_list_len = np.array([len(prof_pref_map.get(p, []) or []) for p in prof_names], dtype=np.int64)
+        prof_rank = np.repeat(prof_list_len[None, :], n_t, axis=0)
+        for k, pname in enumerate(prof_names):
+            seen_names = set()
+            for r, tname in enumerate(prof_pref_map.get(pname, []) or []):
+                if tname in seen_names:
+                    continue
+                seen_names.add(tname)
+                for i in tas_by_name.get(tname, []):
+                    prof_rank[i, k] = r
+
+        ta_rank_score = _rank_matrix_to_score(ta_rank, ta_list_len[:, None])
+        prof_rank_score = _rank_matrix_to_score(prof_rank, prof_list_len[None, :])
+
+        # Sum course professors position by position (same order as safe_avg)
+        n_profs = np.array([len(names) for names in course_prof_names], dtype=np.int64)
+        for pos in range(int(n_profs.max())):
+            cols = np.array([j for j in range(n_c) if n_profs[j] > pos], dtype=np.int64)
+            ks = np.array([prof_idx[course_prof_names[j][pos]] for j in cols], dtype=np.int64)
+            ta_prof[:, cols] += ta_rank_score[:, ks]
+            prof_ta[:, cols] += prof_rank_score[:, ks]
+
+        has_prof = n_profs > 0
+        denom = n_profs[has_prof].astype(np.float64)
+        ta_prof[:, has_prof] /= denom
+        prof_ta[:, has_prof] /= denom
+
+    return (
+        float(weights.course_pref) * course_pref +
+        float(weights.ta_pref) * ta_prof +
+        float(weights.prof_pref) * prof_ta
+    )
 
-    ta_workload: Dict[int, int] = {t["ta_id"]: 0 for t in tas}
-    ta_capacity: Dict[int, int] = {t["ta_id"]: MAX_COURSES_PER_TA for t in tas}
 
-    # course_id -> [professor_id...]
-    course_prof_ids: Dict[int, List[int]] = {
-        c["course_id"]: [int(p["professor_id"]) for p in (c.get("professors") or [])]
-        for c in courses
-    }
+def _rank_matrix_to_score(rank: np.ndarray, max_rank: np.ndarray) -> np.ndarray:
+    """Elementwise rank_to_score; ranks here are already within [0, max_rank]."""
+    max_rank = np.broadcast_to(max_rank, rank.shape).astype(np.float64)
+    out = np.zeros(rank.shape, dtype=np.float64)
+    np.divide(max_rank - rank.astype(np.float64), max_rank, out=out, where=max_rank > 0)
+    return out
+
+
+def top_k_candidates(
+    base: np.ndarray,
+    tas: List[Dict[str, Any]],
+    courses: List[Dict[str, Any]],
+) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    candidates_by_course[cid] = [(tid, base_score), ...] sorted desc, truncated to TOP_K_PER_COURSE.
+    Stable ordering: equal scores keep TA order, like list.sort(reverse=True).
+    """
+    if base.size == 0:
+        return {int(c["course_id"]): [] for c in courses}
+
+    order = np.argsort(-base, axis=0, kind="stable")
+    if TOP_K_PER_COURSE is not None:
+        order = order[:max(1, int(TOP_K_PER_COURSE))]
+
+    ta_ids = [int(t["ta_id"]) for t in tas]
+    candidates_by_course: Dict[int, List[Tuple[int, float]]] = {}
+    for j, c in enumerate(courses):
+        col = base[:, j]
+        candidates_by_course[int(c["course_id"])] = [(ta_ids[i], float(col[i])) for i in order[:, j]]
+    return candidates_by_course
+
+
+# ----------------------------
+# Greedy engines
+# ----------------------------
+
+def _scan_greedy_fill(
+    course_ids: List[int],
+    candidates_by_course: Dict[int, List[Tuple[int, float]]],
+    assigned_by_course: Dict[int, List[int]],
+    remaining_need: Dict[int, int],
+    ta_workload: Dict[int, int],
+    can_assign: Callable[[int, int], bool],
+    apply_assignment: Callable[[int, int], None],
+    pair_score: Callable[[float, int], float],
+) -> None:
+    """
+    Reference engine: rescans every course x candidate pair for each slot it fills.
+    O(slots * courses * K). Kept for parity checks against the heap engine.
+    """
+    def pick_best_pair() -> Optional[Tuple[int, int, float]]:
+        best: Optional[Tuple[int, int, float]] = None
+
+        for cid in course_ids:
+            if remaining_need.get(cid, 0) <= 0:
+                continue
+
+            for tid, b in (candidates_by_course.get(cid) or []):
+                if ta_workload.get(tid, 0) >= MAX_COURSES_PER_TA:
+                    continue
+                if tid in assigned_by_course[cid]:
+                    continue
+                if not can_assign(tid, cid):
+                    continue
+
+                s = pair_score(b, tid)
+                if best is None or s > best[2]:
+                    best = (tid, cid, s)
+
+        return best
+
+    while True:
+        best = pick_best_pair()
+        if best is None:
+            break
+        tid, cid, _s = best
+        apply_assignment(tid, cid)
+
+
+def _heap_greedy_fill(
+    course_ids: List[int],
+    candidates_by_course: Dict[int, List[Tuple[int, float]]],
+    assigned_by_course: Dict[int, List[int]],
+    remaining_need: Dict[int, int],
+    ta_workload: Dict[int, int],
+    can_assign: Callable[[int, int], bool],
+    apply_assignment: Callable[[int, int], None],
+    pair_score: Callable[[float, int], float],
+) -> None:
+    """
+    Priority-queue engine with the same picks as _scan_greedy_fill.
+
+    The heap holds one entry per open course: its best feasible candidate.
+    Entries are ordered by (-score, course position), and within a course the
+    earliest candidate wins ties, which reproduces the scan's tie-breaking.
+
+    Assigning TA t to course c only changes c's need/assigned list and t's
+    workload + professor counts, so only c and the courses listing t as a
+    candidate are re-scored. Their old entries are invalidated by bumping a
+    per-course version and dropped lazily when popped.
+    """
+    course_pos = {cid: i for i, cid in enumerate(course_ids)}
+
+    # ta_id -> courses whose candidate list contains that TA
+    courses_by_ta: Dict[int, List[int]] = {}
+    for cid in course_ids:
+        for tid, _b in (candidates_by_course.get(cid) or []):
+            courses_by_ta.setdefault(tid, []).append(cid)
+
+    version: Dict[int, int] = {cid: 0 for cid in course_ids}
+    heap: List[Tuple[float, int, int, int, int]] = []
+
+    def best_for_course(cid: int) -> Optional[Tuple[int, float]]:
+        best: Optional[Tuple[int, float]] = None
+        for tid, b in (candidates_by_course.get(cid) or []):
+            if ta_workload.get(tid, 0) >= MAX_COURSES_PER_TA:
+                continue
+            if tid in assigned_by_course[cid]:
+                continue
+            if not can_assign(tid, cid):
+                continue
+
+            s = pair_score(b, tid)
+            if best is None or s > best[1]:
+                best = (tid, s)
+        return best
+
+    def refresh(cid: int) -> None:
+        version[cid] += 1
+        if remaining_need.get(cid, 0) <= 0:
+            return
+        best = best_for_course(cid)
+        if best is not None:
+            heapq.heappush(heap, (-best[1], course_pos[cid], version[cid], best[0], cid))
+
+    for cid in course_ids:
+        refresh(cid)
+
+    while heap:
+        _neg_s, _pos, ver, tid, cid = heapq.heappop(heap)
+        if ver != version[cid]:
+            continue  # stale entry
+
+        apply_assignment(tid, cid)
+
+        affected = set(courses_by_ta.get(tid, []))
+        affected.add(cid)
+        for a in affected:
+            refresh(a)
+
+
+GREEDY_ENGINES = {
+    "heap": _heap_greedy_fill,
+    "scan": _scan_greedy_fill,
+}
+
+
+def greedy_assign(
+    course_ids: List[int],
+    candidates_by_course: Dict[int, List[Tuple[int, float]]],
+    remaining_need: Dict[int, int],
+    ta_workload: Dict[int, int],
+    course_prof_ids: Dict[int, List[int]],
+    max_same_prof: int,
+    workload_weight: float,
+    avg_workload: float,
+    engine: str = "heap",
+    on_phase: Optional[Callable[[str], None]] = None,
+) -> Dict[int, List[int]]:
+    """
+    Two-pass greedy fill over pre-pruned candidates.
+      PASS 1: strict professor cap
+      PASS 2: relax cap if needed to fill remaining needs
+
+    Score = base_score + workload_weight * workload_score(current_workload).
+    Mutates remaining_need / ta_workload and returns course_id -> [ta_id, ...].
+    on_phase, if given, is called with "pass1" / "pass2" as each pass starts.
+    """
+    report = on_phase or (lambda _phase: None)
+    fill = GREEDY_ENGINES[engine]
+
+    assigned_by_course: Dict[int, List[int]] = {cid: [] for cid in course_ids}
 
     # (ta_id, professor_id) -> how many courses already assigned together
     ta_prof_count: Dict[Tuple[int, int], int] = {}
@@ -304,106 +463,324 @@ def run_assignment_algorithm(max_same_prof: int = 2):
                 return False
         return True
 
-    def apply_prof_count(ta_id: int, course_id: int) -> None:
+    def apply_assignment(ta_id: int, course_id: int) -> None:
+        assigned_by_course[course_id].append(ta_id)
+        remaining_need[course_id] -= 1
+        ta_workload[ta_id] += 1
         for pid in (course_prof_ids.get(course_id, []) or []):
             key = (ta_id, pid)
             ta_prof_count[key] = ta_prof_count.get(key, 0) + 1
 
-    # ---- Demand/capacity and avg workload ----
-    total_slots = sum(max(0, int(c.get("num_tas_requested") or 0)) for c in courses)
-    total_capacity = len(tas) * MAX_COURSES_PER_TA
-    if total_slots > total_capacity:
-        print(f"[WARN] Demand {total_slots} exceeds total TA capacity {total_capacity}. Some slots will remain unfilled.")
+    def pair_score(base: float, ta_id: int) -> float:
+        return base + workload_weight * workload_score(
+            current_workload=float(ta_workload.get(ta_id, 0)),
+            avg_workload=avg_workload,
+        )
 
-    avg_workload = float(total_slots) / float(len(tas)) if len(tas) > 0 else 0.0
+    args = (course_ids, candidates_by_course, assigned_by_course, remaining_need, ta_workload)
 
-    # ---- Precompute BASE scores (static) ----
-    base_score: Dict[Tuple[int, int], float] = {}
-    for c in courses:
-        cid = c["course_id"]
-        need = int(c.get("num_tas_requested") or 0)
-        if need <= 0:
-            continue
-        for t in tas:
-            tid = t["ta_id"]
-            base_score[(tid, cid)] = compute_base_pair_score(
-                ta=t,
-                course=c,
-                ta_pref_map=ta_pref_map,
-                prof_pref_map=prof_pref_map,
-                ta_skills_map=ta_skills_map,
-                ta_course_interest_map=ta_course_interest_map,
-                weights=weights,
-            )
-
-    # ---- Optional Top-K pruning per course (based on base score only) ----
-    # candidates_by_course[cid] = [(tid, base_score), ...] sorted desc, truncated to K
-    candidates_by_course: Dict[int, List[Tuple[int, float]]] = {}
-    for c in courses:
-        cid = c["course_id"]
-        need = int(c.get("num_tas_requested") or 0)
-        if need <= 0:
-            continue
+    # PASS 1: strict professor cap
+    report("pass1")
+    fill(*args, can_assign_with_cap, apply_assignment, pair_score)
 
-        lst: List[Tuple[int, float]] = []
-        for t in tas:
-            tid = t["ta_id"]
-            lst.append((tid, base_score.get((tid, cid), 0.0)))
+    # PASS 2: relax cap if needed to fill remaining needs
+    if any(v > 0 for v in remaining_need.values()):
+        report("pass2")
+        fill(*args, lambda _t, _c: True, apply_assignment, pair_score)
 
-        lst.sort(key=lambda x: x[1], reverse=True)
+    return assigned_by_course
 
-        if TOP_K_PER_COURSE is None:
-            candidates_by_course[cid] = lst
-        else:
-            candidates_by_course[cid] = lst[:max(1, int(TOP_K_PER_COURSE))]
 
-    def pick_best_pair(pass_enforce_cap: bool) -> Optional[Tuple[int, int, float]]:
-        """
-        Choose the best feasible (ta_id, course_id) under constraints.
-        Score = base_score + workload_balance_weight * workload_score(current_workload).
-        """
-        best: Optional[Tuple[int, int, float]] = None
+# ----------------------------
+# Optimal engine (slot-expanded assignment)
+# ----------------------------
 
-        for c in courses:
-            cid = c["course_id"]
-            if remaining_need.get(cid, 0) <= 0:
-                continue
+def optimal_assign(
+    base: np.ndarray,
+    ta_ids: List[int],
+    course_ids: List[int],
+    remaining_need: Dict[int, int],
+    ta_workload: Dict[int, int],
+    course_prof_ids: Dict[int, List[int]],
+    max_same_prof: int,
+    time_budget_s: float = OPTIMAL_TIME_BUDGET_S,
+    on_phase: Optional[Callable[[str], None]] = None,
+) -> Tuple[Dict[int, List[int]], Dict[str, Any]]:
+    """
+    Maximizes the total base score (no Top-K pruning) with scipy's linear_sum_assignment.
 
-            for tid, b in (candidates_by_course.get(cid) or []):
-                if ta_workload.get(tid, 0) >= ta_capacity.get(tid, 1):
-                    continue
-                if tid in assigned_by_course[cid]:
-                    continue
-                if pass_enforce_cap and not can_assign_with_cap(tid, cid):
-                    continue
+    Slot expansion: one row per open course slot, one column per free TA capacity unit,
+    so course demand and MAX_COURSES_PER_TA are exact. Forbidden pairs get a cost large
+    enough that the solver always prefers filling one more slot.
 
-                s = b + float(weights.workload_balance) * workload_score(
-                    current_workload=float(ta_workload.get(tid, 0)),
-                    avg_workload=avg_workload,
-                )
+    "Same TA twice in a course" and the same-professor cap are not expressible as a plain
+    assignment problem (multi-professor courses make the cap a hyperedge), so each round's
+    solution is accepted in descending score order while those constraints hold; rejected
+    slots are re-solved in the next round. Like the greedy solver:
+      PASS 1: strict professor cap
+      PASS 2: relax cap if needed to fill remaining needs
 
-                if best is None or s > best[2]:
-                    best = (tid, cid, s)
+    Mutates remaining_need / ta_workload. Returns (course_id -> [ta_id, ...], info).
+    on_phase, if given, is called with "pass1" / "pass2" as each pass starts.
+    """
+    report = on_phase or (lambda _phase: None)
+    deadline = time.perf_counter() + max(0.0, float(time_budget_s))
+    n_t, n_c = base.shape
 
-        return best
+    assigned_by_course: Dict[int, List[int]] = {cid: [] for cid in course_ids}
+    assigned = np.zeros((n_t, n_c), dtype=bool)
+    info: Dict[str, Any] = {"rounds": 0, "timed_out": False}
+
+    course_pids: List[List[int]] = [list(course_prof_ids.get(cid, []) or []) for cid in course_ids]
+    courses_by_pid: Dict[int, List[int]] = {}
+    for j, pids in enumerate(course_pids):
+        for pid in pids:
+            courses_by_pid.setdefault(pid, []).append(j)
+
+    # (ta row, professor_id) -> how many courses already assigned together
+    ta_prof_count: Dict[Tuple[int, int], int] = {}
 
-    def greedy_fill(pass_enforce_cap: bool) -> None:
+    def can_assign_with_cap(i: int, j: int) -> bool:
+        return all(ta_prof_count.get((i, pid), 0) < max_same_prof for pid in course_pids[j])
+
+    def cap_blocked() -> np.ndarray:
+        blocked = np.zeros((n_t, n_c), dtype=bool)
+        for (i, pid), cnt in ta_prof_count.items():
+            if cnt >= max_same_prof:
+                blocked[i, courses_by_pid.get(pid, [])] = True
+        return blocked
+
+    def apply_assignment(i: int, j: int) -> None:
+        tid = ta_ids[i]
+        cid = course_ids[j]
+        assigned[i, j] = True
+        assigned_by_course[cid].append(tid)
+        remaining_need[cid] -= 1
+        ta_workload[tid] += 1
+        for pid in course_pids[j]:
+            ta_prof_count[(i, pid)] = ta_prof_count.get((i, pid), 0) + 1
+
+    def fill(enforce_cap: bool) -> None:
         while True:
-            best = pick_best_pair(pass_enforce_cap=pass_enforce_cap)
-            if best is None:
-                break
-            tid, cid, _s = best
-            assigned_by_course[cid].append(tid)
-            remaining_need[cid] -= 1
-            ta_workload[tid] += 1
-            apply_prof_count(tid, cid)
+            if time.perf_counter() > deadline:
+                info["timed_out"] = True
+                return
+
+            need = np.array([max(0, remaining_need.get(cid, 0)) for cid in course_ids], dtype=np.int64)
+            free = np.array([max(0, MAX_COURSES_PER_TA - ta_workload.get(tid, 0)) for tid in ta_ids], dtype=np.int64)
+            if need.sum() == 0 or free.sum() == 0:
+                return
+
+            allowed = ~assigned
+            if enforce_cap:
+                allowed &= ~cap_blocked()
+
+            rows = np.repeat(np.arange(n_c), need)  # course index of each open slot
+            cols = np.repeat(np.arange(n_t), free)  # TA index of each free capacity unit
+
+            slot_allowed = allowed[np.ix_(cols, rows)].T
+            if not slot_allowed.any():
+                return
+            slot_score = base[np.ix_(cols, rows)].T
+
+            span = float(slot_score.max() - slot_score.min()) if slot_score.size else 0.0
+            forbidden_cost = 1.0 + span * float(len(rows))
+            cost = np.where(slot_allowed, -slot_score, forbidden_cost)
+
+            r_idx, c_idx = linear_sum_assignment(cost)
+            info["rounds"] += 1
+
+            picks = [
+                (int(rows[r]), int(cols[c]))
+                for r, c in zip(r_idx, c_idx)
+                if slot_allowed[r, c]
+            ]
+            picks.sort(key=lambda p: (-base[p[1], p[0]], p[0], p[1]))
+
+            accepted = 0
+            for j, i in picks:
+                if assigned[i, j]:
+                    continue
+                if enforce_cap and not can_assign_with_cap(i, j):
+                    continue
+                apply_assignment(i, j)
+                accepted += 1
+
+            if accepted == 0:
+                return
 
     # PASS 1: strict professor cap
-    greedy_fill(pass_enforce_cap=True)
+    report("pass1")
+    fill(enforce_cap=True)
 
     # PASS 2: relax cap if needed to fill remaining needs
     if any(v > 0 for v in remaining_need.values()):
-        greedy_fill(pass_enforce_cap=False)
+        report("pass2")
+        fill(enforce_cap=False)
+
+    return assigned_by_course, info
+
+
+# ----------------------------
+# Main algorithm
+# ----------------------------
+
+def run_assignment_algorithm(
+    max_same_prof: int = 2,
+    mode: str = "greedy",
+    problem: Optional[AssignmentProblem] = None,
+    use_cache: bool = True,
+    on_phase: Optional[Callable[[str], None]] = None,
+):
+    """
+    mode="greedy": two-pass greedy over Top-K pruned candidates (default).
+    mode="optimal": slot-expanded assignment over all base scores (see optimal_assign).
+    Both report "stats" (objective = total base score of assigned pairs, solve time).
+
+    problem: pre-loaded inputs (e.g. a pickled snapshot); loaded from the DB
+    in a single consistent snapshot when omitted.
+
+    Results are memoized (LRU, see assignment_cache.py) by input fingerprint + mode +
+    max_same_prof; stats["fingerprint"] is that key and stats["cache_hit"] says whether
+    the solve was skipped. use_cache=False always solves.
+
+    on_phase, if given, is called with "load", "score", "pass1", "pass2" as each phase
+    starts (pass2 only when the relaxed pass runs; nothing after "load" on a cache hit).
+    """
+    if mode not in ASSIGNMENT_MODES:
+        raise ValueError(f"Unknown assignment mode: {mode}")
+    report = on_phase or (lambda _phase: None)
+
+    # ---- Load inputs (one REPEATABLE READ snapshot) ----
+    report("load")
+    if problem is None:
+        problem = load_assignment_problem()
+
+    key = f"{problem.fingerprint()}:{mode}:{int(max_same_prof)}"
+    result = assignment_results_cache.get(key) if use_cache else None
+    cache_hit = result is not None
+    if result is None:
+        result = _solve(problem, max_same_prof, mode, report)
+        result.setdefault("stats", {})["fingerprint"] = key
+        if use_cache:
+            assignment_results_cache.set(key, result)
+
+    # callers may mutate the result; never hand out the cached object
+    result = copy.deepcopy(result)
+    result["stats"]["cache_hit"] = cache_hit
+    return result
+
+
+def _solve(
+    problem: AssignmentProblem,
+    max_same_prof: int,
+    mode: str,
+    report: Callable[[str], None],
+) -> Dict[str, Any]:
+    tas = problem.tas
+    if not tas:
+        return {"assignments": {}, "workloads": {}}
+
+    prof_pref_map = problem.prof_pref_map
+    ta_pref_map = problem.ta_pref_map
+
+    courses = problem.courses
+    if not courses:
+        return {"assignments": {}, "workloads": {t["name"]: 0 for t in tas}}
+
+    ta_skills_map = problem.ta_skills_map
+    ta_course_interest_map = problem.ta_course_interest_map
+    weights = problem.weights
+    if weights is None:
+        raise ValueError(
+            "No assignment weights configured: the weights table is empty "
+            "(insert a row, e.g. from database/seed.sql)."
+        )
+
+    # ---- Tracking ----
+    remaining_need: Dict[int, int] = {c["course_id"]: int(c.get("num_tas_requested") or 0) for c in courses}
+
+    ta_workload: Dict[int, int] = {t["ta_id"]: 0 for t in tas}
+
+    # course_id -> [professor_id...]
+    course_prof_ids: Dict[int, List[int]] = {
+        c["course_id"]: [int(p["professor_id"]) for p in (c.get("professors") or [])]
+        for c in courses
+    }
+
+    # ---- Demand/capacity and avg workload ----
+    total_slots = sum(max(0, int(c.get("num_tas_requested") or 0)) for c in courses)
+    total_capacity = len(tas) * MAX_COURSES_PER_TA
+    if total_slots > total_capacity:
+        print(f"[WARN] Demand {total_slots} exceeds total TA capacity {total_capacity}. Some slots will remain unfilled.")
+
+    avg_workload = float(total_slots) / float(len(tas)) if len(tas) > 0 else 0.0
+
+    # ---- Precompute BASE scores (static, T x C matrix) ----
+    report("score")
+    active_courses = [c for c in courses if int(c.get("num_tas_requested") or 0) > 0]
+    base = build_base_score_matrix(
+        tas=tas,
+        courses=active_courses,
+        ta_pref_map=ta_pref_map,
+        prof_pref_map=prof_pref_map,
+        ta_skills_map=ta_skills_map,
+        ta_course_interest_map=ta_course_interest_map,
+        weights=weights,
+    )
+
+    active_course_ids = [c["course_id"] for c in active_courses]
+
+    t0 = time.perf_counter()
+    solver_info: Dict[str, Any] = {}
+    if mode == "optimal":
+        assigned_by_course, solver_info = optimal_assign(
+            base=base,
+            ta_ids=[t["ta_id"] for t in tas],
+            course_ids=active_course_ids,
+            remaining_need=remaining_need,
+            ta_workload=ta_workload,
+            course_prof_ids=course_prof_ids,
+            max_same_prof=max_same_prof,
+            on_phase=report,
+        )
+    else:
+        # ---- Optional Top-K pruning per course (based on base score only) ----
+        candidates_by_course = top_k_candidates(base, tas, active_courses)
+
+        # ---- Greedy fill (pass 1: strict professor cap, pass 2: relaxed) ----
+        assigned_by_course = greedy_assign(
+            course_ids=active_course_ids,
+            candidates_by_course=candidates_by_course,
+            remaining_need=remaining_need,
+            ta_workload=ta_workload,
+            course_prof_ids=course_prof_ids,
+            max_same_prof=max_same_prof,
+            workload_weight=float(weights.workload_balance),
+            avg_workload=avg_workload,
+            on_phase=report,
+        )
+    solve_time_ms = (time.perf_counter() - t0) * 1000.0
+
+    ta_pos = {t["ta_id"]: i for i, t in enumerate(tas)}
+    objective = 0.0
+    pair_counts: Dict[Tuple[int, int], int] = {}
+    for j, cid in enumerate(active_course_ids):
+        for tid in assigned_by_course.get(cid, []):
+            objective += float(base[ta_pos[tid], j])
+            for pid in course_prof_ids.get(cid, []):
+                pair_counts[(tid, pid)] = pair_counts.get((tid, pid), 0) + 1
+    cap_violations = sum(max(0, cnt - max_same_prof) for cnt in pair_counts.values())
+
+    stats = {
+        "mode": mode,
+        "objective": round(objective, 6),
+        "solve_time_ms": round(solve_time_ms, 3),
+        "filled_slots": sum(len(v) for v in assigned_by_course.values()),
+        "total_slots": total_slots,
+        "cap_violations": cap_violations,  # assignments placed by the relaxed second pass
+        **solver_info,
+    }
 
     # ---- Output ----
     ta_id_to_name = {t["ta_id"]: t["name"] for t in tas}
@@ -424,7 +801,7 @@ def run_assignment_algorithm(max_same_prof: int = 2):
 
     workloads_by_name = {ta_id_to_name[tid]: cnt for tid, cnt in ta_workload.items()}
 
-    return {"assignments": out_assignments, "workloads": workloads_by_name}
+    return {"assignments": out_assignments, "workloads": workloads_by_name, "stats": stats}
 
 import re
 
@@ -435,104 +812,112 @@ def _name_key(s: str) -> str:
     s = re.sub(r"\s+", " ", s).strip()
     return s.casefold()
 
-def updateDB(assignments: Dict[str, Any]):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute("TRUNCATE TABLE ta_assignment")
-
-        # Build TA normalized-name -> canonical id (smallest ta_id)
-        tas_db = get_all_tas()
-        ta_key_to_id: Dict[str, int] = {}
-        for t in (tas_db or []):
-            k = _name_key(t["name"])
-            if not k:
+def write_assignments(cursor, assignments: Dict[str, Any]) -> int:
+    """
+    Replace ta_assignment with `assignments` using the caller's (dictionary) cursor and
+    transaction; nothing is committed here. Accepts either format:
+      A) {course_code: {"tas": [ta name, ...], ...}}
+      B) {course_id: [ta_id, ...]}
+    Rows go out as batched multi-row INSERTs. Returns the number of pairs written.
+    """
+    # DELETE rather than TRUNCATE: TRUNCATE commits implicitly, which would split the run-save transaction
+    cursor.execute("DELETE FROM ta_assignment")
+
+    # Build TA normalized-name -> canonical id (smallest ta_id)
+    cursor.execute("SELECT ta_id, name FROM ta")
+    ta_key_to_id: Dict[str, int] = {}
+    for t in (cursor.fetchall() or []):
+        k = _name_key(t["name"])
+        if not k:
+            continue
+        tid = int(t["ta_id"])
+        if k not in ta_key_to_id or tid < ta_key_to_id[k]:
+            ta_key_to_id[k] = tid
+
+    # Build course_code -> id
+    cursor.execute("SELECT course_id, course_code FROM course")
+    course_rows = cursor.fetchall() or []
+    course_code_to_id = {row["course_code"]: int(row["course_id"]) for row in course_rows}
+
+    # Detect format
+    is_format_a = False
+    for k, v in assignments.items():
+        if isinstance(k, str) and isinstance(v, dict) and "tas" in v:
+            is_format_a = True
+        break
+
+    # Global guard against duplicates: (ta_id, course_id); dict keeps insertion order
+    pairs: Dict[Tuple[int, int], None] = {}
+    skipped_duplicates = 0
+
+    if is_format_a:
+        for course_code, payload in assignments.items():
+            course_id = course_code_to_id.get(course_code)
+            if not course_id:
                 continue
-            tid = int(t["ta_id"])
-            if k not in ta_key_to_id or tid < ta_key_to_id[k]:
-                ta_key_to_id[k] = tid
-
-        # Build course_code -> id
-        cursor.execute("SELECT course_id, course_code FROM course")
-        course_rows = cursor.fetchall() or []
-        course_code_to_id = {row[1]: int(row[0]) for row in course_rows}
-
-        # Detect format
-        is_format_a = False
-        for k, v in assignments.items():
-            if isinstance(k, str) and isinstance(v, dict) and "tas" in v:
-                is_format_a = True
-            break
 
-        # Global guard against duplicates: (ta_id, course_id)
-        inserted_pairs = set()
-        skipped_duplicates = 0
+            # Per-course guard against duplicate *names*
+            seen_names: set[str] = set()
+
+            for ta_name in (payload.get("tas") or []):
+                name_key = _name_key(ta_name)
+                if not name_key or name_key in seen_names:
+                    skipped_duplicates += 1
+                    continue
+                seen_names.add(name_key)
 
-        if is_format_a:
-            for course_code, payload in assignments.items():
-                course_id = course_code_to_id.get(course_code)
-                if not course_id:
+                ta_id = ta_key_to_id.get(name_key)
+                if not ta_id:
                     continue
 
-                # Per-course guard against duplicate *names*
-                seen_names: set[str] = set()
-
-                for ta_name in (payload.get("tas") or []):
-                    name_key = _name_key(ta_name)
-                    if not name_key or name_key in seen_names:
-                        skipped_duplicates += 1
-                        continue
-                    seen_names.add(name_key)
-
-                    ta_id = ta_key_to_id.get(name_key)
-                    if not ta_id:
-                        continue
-
-                    pair = (int(ta_id), int(course_id))
-                    if pair in inserted_pairs:
-                        skipped_duplicates += 1
-                        continue
-                    inserted_pairs.add(pair)
-
-                    cursor.execute(
-                        "INSERT INTO ta_assignment (ta_id, course_id) VALUES (%s, %s)",
-                        (pair[0], pair[1])
-                    )
-
-        else:
-            # raw ids format
-            for course_id, ta_ids in assignments.items():
-                cid = int(course_id)
-
-                seen_ids = set()
-                for ta_id in (ta_ids or []):
-                    tid = int(ta_id)
-                    if tid in seen_ids:
-                        skipped_duplicates += 1
-                        continue
-                    seen_ids.add(tid)
-
-                    pair = (tid, cid)
-                    if pair in inserted_pairs:
-                        skipped_duplicates += 1
-                        continue
-                    inserted_pairs.add(pair)
-
-                    cursor.execute(
-                        "INSERT INTO ta_assignment (ta_id, course_id) VALUES (%s, %s)",
-                        (tid, cid)
-                    )
-
-        conn.commit()
-        print("All assignments successfully updated in the database.")
-        if skipped_duplicates:
-            print(f"[INFO] Skipped {skipped_duplicates} duplicate assignment entries.")
-
-    except Exception as e:
-        conn.rollback()
-        print("Error updating database:", e)
-        raise
-    finally:
-        cursor.close()
-        conn.close()
+                pair = (int(ta_id), int(course_id))
+                if pair in pairs:
+                    skipped_duplicates += 1
+                    continue
+                pairs[pair] = None
+
+    else:
+        # raw ids format
+        for course_id, ta_ids in assignments.items():
+            cid = int(course_id)
+
+            seen_ids = set()
+            for ta_id in (ta_ids or []):
+                tid = int(ta_id)
+                if tid in seen_ids:
+                    skipped_duplicates += 1
+                    continue
+                seen_ids.add(tid)
+
+                pair = (tid, cid)
+                if pair in pairs:
+                    skipped_duplicates += 1
+                    continue
+                pairs[pair] = None
+
+    execute_batched(
+        cursor,
+        "INSERT INTO ta_assignment (ta_id, course_id) VALUES (%s, %s)",
+        list(pairs),
+    )
+    if skipped_duplicates:
+        print(f"[INFO] Skipped {skipped_duplicates} duplicate assignment entries.")
+    return len(pairs)
+
+
+def updateDB(assignments: Dict[str, Any]):
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        try:
+            write_assignments(cursor, assignments)
+            conn.commit()
+            forget_persisted_run()
+            print("All assignments successfully updated in the database.")
+
+        except Exception as e:
+            conn.rollback()
+            print("Error updating database:", e)
+            raise
+        finally:
+            cursor.close()
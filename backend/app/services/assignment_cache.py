@@ -0,0 +1,51 @@
+# backend/app/services/assignment_cache.py
+# Memoized assignment results.
+#
+# run_assignment_algorithm keys results by AssignmentProblem.fingerprint() plus the
+# run parameters (mode, max_same_prof), so re-running with unchanged inputs returns the
+# previous result without solving again. The key is computed from a fresh snapshot, so a
+# stale hit is impossible; invalidate_assignment_results() is still called by every
+# service that writes an input table, to free memory and keep hit/miss stats honest.
+#
+# Separately, we remember which key was last written to ta_assignment (and its run_id),
+# so /run-assignment can skip rewriting identical assignments. Anything else that writes
+# ta_assignment (overrides, apply_run, imports) must call forget_persisted_run().
+
+import threading
+from typing import Any, Dict, Optional
+
+from app.core.cache import TTLCache, register_cache
+from app.core.config import settings
+
+assignment_results_cache: TTLCache[str, Dict[str, Any]] = register_cache(
+    "assignment_results", ttl=0, max_entries=settings.ASSIGNMENT_CACHE_SIZE
+)
+
+_persisted_lock = threading.Lock()
+_persisted: Dict[str, Any] = {"key": None, "run_id": None}
+
+
+def invalidate_assignment_results() -> None:
+    """Call after committing a write to any assignment input table."""
+    assignment_results_cache.invalidate()
+
+
+def mark_persisted_run(key: str, run_id: int) -> None:
+    with _persisted_lock:
+        _persisted["key"] = key
+        _persisted["run_id"] = run_id
+
+
+def persisted_run_id(key: Optional[str]) -> Optional[int]:
+    """run_id if ta_assignment still holds exactly the result for `key`, else None."""
+    with _persisted_lock:
+        if key is not None and _persisted["key"] == key:
+            return _persisted["run_id"]
+        return None
+
+
+def forget_persisted_run() -> None:
+    """Call after committing any other write to ta_assignment."""
+    with _persisted_lock:
+        _persisted["key"] = None
+        _persisted["run_id"] = None
@@ -0,0 +1,90 @@
+# backend/app/services/assignment_jobs.py
+# /run-assignment as a background job: solve, persist, snapshot history, log.
+#
+# One active run per dataset (database): concurrent submissions for the same mode
+# coalesce into the job that is already queued/running; a different mode is refused
+# (RunInProgress) until it finishes. Progress phases, in order:
+#   load -> score -> pass1 -> pass2 (only if needed) -> persist
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.jobs import jobs
+from app.services.activity_log_service import add_log
+from app.services.assignmentAlgorithm import run_assignment_algorithm
+from app.services.assignment_cache import persisted_run_id
+from app.services.assignment_history_services import save_algorithm_run
+
+ASSIGNMENT_PHASES = ("load", "score", "pass1", "pass2", "persist")
+
+
+class RunInProgress(Exception):
+    """A run with another mode is active for this dataset; `job` is its snapshot."""
+
+    def __init__(self, job: Dict[str, Any]):
+        super().__init__(
+            f"An assignment run in {job['params'].get('mode')} mode is already {job['status']}; "
+            "retry once it has finished."
+        )
+        self.job = job
+
+
+def run_assignment_pipeline(
+    user: str = "System",
+    mode: str = "greedy",
+    on_phase: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Run the algorithm, write ta_assignment + history, log. Returns the algorithm result."""
+    report = on_phase or (lambda _phase: None)
+    try:
+        result = run_assignment_algorithm(mode=mode, on_phase=report)
+
+        # Update DB with assignments + history snapshot (one transaction),
+        # unless ta_assignment already holds exactly this result
+        report("persist")
+        fingerprint = result["stats"]["fingerprint"]
+        run_id = persisted_run_id(fingerprint)
+        result["stats"]["db_rewrite"] = run_id is None
+        if run_id is None:
+            run_id = save_algorithm_run(
+                result["assignments"], created_by=user, notes="Algorithm run", fingerprint=fingerprint
+            )
+            action = f"TA assignment run completed (Run #{run_id})"
+        else:
+            action = f"TA assignment run completed, inputs unchanged (kept Run #{run_id})"
+        result["stats"]["run_id"] = run_id
+
+        # Log success
+        add_log(
+            action=action,
+            user=user,
+            type="success"
+        )
+        return result
+
+    except Exception as e:
+        # Log failure
+        add_log(
+            action=f"TA assignment run failed: {str(e)}",
+            user=user,
+            type="warning"
+        )
+        raise
+
+
+def submit_assignment_run(user: str = "System", mode: str = "greedy") -> Tuple[Dict[str, Any], bool]:
+    """
+    Queue run_assignment_pipeline; returns (job, coalesced). When a run for this dataset
+    is already queued/running in the same mode, that job is returned instead (its user
+    wins; see job["params"]). Raises RunInProgress if the active run has another mode.
+    """
+    job, coalesced = jobs.submit(
+        "run-assignment",
+        lambda report: run_assignment_pipeline(user=user, mode=mode, on_phase=report),
+        phases=ASSIGNMENT_PHASES,
+        coalesce_key=f"run-assignment:{settings.DB_NAME}",
+        params={"user": user, "mode": mode},
+    )
+    if coalesced and job["params"].get("mode") != mode:
+        raise RunInProgress(job)
+    return job, coalesced
@@ -0,0 +1,178 @@
+# backend/app/services/assignment_problem.py
+# Single-snapshot input loader for the assignment engine.
+#
+# Everything run_assignment_algorithm needs (TAs, professors, preference edges,
+# skills, interests, courses, weights) is read in ONE read-only REPEATABLE READ
+# transaction with a handful of set-based queries, so an admin editing
+# preferences mid-run can't produce a half-old/half-new input.
+#
+# The result is a plain, picklable AssignmentProblem, so the algorithm can also
+# run offline (benchmarks, debugging a production run) without a database.
+
+import hashlib
+import json
+import pickle
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.database import db_connection
+from app.models import Weights
+
+
+@dataclass
+class AssignmentProblem:
+    # [{"ta_id": int, "name": str, "preferred_professors": [prof name, ...]}, ...] ordered by name
+    tas: List[Dict[str, Any]] = field(default_factory=list)
+    # professor name -> preferred TA names (in preference order)
+    prof_pref_map: Dict[str, List[str]] = field(default_factory=dict)
+    # [{"course_id", "course_code", "num_tas_requested", "professors": [{"professor_id", "name"}], "skills": [...]}]
+    # ordered by course_code
+    courses: List[Dict[str, Any]] = field(default_factory=list)
+    # ta_id -> [skill, ...]
+    ta_skills_map: Dict[int, List[str]] = field(default_factory=dict)
+    # (ta_id, course_id) -> interest_level
+    ta_course_interest_map: Dict[Tuple[int, int], str] = field(default_factory=dict)
+    weights: Optional[Weights] = None
+
+    @property
+    def ta_pref_map(self) -> Dict[str, List[str]]:
+        """TA name -> preferred professor names."""
+        return {t["name"]: (t.get("preferred_professors") or []) for t in self.tas}
+
+    def fingerprint(self) -> str:
+        """
+        Stable SHA-256 over every input the algorithm reads. Equal fingerprints mean
+        equal inputs (list order included, since it breaks ties in the greedy pass).
+        """
+        payload = {
+            "tas": self.tas,
+            "prof_pref_map": self.prof_pref_map,
+            "courses": self.courses,
+            "ta_skills_map": {str(k): v for k, v in self.ta_skills_map.items()},
+            "ta_course_interest_map": sorted(
+                [int(t), int(c), str(level)] for (t, c), level in self.ta_course_interest_map.items()
+            ),
+            "weights": self.weights.model_dump() if self.weights is not None else None,
+        }
+        blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def load_assignment_problem() -> AssignmentProblem:
+    with db_connection() as conn:
+        conn.start_transaction(consistent_snapshot=True, isolation_level="REPEATABLE READ", readonly=True)
+        cursor = conn.cursor(dictionary=True)
+        try:
+            # ---- TAs + preferred professors ----
+            cursor.execute("SELECT ta_id, name FROM ta ORDER BY name ASC")
+            tas = [
+                {"ta_id": int(r["ta_id"]), "name": r["name"], "preferred_professors": []}
+                for r in (cursor.fetchall() or [])
+            ]
+            ta_by_id = {t["ta_id"]: t for t in tas}
+
+            cursor.execute("""
+                SELECT tpp.ta_id, p.name
+                FROM ta_preferred_professor tpp
+                JOIN professor p ON tpp.professor_id = p.professor_id
+            """)
+            for r in (cursor.fetchall() or []):
+                t = ta_by_id.get(int(r["ta_id"]))
+                if t is not None:
+                    t["preferred_professors"].append(r["name"])
+
+            # ---- Professors (name -> preferred TA names) ----
+            cursor.execute("SELECT professor_id, name FROM professor ORDER BY name ASC")
+            profs = cursor.fetchall() or []
+
+            cursor.execute("""
+                SELECT ppt.professor_id, t.name
+                FROM professor_preferred_ta ppt
+                JOIN ta t ON ppt.ta_id = t.ta_id
+            """)
+            pref_tas: Dict[int, List[str]] = {}
+            for r in (cursor.fetchall() or []):
+                pref_tas.setdefault(int(r["professor_id"]), []).append(r["name"])
+
+            prof_pref_map: Dict[str, List[str]] = {}
+            for p in profs:
+                prof_pref_map[p["name"]] = pref_tas.get(int(p["professor_id"]), [])
+
+            # ---- Courses + professors + skills ----
+            cursor.execute("""
+                SELECT course_id, course_code, COALESCE(num_tas_requested, 0) AS num_tas_requested
+                FROM course
+                ORDER BY course_code ASC
+            """)
+            courses = [
+                {
+                    "course_id": int(c["course_id"]),
+                    "course_code": c["course_code"],
+                    "num_tas_requested": int(c.get("num_tas_requested") or 0),
+                    "professors": [],
+                    "skills": [],
+                }
+                for c in (cursor.fetchall() or [])
+            ]
+            course_by_id = {c["course_id"]: c for c in courses}
+
+            cursor.execute("""
+                SELECT cp.course_id, p.professor_id, p.name
+                FROM course_professor cp
+                JOIN professor p ON p.professor_id = cp.professor_id
+            """)
+            for r in (cursor.fetchall() or []):
+                c = course_by_id.get(int(r["course_id"]))
+                if c is not None:
+                    c["professors"].append({"professor_id": int(r["professor_id"]), "name": r["name"]})
+
+            cursor.execute("SELECT course_id, skill FROM course_skill")
+            for r in (cursor.fetchall() or []):
+                c = course_by_id.get(int(r["course_id"]))
+                if c is not None:
+                    c["skills"].append(r["skill"])
+
+            # ---- TA skills / course interests ----
+            cursor.execute("SELECT ta_id, skill FROM ta_skill")
+            ta_skills_map: Dict[int, List[str]] = {}
+            for r in (cursor.fetchall() or []):
+                ta_skills_map.setdefault(int(r["ta_id"]), []).append(r["skill"])
+
+            cursor.execute("SELECT ta_id, course_id, interest_level FROM ta_preferred_course")
+            interest_map: Dict[Tuple[int, int], str] = {}
+            for r in (cursor.fetchall() or []):
+                interest_map[(int(r["ta_id"]), int(r["course_id"]))] = r["interest_level"]
+
+            # ---- Weights ----
+            cursor.execute("SELECT ta_pref, prof_pref, course_pref, workload_balance FROM weights LIMIT 1")
+            w = cursor.fetchone()
+            # empty table: None here; the engine only needs weights when there is something to assign
+            weights = Weights(
+                ta_pref=w["ta_pref"],
+                prof_pref=w["prof_pref"],
+                course_pref=w["course_pref"],
+                workload_balance=w["workload_balance"],
+            ) if w is not None else None
+
+            conn.commit()
+        finally:
+            cursor.close()
+
+    return AssignmentProblem(
+        tas=tas,
+        prof_pref_map=prof_pref_map,
+        courses=courses,
+        ta_skills_map=ta_skills_map,
+        ta_course_interest_map=interest_map,
+        weights=weights,
+    )
+
+
+def dump_problem(problem: AssignmentProblem, path: str) -> None:
+    with open(path, "wb") as f:
+        pickle.dump(problem, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_problem(path: str) -> AssignmentProblem:
+    with open(path, "rb") as f:
+        return pickle.load(f)
@@ -0,0 +1,223 @@
+# backend/app/services/checker_batch.py
+# Batch PDF checking: many PDFs (or zips of PDFs) per request, checked on the checker
+# process pool with bounded concurrency, results streamed back as NDJSON in finish order.
+#
+# Each file runs whole in one pool process (pdfium is not thread-safe, so files can't
+# share a process concurrently); its pages are analyzed sequentially there. Reports for
+# bytes checked before come from the report cache (checker_cache) without touching the pool.
+#
+# Admission is process-wide: files of every batch go through batch_executor, whose threads
+# (batch_concurrency()) cap the files in flight across all requests, and at most
+# CHECKER_BATCH_QUEUE_DEPTH batch requests are admitted at once (admit_batch raises
+# ExecutorBusy past that, routes answer 503 + Retry-After).
+# Output lines:
+#   {"event": "file", "index": 0, "file": "a.pdf", "ok": true, "cached": false, "elapsed_ms": 812.4, "report": {...}}
+#   {"event": "file", "index": 1, "file": "b.pdf", "ok": false, "cached": false, "elapsed_ms": 3.1, "error": "..."}
+#   {"event": "summary", "files": 2, "ok": 1, "failed": 1, "elapsed_ms": 830.0}
+
+import asyncio
+import json
+import os
+import threading
+import time
+import zipfile
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.executor import ExecutorBusy, register_executor
+from app.core.scratch import ScratchArea, UploadTooLarge
+from app.services.checker_cache import file_sha256, get_cached_report, store_report
+from app.services.checker_pool import page_workers, submit
+from app.services.internship_report_checker import run_internship_checker
+from app.services.signaturechecker import run_signature_checker
+
+CHECKERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "comp590": run_signature_checker,
+    "comp291-391": run_internship_checker,
+}
+
+
+class BatchInputError(ValueError):
+    """Unusable upload (not a PDF/zip, bad zip, too many files)."""
+
+
+def batch_concurrency() -> int:
+    n = settings.CHECKER_BATCH_CONCURRENCY
+    return max(1, n if n > 0 else page_workers())
+
+
+# each admitted batch keeps at most batch_concurrency() files pending here, so file
+# submissions of admitted batches are never rejected mid-stream
+batch_executor = register_executor(
+    "checker_batch",
+    workers=batch_concurrency(),
+    max_pending=batch_concurrency() * max(1, settings.CHECKER_BATCH_QUEUE_DEPTH),
+)
+
+_admit_lock = threading.Lock()
+_active_batches = 0
+
+
+def admit_batch() -> None:
+    """Count one more batch request in progress; raises ExecutorBusy when
+    CHECKER_BATCH_QUEUE_DEPTH are already running. Pair with release_batch()."""
+    global _active_batches
+    with _admit_lock:
+        if _active_batches >= max(1, settings.CHECKER_BATCH_QUEUE_DEPTH):
+            raise ExecutorBusy(batch_executor.retry_after())
+        _active_batches += 1
+
+
+def release_batch() -> None:
+    global _active_batches
+    with _admit_lock:
+        _active_batches = max(0, _active_batches - 1)
+
+
+def _unique_path(dest_dir: str, name: str, taken: set) -> str:
+    base = os.path.basename(name.replace("\\", "/")) or "upload.pdf"
+    stem, ext = os.path.splitext(base)
+    candidate, n = base, 1
+    while candidate.lower() in taken:
+        n += 1
+        candidate = f"{stem}_{n}{ext}"
+    taken.add(candidate.lower())
+    return os.path.join(dest_dir, candidate)
+
+
+def _copy_limited(src, path: str, limit: int, area: ScratchArea) -> None:
+    """Copy in chunks, counting bytes as they land; zip headers can lie about sizes."""
+    copied = 0
+    with open(path, "wb") as f:
+        while True:
+            chunk = src.read(1024 * 1024)
+            if not chunk:
+                break
+            copied += len(chunk)
+            if copied > limit:
+                raise UploadTooLarge(limit)
+            f.write(chunk)
+            area.add_bytes(len(chunk))
+
+
+def collect_pdfs(uploads: List[Tuple[str, Any]], area: ScratchArea) -> List[Tuple[str, str]]:
+    """
+    Write uploaded PDFs, and the PDFs inside uploaded zips, to the scratch area.
+    uploads: [(filename, readable file object)]. Returns [(display name, path)] in upload
+    order (zip members in archive order). Zip folders are flattened (no paths from the
+    archive are used on disk); non-PDF zip members are ignored. Each PDF is limited to
+    CHECKER_MAX_UPLOAD_MB (UploadTooLarge).
+    """
+    out: List[Tuple[str, str]] = []
+    taken: set = set()
+    limit = int(settings.CHECKER_MAX_UPLOAD_MB * 1024 * 1024)
+
+    def add(name: str, src) -> None:
+        if len(out) >= settings.CHECKER_BATCH_MAX_FILES:
+            raise BatchInputError(f"Too many files (max {settings.CHECKER_BATCH_MAX_FILES}).")
+        path = _unique_path(area.path, name, taken)
+        _copy_limited(src, path, limit, area)
+        out.append((name, path))
+
+    for filename, fileobj in uploads:
+        lower = (filename or "").lower()
+        if lower.endswith(".pdf"):
+            add(filename, fileobj)
+        elif lower.endswith(".zip"):
+            try:
+                with zipfile.ZipFile(fileobj) as zf:
+                    for info in zf.infolist():
+                        if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                            continue
+                        if os.path.basename(info.filename).startswith("._"):  # macOS resource forks
+                            continue
+                        with zf.open(info) as member:
+                            add(info.filename, member)
+            except zipfile.BadZipFile:
+                raise BatchInputError(f"{filename}: not a valid zip file.")
+        else:
+            raise BatchInputError(f"{filename}: please upload PDF or zip files.")
+
+    if not out:
+        raise BatchInputError("No PDF files found in the upload.")
+    return out
+
+
+def _check_file(checker: str, pdf_path: str, filename: Optional[str] = None) -> Dict[str, Any]:
+    """Pool entry point: one whole file, pages sequential in this process. filename names
+    it in the report (the scratch path's name may differ, see _unique_path)."""
+    t0 = time.perf_counter()
+    try:
+        report = CHECKERS[checker](pdf_path, debug=False, workers=1, filename=filename)
+        return {"ok": True, "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1), "report": report}
+    except Exception as e:
+        return {"ok": False, "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1), "error": str(e)}
+
+
+def _check_file_pooled(checker: str, pdf_path: str, filename: Optional[str] = None) -> Dict[str, Any]:
+    """batch_executor entry point: hand the file to the process pool and wait for it."""
+    return submit(_check_file, checker, pdf_path, filename).result()
+
+
+def _line(obj: Dict[str, Any]) -> bytes:
+    return (json.dumps(obj) + "\n").encode("utf-8")
+
+
+async def stream_batch(
+    checker: str,
+    files: List[Tuple[str, str]],
+    concurrency: Optional[int] = None,
+    on_close: Optional[Callable[[], None]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Check files [(name, path)] with at most `concurrency` in flight and yield one NDJSON
+    line per file as it finishes, then a summary line. Calls on_close at the end (also
+    when the client disconnects mid-stream), e.g. to remove the files.
+
+    Files run on batch_executor, so batch_concurrency() also caps the files in flight
+    across every batch in the process.
+    """
+    slots = asyncio.Semaphore(concurrency or batch_concurrency())
+    t0 = time.perf_counter()
+    ok = failed = 0
+
+    async def run_one(index: int, name: str, path: str) -> Dict[str, Any]:
+        t_file = time.perf_counter()
+        digest = await asyncio.to_thread(file_sha256, path)
+        report = await asyncio.to_thread(get_cached_report, checker, digest, name)
+        if report is not None:
+            elapsed = round((time.perf_counter() - t_file) * 1000.0, 1)
+            return {"event": "file", "index": index, "file": name, "ok": True, "cached": True,
+                    "elapsed_ms": elapsed, "report": report}
+
+        async with slots:
+            try:
+                result = await batch_executor.run(_check_file_pooled, checker, path, name)
+            except Exception as e:  # worker process died / pool shutting down / executor full
+                result = {"ok": False, "elapsed_ms": None, "error": f"worker failed: {e}"}
+        if result["ok"]:
+            await asyncio.to_thread(store_report, checker, digest, result["report"])
+        return {"event": "file", "index": index, "file": name, "ok": result.pop("ok"), "cached": False, **result}
+
+    tasks = [asyncio.ensure_future(run_one(i, name, path)) for i, (name, path) in enumerate(files)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            if line["ok"]:
+                ok += 1
+            else:
+                failed += 1
+            yield _line(line)
+        yield _line({
+            "event": "summary",
+            "files": len(files),
+            "ok": ok,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        })
+    finally:
+        # client went away: drop files not started yet (running ones finish in the pool)
+        for task in tasks:
+            task.cancel()
+        if on_close is not None:
+            on_close()
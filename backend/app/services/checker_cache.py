@@ -0,0 +1,92 @@
+# backend/app/services/checker_cache.py
+# Reuse PDF checker reports across identical uploads (resubmissions, graders re-checking).
+#
+# Key = sha256(PDF bytes) + checker name + params version. The params version hashes the
+# checker's profile (label patterns, ROI geometry, area and overlap thresholds, ...) and every
+# UPPERCASE constant of the engine, pdf_render and pdf_text (DPI, coarse screen, ...),
+# computed on each call, so editing any threshold changes the key and old entries are simply
+# never hit again (LRU eviction removes them).
+# Bump REPORT_VERSION for logic changes that don't touch a constant.
+
+import dataclasses
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+from app.core.cache import register_disk_cache
+from app.core.config import settings
+from app.services import checker_engine, internship_report_checker, pdf_render, pdf_text, signaturechecker
+from app.services.pdf_render import PdfSource, source_name
+
+REPORT_VERSION = 1
+
+_CHECKERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "comp590": signaturechecker.run_signature_checker,
+    "comp291-391": internship_report_checker.run_internship_checker,
+}
+
+report_cache = register_disk_cache(
+    "checker_reports",
+    settings.CHECKER_CACHE_DIR,
+    int(settings.CHECKER_CACHE_MAX_MB * 1024 * 1024),
+)
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def params_version(checker: str) -> str:
+    """Short hash of the checker's tunable constants (see module comment)."""
+    consts: Dict[str, Any] = {
+        "REPORT_VERSION": REPORT_VERSION,
+        "profile": dataclasses.asdict(checker_engine.get_profile(checker)),
+    }
+    for module in (checker_engine, pdf_render, pdf_text):
+        for name, value in vars(module).items():
+            if name.isupper() and isinstance(value, (bool, int, float, str, list, tuple, dict)):
+                consts[f"{module.__name__}.{name}"] = value
+    blob = json.dumps(consts, sort_keys=True, default=str)  # compiled patterns -> repr
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(checker: str, content_sha256: str) -> str:
+    return hashlib.sha256(f"{checker}:{params_version(checker)}:{content_sha256}".encode()).hexdigest()
+
+
+def get_cached_report(checker: str, content_sha256: str, filename: str) -> Optional[Dict[str, Any]]:
+    """Cached report for these bytes, relabeled with the current upload's file name."""
+    report = report_cache.get(cache_key(checker, content_sha256))
+    if report is not None:
+        report["file"] = os.path.basename(filename)
+    return report
+
+
+def store_report(checker: str, content_sha256: str, report: Dict[str, Any]) -> None:
+    if report.get("ok") and "debug" not in report:
+        # a cache hit does no work, so it carries no stage timings
+        report_cache.set(cache_key(checker, content_sha256), {k: v for k, v in report.items() if k != "timings"})
+
+
+def run_checker_cached(
+    checker: str,
+    pdf: PdfSource,
+    content_sha256: Optional[str] = None,
+    filename: Optional[str] = None,
+) -> Dict[str, Any]:
+    """run_*_checker(pdf) through the report cache; pdf is a path or the PDF's bytes
+    (hashed here if no digest is given)."""
+    if content_sha256:
+        digest = content_sha256
+    else:
+        digest = hashlib.sha256(pdf).hexdigest() if isinstance(pdf, bytes) else file_sha256(pdf)
+    report = get_cached_report(checker, digest, source_name(pdf, filename))
+    if report is None:
+        report = _CHECKERS[checker](pdf, debug=False, filename=filename)
+        store_report(checker, digest, report)
+    return report
@@ -0,0 +1,695 @@
+# backend/app/services/checker_engine.py
+# Shared engine for the PDF signature checkers.
+#
+# A checker is a CheckerProfile: label patterns, ROI geometry, candidate limits, whether
+# candidates overlapping typed text are rejected, and the page policy (which pages are
+# searched for labels, and what to scan when no label is found). signaturechecker.py and
+# internship_report_checker.py only declare their profile; a new document type is one more
+# register_profile(...) call.
+#
+# Rendering and preprocessing (binarize, table-line removal, opening, connected components)
+# don't depend on the profile, so run_profiles() can check one PDF against several profiles
+# with one render and one mask per distinct ROI per page.
+
+import functools
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+
+from app.core.config import settings
+from app.services import checker_timings
+from app.services.checker_pool import map_pages, page_workers
+from app.services.pdf_render import (
+    CLIP_PAD_PX, Box, PdfSource, page_size_px, render_gray, scale_box, source_name, union_box,
+)
+from app.services.pdf_text import PageText, TextGrid, pdf_box_to_pixel_box
+
+DPI = 220
+
+# Render only the union of a page's ROIs (plus CLIP_PAD_PX) instead of the whole page.
+# ROIs come from the text layer, so they are known before any rendering.
+RENDER_ROIS_ONLY = True
+
+# Coarse-to-fine: screen ROIs / fallback pages at COARSE_DPI and render at DPI only where the
+# screen finds plausible blobs. The screen reuses the profile's thresholds, scaled to COARSE_DPI.
+COARSE_DPI = 110  # 0 = always analyze at DPI
+COARSE_AREA_SLACK = 0.7  # screen keeps blobs down to this fraction of the scaled min_bbox_area
+
+# Reuse per-thread scratch arrays for the temporaries of ROI preprocessing (blur, threshold,
+# line masks, component labels) via OpenCV's dst= outputs, instead of allocating them per
+# ROI. Arrays over BUFFER_POOL_MAX_MB (full-page fallback scans) are not kept.
+BUFFER_POOL = True
+BUFFER_POOL_MAX_MB = 4
+
+LABEL_PAGES = ("first_last", "all")
+FALLBACKS = ("none", "all_pages", "label_pages")
+
+
+@dataclass(frozen=True)
+class CheckerProfile:
+    name: str  # report "checker" field and registry key
+    label_patterns: Tuple[str, ...]
+    negative_label_patterns: Tuple[str, ...] = (
+        r"\bdigital\s+signature\b",
+        r"\be-?signature\b",
+    )
+
+    # Page policy: search label_pages ("first_last" or "all") for label hits and check the
+    # ROIs next to them. If none of them has a hit, fallback decides what to scan instead:
+    # "none" (report the label pages as they are), "all_pages" or "label_pages" (full-page
+    # scan, for documents without a text-layer label).
+    label_pages: str = "all"
+    fallback: str = "none"
+    mode: str = "LABEL_ROI_SCAN"  # report "mode" when labels were searched
+    fallback_mode: str = "NO_FIELD_FALLBACK"  # report "mode" after a fallback scan
+
+    # ROI geometry, in multiples of the label box / fractions of the page
+    right_roi_w_frac: float = 0.60
+    right_roi_h_mult: float = 3.2
+    right_roi_y_pad_mult: float = 1.0
+    below_roi_w_frac_of_page: float = 0.75
+    below_roi_h_mult: float = 9.0
+    below_roi_y_gap_mult: float = 0.6
+
+    # Candidate filtering
+    min_bbox_area: int = 250
+    max_bbox_area: int = 300_000
+    max_keep_per_roi: int = 1
+    max_keep_per_page_fallback: int = 3
+    # discard candidates whose overlap with PDF text is at least this fraction of their
+    # area (None = keep them)
+    text_overlap_reject: Optional[float] = None
+
+    debug_prefix: str = "checker_dbg_"
+
+    def __post_init__(self):
+        if self.label_pages not in LABEL_PAGES:
+            raise ValueError(f"label_pages must be one of {LABEL_PAGES}, got {self.label_pages!r}")
+        if self.fallback not in FALLBACKS:
+            raise ValueError(f"fallback must be one of {FALLBACKS}, got {self.fallback!r}")
+
+
+PROFILES: Dict[str, CheckerProfile] = {}
+
+
+def register_profile(profile: CheckerProfile) -> CheckerProfile:
+    """Make the profile available by name (run_checker("name", ...), the report cache)."""
+    PROFILES[profile.name] = profile
+    return profile
+
+
+def get_profile(profile: Union[str, CheckerProfile]) -> CheckerProfile:
+    if isinstance(profile, CheckerProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown checker profile: {profile}")
+
+
+# ----------------------------
+# Text layer / labels
+# ----------------------------
+def _normalize_quotes(s: str) -> str:
+    return (
+        s.replace("’", "'")
+        .replace("‘", "'")
+        .replace("“", '"')
+        .replace("”", '"')
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(patterns: Tuple[str, ...]) -> Tuple["re.Pattern", ...]:
+    return tuple(re.compile(p, re.IGNORECASE) for p in patterns)
+
+
+def text_matches_label(profile: CheckerProfile, text: str) -> bool:
+    t = _normalize_quotes(text.strip())
+    if not t:
+        return False
+    for neg in _compile(profile.negative_label_patterns):
+        if neg.search(t):
+            return False
+    return any(p.search(t) for p in _compile(profile.label_patterns))
+
+
+def find_label_boxes_pdf_coords(profile: CheckerProfile, text: PageText) -> List[Dict[str, Any]]:
+    """
+    Find label hits from the page's text layer.
+    Returns list: { "text": "...", "box_pdf": (l,b,r,t) }
+    """
+    hits: List[Dict[str, Any]] = []
+    for rect, txt in zip(text.rects, text.texts):
+        if not txt:
+            continue
+        if text_matches_label(profile, txt):
+            hits.append({"text": txt, "box_pdf": rect})
+    return hits
+
+
+def build_rois_for_label(profile: CheckerProfile, lx: int, ly: int, lw: int, lh: int, page_w: int, page_h: int):
+    # Right ROI
+    rx = lx + lw
+    ry = int(max(0, ly - (profile.right_roi_y_pad_mult * lh)))
+    rw = int(max(1, (page_w - rx) * profile.right_roi_w_frac))
+    rh = int(min(page_h - ry, max(1, lh * profile.right_roi_h_mult)))
+
+    # Below ROI
+    bx = int(max(0, lx))
+    by = int(min(page_h - 1, ly + lh + (profile.below_roi_y_gap_mult * lh)))
+    bw = int(min(page_w - bx, page_w * profile.below_roi_w_frac_of_page))
+    bh = int(min(page_h - by, max(1, lh * profile.below_roi_h_mult)))
+
+    # Clamp
+    rx = max(0, min(page_w - 1, rx))
+    ry = max(0, min(page_h - 1, ry))
+    rw = max(1, min(page_w - rx, rw))
+    rh = max(1, min(page_h - ry, rh))
+
+    bx = max(0, min(page_w - 1, bx))
+    by = max(0, min(page_h - 1, by))
+    bw = max(1, min(page_w - bx, bw))
+    bh = max(1, min(page_h - by, bh))
+
+    return (rx, ry, rw, rh), (bx, by, bw, bh)
+
+
+# ----------------------------
+# Image processing (profile-independent)
+# ----------------------------
+def _odd(v: float) -> int:
+    return max(3, int(v) | 1)
+
+
+@functools.lru_cache(maxsize=512)
+def _rect_kernel(w: int, h: int) -> np.ndarray:
+    """Structuring element, built once per size (callers must not modify it)."""
+    return cv2.getStructuringElement(cv2.MORPH_RECT, (w, h))
+
+
+class _Scratch(threading.local):
+    def __init__(self):
+        self.flat: Dict[str, np.ndarray] = {}
+
+
+_scratch = _Scratch()
+
+
+def _buffer(name: str, shape: Tuple[int, ...], dtype=np.uint8) -> Optional[np.ndarray]:
+    """
+    Per-thread reusable array for a temporary, or None (OpenCV then allocates): when
+    BUFFER_POOL is off or the array is over BUFFER_POOL_MAX_MB. Contents are undefined, and
+    the next request for the same name in this thread reuses the memory.
+    """
+    if not BUFFER_POOL:
+        return None
+    dtype = np.dtype(dtype)
+    n = int(np.prod(shape))
+    if n * dtype.itemsize > BUFFER_POOL_MAX_MB * 1024 * 1024:
+        return None
+    flat = _scratch.flat.get(name)
+    if flat is None or flat.dtype != dtype or flat.size < n:
+        flat = np.empty(n, dtype)
+        _scratch.flat[name] = flat
+    return flat[:n].reshape(shape)
+
+
+def _binarize(gray: np.ndarray, blur: int = 5, block: int = 31, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    with checker_timings.stage("binarize"):
+        blurred = cv2.GaussianBlur(gray, (blur, blur), 0, dst=_buffer("blur", gray.shape))
+        bw = cv2.adaptiveThreshold(
+            blurred, 255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY_INV,
+            block, 10,
+            dst=dst,
+        )
+    return bw
+
+
+def _remove_table_lines(bw: np.ndarray) -> np.ndarray:
+    """Clear long horizontal/vertical runs (table rules, underlines) from bw, in place."""
+    h, w = bw.shape
+    with checker_timings.stage("line_removal"):
+        h_lines = cv2.morphologyEx(bw, cv2.MORPH_OPEN, _rect_kernel(max(30, w // 25), 1), iterations=1,
+                                   dst=_buffer("h_lines", bw.shape))
+        v_lines = cv2.morphologyEx(bw, cv2.MORPH_OPEN, _rect_kernel(1, max(30, h // 25)), iterations=1,
+                                   dst=_buffer("v_lines", bw.shape))
+
+        lines = cv2.bitwise_or(h_lines, v_lines, dst=h_lines)
+        cv2.bitwise_and(bw, cv2.bitwise_not(lines, dst=lines), dst=bw)
+    return bw
+
+
+def _stats(bw: np.ndarray) -> np.ndarray:
+    """Component stats (background row dropped); the label image goes to a scratch buffer."""
+    with checker_timings.stage("components"):
+        return cv2.connectedComponentsWithStats(bw, labels=_buffer("labels", bw.shape, np.int32), connectivity=8)[2][1:]
+
+
+def _fine_mask(gray: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mask at DPI and its component stats (background row dropped)."""
+    bw = _binarize(gray, dst=_buffer("bw", gray.shape))
+    bw = _remove_table_lines(bw)
+    with checker_timings.stage("line_removal"):  # counted with the other morphology
+        bw = cv2.morphologyEx(bw, cv2.MORPH_OPEN, _rect_kernel(3, 3), iterations=1)  # kept: the result
+    return bw, _stats(bw)
+
+
+def _coarse_mask(gray: np.ndarray, k: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mask for the low-DPI screen (k = COARSE_DPI / DPI): kernels scaled by k, and no 3x3
+    opening (it erases thin strokes at low DPI). Returns the mask and its component stats.
+    """
+    bw = _binarize(gray, blur=_odd(5 * k), block=_odd(31 * k))  # kept: the result
+    bw = _remove_table_lines(bw)
+    return bw, _stats(bw)
+
+
+def _component_candidates(stats: np.ndarray, max_keep: int, min_area: int, max_area: int) -> List[Tuple[float, int, int, int, int]]:
+    """
+    Return list of candidates: (score, x, y, w, h), best first.
+    score favors larger & moderately sparse stroke blobs.
+
+    stats: connectedComponentsWithStats rows (x, y, w, h, area), background dropped. Noisy
+    scans give tens of thousands of rows, so filtering and scoring are array operations and
+    only the top max_keep are sorted. Ties keep component order (same as a stable sort).
+    """
+    if max_keep <= 0 or len(stats) == 0:
+        return []
+    area = stats[:, cv2.CC_STAT_AREA].astype(np.float64)
+    bbox_area = stats[:, cv2.CC_STAT_WIDTH].astype(np.int64) * stats[:, cv2.CC_STAT_HEIGHT]
+    keep = (bbox_area > 0) & (area >= min_area) & (area <= max_area)
+    idx = np.flatnonzero(keep)
+    if idx.size == 0:
+        return []
+
+    fill = area[idx] / bbox_area[idx]
+    solid = fill > 0.75  # avoid solid blocks
+    idx, fill = idx[~solid], fill[~solid]
+    score = area[idx] * fill
+
+    if idx.size > max_keep:
+        # everything scoring at least the max_keep-th best (ties included), then order
+        kth = score[np.argpartition(score, idx.size - max_keep)[idx.size - max_keep]]
+        top = np.flatnonzero(score >= kth)
+        idx, score = idx[top], score[top]
+    order = np.lexsort((idx, -score))[:max_keep]
+
+    return [
+        (float(score[i]), *(int(v) for v in stats[idx[i], :4]))
+        for i in order
+    ]
+
+
+# ----------------------------
+# Per-profile decisions on shared masks
+# ----------------------------
+def _coarse_plausible(profile: CheckerProfile, stats: np.ndarray, k: float,
+                      origin: Tuple[int, int], text_grid: Optional[TextGrid]) -> bool:
+    """
+    Could the full-DPI pass find a candidate in this coarse region? Area limits scaled by k
+    with COARSE_AREA_SLACK, no fill limit, twice the text-overlap threshold, so it errs
+    towards "yes". Components thinner than the opening kernel at DPI (3 * k px) are
+    dropped, as the opening would. origin and text_grid are in coarse page pixels.
+    """
+    min_area = profile.min_bbox_area * k * k * COARSE_AREA_SLACK
+    max_area = profile.max_bbox_area * k * k / COARSE_AREA_SLACK
+    areas = stats[:, cv2.CC_STAT_AREA]
+    keep = (areas >= min_area) & (areas <= max_area)
+    keep &= np.minimum(stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT]) >= 3 * k
+    if profile.text_overlap_reject is None:
+        return bool(keep.any())
+
+    reject_at = min(1.0, 2 * profile.text_overlap_reject)
+    ox, oy = origin
+    for x, y, w, h, _area in stats[keep]:
+        if not text_grid.overlaps((int(ox + x), int(oy + y), int(w), int(h)), reject_at):
+            return True
+    return False
+
+
+def _detect(profile: CheckerProfile, mask: np.ndarray, stats: np.ndarray, box: Box,
+            max_keep: int, text_grid: TextGrid) -> Dict[str, Any]:
+    """
+    Candidates in a box's full-DPI mask, in page pixels; rejects candidates overlapping
+    typed PDF text when the profile asks for it. Returns: { found, candidates, mask }
+    """
+    bx, by = box[0], box[1]
+    candidates = []
+    with checker_timings.stage("components"):
+        ranked = _component_candidates(stats, max_keep, profile.min_bbox_area, profile.max_bbox_area)
+    for (score, cx, cy, cw, ch) in ranked:
+        bbox = (int(bx + cx), int(by + cy), int(cw), int(ch))
+        if profile.text_overlap_reject is not None and text_grid and text_grid.overlaps(bbox, profile.text_overlap_reject):
+            continue
+        candidates.append({
+            "score": float(score),
+            "bbox_px": [bbox[0], bbox[1], bbox[2], bbox[3]],
+        })
+    return {"found": len(candidates) > 0, "candidates": candidates, "mask": mask}
+
+
+# ----------------------------
+# Page analysis
+# ----------------------------
+Job = Tuple[CheckerProfile, str]  # (profile, "labels" | "fallback")
+
+
+def _label_page_indices(profile: CheckerProfile, page_count: int) -> List[int]:
+    if profile.label_pages == "all":
+        return list(range(page_count))
+    last = max(0, page_count - 1)
+    return [0] + ([last] if last != 0 else [])
+
+
+def analyze_page(pdf: pdfium.PdfDocument, pidx: int, scale: float, jobs: Sequence[Job],
+                 text: Optional[PageText] = None) -> List[Dict[str, Any]]:
+    """
+    Check one page for every (profile, kind) job with one coarse and at most one full-DPI
+    render; identical ROIs share their masks. Returns one report page entry per job, each
+    with "_masks" ([(file name, mask), ...] for debug output; callers pop it).
+    """
+    if text is None:
+        text = PageText(pdf[pidx], scale)
+    page = text.page
+    page_h_pts = float(page.get_height())
+    W, H = page_size_px(page, scale)
+
+    # boxes each job needs analyzed: [right, below] per label hit, or the whole page
+    plans = []
+    for profile, kind in jobs:
+        if kind == "fallback":
+            plans.append((None, [(0, 0, W, H)]))
+            continue
+        hits = find_label_boxes_pdf_coords(profile, text)
+        label_rois = []
+        for hit in hits:
+            lx, ly, lw, lh = pdf_box_to_pixel_box(hit["box_pdf"], page_h_pts, scale)
+            label_rois.append(((lx, ly, lw, lh), *build_rois_for_label(profile, lx, ly, lw, lh, W, H)))
+        plans.append(((hits, label_rois), [r for _, right, below in label_rois for r in (right, below)]))
+    boxes = list(dict.fromkeys(b for _, job_boxes in plans for b in job_boxes))
+
+    # coarse screen: one low-DPI render, one mask per distinct box
+    plausible: Dict[Tuple[str, Box], bool] = {}
+    coarse: Dict[Box, Tuple[np.ndarray, np.ndarray, Box]] = {}
+    if boxes and COARSE_DPI and COARSE_DPI < DPI:
+        k = COARSE_DPI / DPI
+        cw, ch = page_size_px(page, scale * k)
+        c_boxes = {b: scale_box(b, k, cw, ch) for b in boxes}
+        clip = union_box(c_boxes.values(), pad=CLIP_PAD_PX, page_w=cw, page_h=ch) if RENDER_ROIS_ONLY else None
+        gray, (ox, oy) = render_gray(page, scale * k, clip)
+        for b, (x, y, w, h) in c_boxes.items():
+            coarse[b] = (*_coarse_mask(gray[y - oy:y - oy + h, x - ox:x - ox + w], k), (x, y, w, h))
+        c_grid = None
+        for (profile, _), (_, job_boxes) in zip(jobs, plans):
+            if profile.text_overlap_reject is not None and c_grid is None:
+                c_grid = text.scaled_grid(k, cw, ch)
+            for b in job_boxes:
+                mask, stats, (x, y, _, _) = coarse[b]
+                with checker_timings.stage("components"):
+                    plausible[(profile.name, b)] = _coarse_plausible(profile, stats, k, (x, y), c_grid)
+    else:
+        plausible = {(profile.name, b): True for (profile, _), (_, job_boxes) in zip(jobs, plans) for b in job_boxes}
+
+    # full DPI only where some profile needs it: one render, one mask per distinct box
+    refine = [b for b in boxes if any(plausible.get((profile.name, b)) for profile, _ in jobs)]
+    fine: Dict[Box, Tuple[np.ndarray, np.ndarray]] = {}
+    if refine:
+        clip = union_box(refine, pad=CLIP_PAD_PX, page_w=W, page_h=H) if RENDER_ROIS_ONLY else None
+        gray, (ox, oy) = render_gray(page, scale, clip)
+        for (x, y, w, h) in refine:
+            fine[(x, y, w, h)] = _fine_mask(gray[y - oy:y - oy + h, x - ox:x - ox + w])
+
+    entries = []
+    for (profile, kind), (labels, job_boxes) in zip(jobs, plans):
+        max_keep = profile.max_keep_per_page_fallback if kind == "fallback" else profile.max_keep_per_roi
+        results = [
+            _detect(profile, *fine[b], b, max_keep, text.grid) if plausible[(profile.name, b)]
+            else {"found": False, "candidates": [], "mask": coarse[b][0]}
+            for b in job_boxes
+        ]
+        if kind == "fallback":
+            entries.append(_fallback_entry(pidx, results[0]))
+        else:
+            entries.append(_label_entry(pidx, *labels, results))
+    return entries
+
+
+def _label_entry(pidx: int, hits, label_rois, results) -> Dict[str, Any]:
+    page_entry: Dict[str, Any] = {"page": pidx + 1, "page_status": "NOT_FOUND", "hits": [], "_masks": []}
+    for hit_i, (hit, ((lx, ly, lw, lh), (rx, ry, rw, rh), (bx, by, bw, bh))) in enumerate(
+        zip(hits, label_rois), start=1
+    ):
+        right, below = results[2 * hit_i - 2], results[2 * hit_i - 1]
+        found = right["found"] or below["found"]
+
+        candidates = []
+        if right["found"]:
+            for c in right["candidates"]:
+                candidates.append({"where": "RIGHT", **c})
+        if below["found"]:
+            for c in below["candidates"]:
+                candidates.append({"where": "BELOW", **c})
+
+        page_entry["hits"].append({
+            "label_or_pattern": hit["text"],
+            "hit_index": hit_i,
+            "status": "FOUND" if found else "NOT_FOUND",
+            "label_box_px": [int(lx), int(ly), int(lw), int(lh)],
+            "right_roi_px": [int(rx), int(ry), int(rw), int(rh)],
+            "below_roi_px": [int(bx), int(by), int(bw), int(bh)],
+            "candidates": candidates,
+        })
+        page_entry["_masks"].append((f"p{pidx+1}_hit{hit_i}_mask_right.png", right["mask"]))
+        page_entry["_masks"].append((f"p{pidx+1}_hit{hit_i}_mask_below.png", below["mask"]))
+
+        if found:
+            page_entry["page_status"] = "FOUND"
+    return page_entry
+
+
+def _fallback_entry(pidx: int, fb: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "page": pidx + 1,
+        "page_status": "FOUND" if fb["found"] else "NOT_FOUND",
+        "hits": [{
+            "label_or_pattern": None,
+            "hit_index": 1,
+            "status": "FOUND" if fb["found"] else "NOT_FOUND",
+            "label_box_px": None,
+            "right_roi_px": None,
+            "below_roi_px": None,
+            "candidates": [{"where": "FALLBACK", **c} for c in fb["candidates"]],
+        }],
+        "_masks": [(f"p{pidx+1}_fallback_mask.png", fb["mask"])],
+    }
+
+
+PageStages = Optional[Dict[str, List[float]]]  # checker_timings stages of one page
+
+
+def _pages_worker(pdf_path: PdfSource, page_indices: List[int], plan: Dict[int, List[Job]],
+                  timings: bool = False) -> List[Tuple[List[Dict[str, Any]], PageStages]]:
+    """
+    Process-pool entry point: open the PDF here, return (page entries without masks, stage
+    timings or None) per page. With timings, the open is counted on the chunk's first page.
+    """
+    with checker_timings.recording(timings) as rec:
+        with checker_timings.stage("open"):
+            pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            scale = DPI / 72.0
+            out = []
+            for pidx in page_indices:
+                with checker_timings.page(pidx):
+                    entries = analyze_page(pdf, pidx, scale, plan[pidx])
+                for entry in entries:
+                    entry.pop("_masks", None)
+                out.append(entries)
+        finally:
+            pdf.close()
+    if rec is None:
+        return [(entries, None) for entries in out]
+    if page_indices:
+        rec.pages.setdefault(page_indices[0], {}).update(rec.document)
+    return [(entries, rec.pages.get(pidx)) for pidx, entries in zip(page_indices, out)]
+
+
+# ----------------------------
+# Main callables
+# ----------------------------
+def run_profiles(
+    profiles: Sequence[Union[str, CheckerProfile]],
+    pdf_path: PdfSource,
+    debug: bool = False,
+    workers: Optional[int] = None,
+    filename: Optional[str] = None,
+    timings: Optional[bool] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Check one PDF against several profiles; returns {profile name: report}. Each page is
+    rendered and preprocessed once for all profiles that look at it.
+
+    Default: returns JSON only, writes nothing to disk.
+    If debug=True: writes masks + report.json into a temp folder per profile and returns
+    debug.out_dir in each report.
+    pdf_path may also be the PDF's bytes (no temp file needed); filename then names it in the report.
+
+    Two phases: a text-layer pass over every page a profile looks at (label matching and
+    the page policy, no rendering), then raster work only on the pages that need it (a
+    label hit, or a fallback scan). Label pages without a hit are reported without ever
+    being rendered or sent to a worker; reports say how many ("skipped_pages") and how long
+    each phase took ("phase_ms"; with several profiles the phases are shared, so every
+    report carries the same numbers).
+
+    Raster work over more than the first/last pages is spread over a process pool (see
+    checker_pool.map_pages); workers overrides CHECKER_PAGE_WORKERS (1 = sequential).
+    Output is identical either way.
+
+    timings (default settings.CHECKER_TIMINGS): add "timings", wall time and allocated bytes
+    per stage (open, textpage, render, grayscale, binarize, line_removal, components) for the
+    document and each page, and feed them to the checker_timings histograms.
+    """
+    if timings is None:
+        timings = settings.CHECKER_TIMINGS
+    profiles = list({p.name: p for p in map(get_profile, profiles)}.values())
+    with checker_timings.recording(timings) as rec:
+        t0 = time.perf_counter()
+        with checker_timings.stage("open"):
+            pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            scale = DPI / 72.0
+            page_count = len(pdf)
+
+            # text pass: label hits on every label page, and the page policy
+            texts: Dict[int, PageText] = {}
+            has_hits: Dict[Tuple[str, int], bool] = {}
+            for profile in profiles:
+                for pidx in _label_page_indices(profile, page_count):
+                    with checker_timings.page(pidx):
+                        if pidx not in texts:
+                            texts[pidx] = PageText(pdf[pidx], scale)
+                        has_hits[(profile.name, pidx)] = bool(find_label_boxes_pdf_coords(profile, texts[pidx]))
+
+            plan: Dict[int, List[Job]] = {}
+            pages_of: Dict[str, List[int]] = {}
+            modes: Dict[str, str] = {}
+            for profile in profiles:
+                kind, mode, indices = "labels", profile.mode, _label_page_indices(profile, page_count)
+                if profile.fallback != "none" and not any(has_hits[(profile.name, pidx)] for pidx in indices):
+                    kind, mode = "fallback", profile.fallback_mode
+                    if profile.fallback == "all_pages":
+                        indices = list(range(page_count))
+                modes[profile.name] = mode
+                pages_of[profile.name] = indices
+                for pidx in indices:
+                    plan.setdefault(pidx, []).append((profile, kind))
+
+            def rasterize(profile: CheckerProfile, kind: str, pidx: int) -> bool:
+                return kind == "fallback" or has_hits[(profile.name, pidx)]
+
+            raster_pages = [pidx for pidx in sorted(plan) if any(rasterize(p, k, pidx) for p, k in plan[pidx])]
+            text_ms = (time.perf_counter() - t0) * 1000.0
+
+            # raster pass
+            t1 = time.perf_counter()
+            pooled = any(kind == "fallback" or profile.label_pages == "all" for jobs in plan.values() for profile, kind in jobs)
+            if pooled and not debug and min(workers or page_workers(), len(raster_pages)) > 1:
+                worker = functools.partial(_pages_worker, plan=plan, timings=timings)
+                per_page = []
+                for pidx, (page_entries, stages) in zip(raster_pages, map_pages(worker, pdf_path, raster_pages, workers=workers)):
+                    per_page.append(page_entries)
+                    for name, (ms, nbytes) in (stages or {}).items():
+                        slot = rec.pages.setdefault(pidx, {}).setdefault(name, [0.0, 0])
+                        slot[0] += ms
+                        slot[1] += nbytes
+            else:
+                # first/last label pages only (cheap), a single worker, or masks are needed on
+                # disk: stay in-process and reuse the open document and the text pass
+                per_page = []
+                for pidx in raster_pages:
+                    with checker_timings.page(pidx):
+                        per_page.append(analyze_page(pdf, pidx, scale, plan[pidx], texts.get(pidx)))
+            raster_ms = (time.perf_counter() - t1) * 1000.0
+        finally:
+            pdf.close()
+    stage_report = checker_timings.to_report(rec.document, rec.pages) if rec is not None else None
+    if stage_report is not None:
+        checker_timings.record(",".join(p.name for p in profiles), stage_report)
+
+    entries = {
+        (profile.name, pidx): entry
+        for pidx, page_entries in zip(raster_pages, per_page)
+        for (profile, _), entry in zip(plan[pidx], page_entries)
+    }
+    skipped: Dict[str, int] = {}
+    for pidx, jobs in plan.items():
+        for profile, kind in jobs:
+            if not rasterize(profile, kind, pidx):
+                entries[(profile.name, pidx)] = _label_entry(pidx, [], [], [])
+                skipped[profile.name] = skipped.get(profile.name, 0) + 1
+    reports = {}
+    for profile in profiles:
+        out_dir: Optional[str] = None
+        if debug:
+            out_dir = tempfile.mkdtemp(prefix=profile.debug_prefix)
+            os.makedirs(out_dir, exist_ok=True)
+
+        report: Dict[str, Any] = {
+            "ok": True,
+            "checker": profile.name,
+            "file": source_name(pdf_path, filename),
+            "mode": modes[profile.name],
+            "overall_status": "NOT_FOUND",
+            "pages": [],
+        }
+        if debug:
+            report["debug"] = {"out_dir": out_dir}
+
+        overall_found = False
+        for pidx in pages_of[profile.name]:
+            page_entry = entries[(profile.name, pidx)]
+            for name, mask in page_entry.pop("_masks", []):
+                if out_dir:
+                    cv2.imwrite(os.path.join(out_dir, name), mask)
+            if page_entry["page_status"] == "FOUND":
+                overall_found = True
+            report["pages"].append(page_entry)
+
+        report["overall_status"] = "FOUND" if overall_found else "NOT_FOUND"
+        report["skipped_pages"] = skipped.get(profile.name, 0)
+        report["phase_ms"] = {"text_pass": round(text_ms, 1), "raster": round(raster_ms, 1)}
+        if stage_report is not None:
+            report["timings"] = stage_report
+
+        if debug and out_dir:
+            with open(os.path.join(out_dir, "report.json"), "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+        reports[profile.name] = report
+    return reports
+
+
+def run_checker(
+    profile: Union[str, CheckerProfile],
+    pdf_path: PdfSource,
+    debug: bool = False,
+    workers: Optional[int] = None,
+    filename: Optional[str] = None,
+    timings: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """run_profiles for a single profile; returns its report."""
+    profile = get_profile(profile)
+    return run_profiles([profile], pdf_path, debug=debug, workers=workers, filename=filename,
+                        timings=timings)[profile.name]
@@ -0,0 +1,91 @@
+# backend/app/services/checker_pool.py
+# Process pool for per-page PDF checker work (rendering + OpenCV are CPU-bound and hold the GIL
+# only partly, so threads don't scale).
+#
+# Single-file checks run on checker_executor, off the event loop: one thread, because
+# pdfium is not thread-safe within a process; its page work still fans out to the pool.
+#
+# Workers open the PDF themselves from its path (a PdfDocument can't be pickled) and
+# return small JSON-able page entries, never images. Pages are split into contiguous
+# chunks so each worker opens the document once per chunk; results come back in page order.
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.executor import register_executor
+
+checker_executor = register_executor("checker", workers=1, max_pending=settings.CHECKER_QUEUE_DEPTH)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def page_workers() -> int:
+    """Configured worker count (CHECKER_PAGE_WORKERS; 0 = one per CPU)."""
+    n = settings.CHECKER_PAGE_WORKERS
+    return max(1, n if n > 0 else (os.cpu_count() or 1))
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        # a worker that died (OOM, segfault in a bad PDF) breaks the pool for good: replace it
+        if _pool is None or _pool_workers != workers or getattr(_pool, "_broken", False):
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # spawn: forking a threaded server process (DB pool, job workers) is unsafe
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_page_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown_page_pool)
+
+
+def submit(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run fn(*args) on the shared pool (page_workers() processes); fn must be module-level."""
+    return _get_pool(page_workers()).submit(fn, *args)
+
+
+def map_pages(
+    worker: Callable[[str, List[int]], List[Any]],
+    pdf_path: str,
+    page_indices: Sequence[int],
+    workers: Optional[int] = None,
+) -> List[Any]:
+    """
+    Run worker(pdf_path, chunk_of_page_indices) -> [result per page] over all pages and
+    return the results in page_indices order. `worker` must be a module-level function.
+
+    Runs in-process (same code path, no pool) when there is one worker or one page.
+    """
+    indices = list(page_indices)
+    pool_size = workers or page_workers()
+    n_workers = min(pool_size, len(indices))
+    if n_workers <= 1:
+        return worker(pdf_path, indices)
+
+    # a few chunks per worker evens out pages of different cost
+    n_chunks = min(len(indices), n_workers * 2)
+    size = -(-len(indices) // n_chunks)
+    chunks = [indices[i:i + size] for i in range(0, len(indices), size)]
+
+    pool = _get_pool(pool_size)
+    results: List[Any] = []
+    for part in pool.map(worker, [pdf_path] * len(chunks), chunks):
+        results.extend(part)
+    return results
@@ -0,0 +1,203 @@
+# backend/app/services/checker_timings.py
+# Opt-in per-stage profiling for the PDF checkers (settings.CHECKER_TIMINGS, or timings=True
+# on run_profiles / run_checker).
+#
+# The engine wraps each stage in `with stage("render"):`. With no recorder active on the
+# thread that is a no-op; with one, the stage's wall time and allocated bytes are added to
+# the current page (page(pidx)) or, outside a page, to the document. Allocated bytes are
+# the traced-memory peak above the level at stage start (tracemalloc, started while any
+# recorder is active), plus pdfium's bitmap buffer for "render", which tracemalloc can't see.
+# tracemalloc is process-wide: with several checks profiled at once the byte counts of
+# overlapping stages include each other's allocations; the times don't.
+#
+# record() feeds finished reports' timings into in-process histograms (get_timing_stats(),
+# served at /api/metrics/checker-timings).
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+
+STAGES = ("open", "textpage", "render", "grayscale", "binarize", "line_removal", "components")
+
+# histogram bucket upper bounds, ms per stage per page ("+Inf" catches the rest)
+TIMING_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_local = threading.local()
+_NULL = nullcontext()
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def _start_tracing() -> None:
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _stop_tracing() -> None:
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+class Recorder:
+    """Stage times/bytes of one check: {"document": {stage: [ms, bytes]}, pages: {pidx: {...}}}."""
+
+    def __init__(self):
+        self.document: Dict[str, List[float]] = {}
+        self.pages: Dict[int, Dict[str, List[float]]] = {}
+        self._page: Optional[int] = None
+        self._stage: Optional[List[float]] = None
+
+    def _slot(self, name: str) -> List[float]:
+        stages = self.document if self._page is None else self.pages.setdefault(self._page, {})
+        return stages.setdefault(name, [0.0, 0])
+
+    @contextmanager
+    def stage(self, name: str):
+        if self._stage is not None:  # nested: counted in the outer stage
+            yield
+            return
+        slot = self._slot(name)
+        self._stage = slot
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            slot[0] += (time.perf_counter() - t0) * 1000.0
+            slot[1] += max(0, tracemalloc.get_traced_memory()[1] - start)
+            self._stage = None
+
+    @contextmanager
+    def page(self, pidx: int):
+        prev, self._page = self._page, pidx
+        try:
+            yield
+        finally:
+            self._page = prev
+
+
+@contextmanager
+def recording(enabled: bool = True):
+    """Activate a Recorder on this thread for the block (yields None when not enabled)."""
+    if not enabled:
+        yield None
+        return
+    rec = Recorder()
+    prev = getattr(_local, "recorder", None)
+    _local.recorder = rec
+    _start_tracing()
+    try:
+        yield rec
+    finally:
+        _stop_tracing()
+        _local.recorder = prev
+
+
+def stage(name: str):
+    rec = getattr(_local, "recorder", None)
+    return _NULL if rec is None else rec.stage(name)
+
+
+def page(pidx: int):
+    rec = getattr(_local, "recorder", None)
+    return _NULL if rec is None else rec.page(pidx)
+
+
+def add_bytes(n: int) -> None:
+    """Count n bytes allocated outside Python's allocator (pdfium) to the current stage."""
+    rec = getattr(_local, "recorder", None)
+    if rec is not None and rec._stage is not None:
+        rec._stage[1] += int(n)
+
+
+def _stage_dict(stages: Dict[str, List[float]]) -> Dict[str, Dict[str, Any]]:
+    return {name: {"ms": round(stages[name][0], 3), "bytes": int(stages[name][1])}
+            for name in STAGES if name in stages}
+
+
+def to_report(document: Dict[str, List[float]], pages: Dict[int, Dict[str, List[float]]]) -> Dict[str, Any]:
+    """The report's "timings" value: per-document stages, per-page stages and totals."""
+    total: Dict[str, List[float]] = {}
+    for stages in [document, *pages.values()]:
+        for name, (ms, nbytes) in stages.items():
+            slot = total.setdefault(name, [0.0, 0])
+            slot[0] += ms
+            slot[1] += nbytes
+    return {
+        "document": _stage_dict(document),
+        "pages": [{"page": pidx + 1, "stages": _stage_dict(pages[pidx])} for pidx in sorted(pages)],
+        "total": _stage_dict(total),
+    }
+
+
+# ----------------------------
+# Histograms
+# ----------------------------
+_hist_lock = threading.Lock()
+_hist: Dict[str, Dict[str, Dict[str, Any]]] = {}  # checker -> stage -> histogram
+_reports = {"recorded": 0}
+
+
+def _new_histogram() -> Dict[str, Any]:
+    return {"count": 0, "sum_ms": 0.0, "max_ms": 0.0, "sum_bytes": 0, "max_bytes": 0,
+            "buckets": [0] * (len(TIMING_BUCKETS_MS) + 1)}
+
+
+def record(checker: str, timings: Dict[str, Any]) -> None:
+    """Add one report's stage samples (document stages once, page stages per page)."""
+    samples = [timings["document"]] + [p["stages"] for p in timings["pages"]]
+    with _hist_lock:
+        _reports["recorded"] += 1
+        per_stage = _hist.setdefault(checker, {})
+        for stages in samples:
+            for name, s in stages.items():
+                h = per_stage.setdefault(name, _new_histogram())
+                h["count"] += 1
+                h["sum_ms"] += s["ms"]
+                h["max_ms"] = max(h["max_ms"], s["ms"])
+                h["sum_bytes"] += s["bytes"]
+                h["max_bytes"] = max(h["max_bytes"], s["bytes"])
+                i = next((i for i, le in enumerate(TIMING_BUCKETS_MS) if s["ms"] <= le), len(TIMING_BUCKETS_MS))
+                h["buckets"][i] += 1
+
+
+def get_timing_stats() -> Dict[str, Any]:
+    """Per checker and stage: sample count, ms sum/avg/max, bytes sum/avg/max and cumulative
+    ms buckets (Prometheus-style "le")."""
+    with _hist_lock:
+        out: Dict[str, Any] = {"reports": _reports["recorded"], "checkers": {}}
+        for checker, per_stage in _hist.items():
+            stages = {}
+            for name in STAGES:
+                h = per_stage.get(name)
+                if h is None:
+                    continue
+                cumulative, buckets = 0, {}
+                for le, n in zip([*map(str, TIMING_BUCKETS_MS), "+Inf"], h["buckets"]):
+                    cumulative += n
+                    buckets[le] = cumulative
+                stages[name] = {
+                    "count": h["count"],
+                    "sum_ms": round(h["sum_ms"], 3),
+                    "avg_ms": round(h["sum_ms"] / h["count"], 3),
+                    "max_ms": round(h["max_ms"], 3),
+                    "sum_bytes": h["sum_bytes"],
+                    "avg_bytes": h["sum_bytes"] // h["count"],
+                    "max_bytes": h["max_bytes"],
+                    "buckets_ms": buckets,
+                }
+            out["checkers"][checker] = stages
+        return out
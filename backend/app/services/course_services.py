@@ -1,4 +1,6 @@
-from app.core.database import get_db_connection
+from app.core.database import db_connection, fetch_related
+from app.services.assignment_cache import invalidate_assignment_results
+from app.services.skills_services import skills_cache
 from app.models import Course
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
@@ -10,23 +12,67 @@ class CourseUpdate(BaseModel):
     skills: List[str]
 
 
+COURSE_RELATIONS = ("skills", "professors", "assigned_tas")
+
+
+def hydrate_courses(cursor, courses: list[dict], relations=COURSE_RELATIONS) -> list[dict]:
+    """
+    Fill course rows in place with their related data, one IN (...) query per relation:
+    - "skills"       -> course["skills"]
+    - "professors"   -> course["professors"] (names) and course["professor_name"] (first one)
+    - "assigned_tas" -> course["assignedTAs"] (names)
+
+    `cursor` must be a dictionary cursor. Returns `courses` for convenience.
+    """
+    if not courses:
+        return courses
+    course_ids = [c["course_id"] for c in courses]
+
+    if "skills" in relations:
+        skills = fetch_related(cursor, """
+            SELECT course_id, skill
+            FROM course_skill
+            WHERE course_id IN ({ids})
+        """, course_ids, key="course_id")
+        for course in courses:
+            course["skills"] = [r["skill"] for r in skills.get(course["course_id"], [])]
+
+    if "professors" in relations:
+        profs = fetch_related(cursor, """
+            SELECT cp.course_id, p.name
+            FROM course_professor cp
+            JOIN professor p ON cp.professor_id = p.professor_id
+            WHERE cp.course_id IN ({ids})
+            ORDER BY cp.course_professor_id
+        """, course_ids, key="course_id")
+        for course in courses:
+            names = [r["name"] for r in profs.get(course["course_id"], [])]
+            course["professors"] = names
+            course["professor_name"] = names[0] if names else None
+
+    if "assigned_tas" in relations:
+        assigned = fetch_related(cursor, """
+            SELECT ta_assignment.course_id, ta.name
+            FROM ta_assignment
+            JOIN ta ON ta_assignment.ta_id = ta.ta_id
+            WHERE ta_assignment.course_id IN ({ids})
+        """, course_ids, key="course_id")
+        for course in courses:
+            course["assignedTAs"] = [r["name"] for r in assigned.get(course["course_id"], [])]
+
+    return courses
+
+
 def get_courses() -> list[Course]:
-    with get_db_connection() as conn:
+    with db_connection() as conn:
         cursor = conn.cursor(dictionary=True)
         cursor.execute("SELECT * FROM course")
         results = cursor.fetchall()
-
-        for course in results:
-            cursor.execute(
-                "SELECT skill FROM course_skill WHERE course_id = %s",
-                (course["course_id"],)
-            )
-            skill_rows = cursor.fetchall()
-            course["skills"] = [row["skill"] for row in skill_rows]
-
+        hydrate_courses(cursor, results)
+        cursor.close()
         return results
     
-from app.core.database import get_db_connection
+from app.core.database import db_connection
 from app.models import Course  # assuming Course model exists
 
 def get_courses_by_professor_username(username: str) -> list[dict]:
@@ -34,61 +80,38 @@ def get_courses_by_professor_username(username: str) -> list[dict]:
     Fetch all courses taught by the professor with the given username,
     including assigned TAs and course skills.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Step 1: Get professor_id from username
-    cursor.execute(
-        "SELECT professor_id FROM user WHERE username = %s AND professor_id IS NOT NULL",
-        (username,)
-    )
-    prof_row = cursor.fetchone()
-    if not prof_row:
-        cursor.close()
-        conn.close()
-        return []
-
-    professor_id = prof_row["professor_id"]
-
-    # Step 2: Get courses taught by this professor
-    cursor.execute(
-        """
-        SELECT c.course_id, c.course_code, c.ps_lab_sections, c.enrollment_capacity,
-               c.actual_enrollment, c.num_tas_requested, c.assigned_tas_count
-        FROM course c
-        JOIN course_professor cp ON c.course_id = cp.course_id
-        WHERE cp.professor_id = %s
-        """,
-        (professor_id,)
-    )
-    courses = cursor.fetchall()
-
-    for course in courses:
-        course_id = course["course_id"]
-
-        # Step 3: Assigned TAs
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        # Step 1: Get professor_id from username
         cursor.execute(
-            """
-            SELECT ta.ta_id, ta.name
-            FROM ta_assignment
-            JOIN ta ON ta_assignment.ta_id = ta.ta_id
-            WHERE ta_assignment.course_id = %s
-            """,
-            (course_id,)
+            "SELECT professor_id FROM user WHERE username = %s AND professor_id IS NOT NULL",
+            (username,)
         )
-        assigned_rows = cursor.fetchall()
-        course["assignedTAs"] = [row["name"] for row in assigned_rows]
+        prof_row = cursor.fetchone()
+        if not prof_row:
+            cursor.close()
+            return []
+
+        professor_id = prof_row["professor_id"]
 
-        # Step 4: Course skills
+        # Step 2: Get courses taught by this professor
         cursor.execute(
-            "SELECT skill FROM course_skill WHERE course_id = %s",
-            (course_id,)
+            """
+            SELECT c.course_id, c.course_code, c.ps_lab_sections, c.enrollment_capacity,
+                   c.actual_enrollment, c.num_tas_requested, c.assigned_tas_count
+            FROM course c
+            JOIN course_professor cp ON c.course_id = cp.course_id
+            WHERE cp.professor_id = %s
+            """,
+            (professor_id,)
         )
-        skill_rows = cursor.fetchall()
-        course["skills"] = [row["skill"] for row in skill_rows]
+        courses = cursor.fetchall()
 
-    cursor.close()
-    conn.close()
+        # Step 3: Assigned TAs + course skills for all of them at once
+        hydrate_courses(cursor, courses, relations=("assigned_tas", "skills"))
+
+        cursor.close()
     return courses
 
 def update_course_in_db(data: CourseUpdate):
@@ -98,32 +121,33 @@ def update_course_in_db(data: CourseUpdate):
     - course_skill table (removes old skills, inserts new)
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # 1. Update num_tas_requested
-        cursor.execute("""
-            UPDATE course
-            SET num_tas_requested = %s
-            WHERE course_id = %s
-        """, (data.num_tas_requested, data.course_id))
-
-        # 2. Delete old skills
-        cursor.execute("""
-            DELETE FROM course_skill
-            WHERE course_id = %s
-        """, (data.course_id,))
+        with db_connection() as conn:
+            cursor = conn.cursor()
 
-        # 3. Insert new skills
-        for skill in data.skills:
+            # 1. Update num_tas_requested
             cursor.execute("""
-                INSERT INTO course_skill (course_id, skill)
-                VALUES (%s, %s)
-            """, (data.course_id, skill))
+                UPDATE course
+                SET num_tas_requested = %s
+                WHERE course_id = %s
+            """, (data.num_tas_requested, data.course_id))
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+            # 2. Delete old skills
+            cursor.execute("""
+                DELETE FROM course_skill
+                WHERE course_id = %s
+            """, (data.course_id,))
+
+            # 3. Insert new skills
+            for skill in data.skills:
+                cursor.execute("""
+                    INSERT INTO course_skill (course_id, skill)
+                    VALUES (%s, %s)
+                """, (data.course_id, skill))
+
+            conn.commit()
+            cursor.close()
+        skills_cache.invalidate()
+        invalidate_assignment_results()
 
         return {"message": "Course updated successfully"}
 
@@ -133,217 +157,163 @@ def update_course_in_db(data: CourseUpdate):
 
 def create_course_with_professor(course_code: str, username: str, num_tas_requested: int = 0, skills: list[str] = None):
     skills = skills or []
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("""
-        SELECT professor_id
-        FROM user
-        WHERE username = %s AND user_type = 'faculty'
-    """, (username,))
-    prof = cursor.fetchone()
-    if not prof:
-        raise ValueError("Professor not found")
-
-    cursor.execute("SELECT course_id FROM course WHERE course_code = %s", (course_code,))
-    if cursor.fetchone():
-        raise ValueError("Course already exists")
-
-    cursor.execute(
-        "INSERT INTO course (course_code, num_tas_requested) VALUES (%s, %s)",
-        (course_code, num_tas_requested)
-    )
-    course_id = cursor.lastrowid
-
-    cursor.execute(
-        "INSERT INTO course_professor (course_id, professor_id) VALUES (%s, %s)",
-        (course_id, prof["professor_id"])
-    )
-
-    # insert skills (unique + non-empty)
-    uniq = []
-    for s in skills:
-        s2 = (s or "").strip()
-        if s2 and s2 not in uniq:
-            uniq.append(s2)
-
-    for s in uniq:
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        cursor.execute("""
+            SELECT professor_id
+            FROM user
+            WHERE username = %s AND user_type = 'faculty'
+        """, (username,))
+        prof = cursor.fetchone()
+        if not prof:
+            raise ValueError("Professor not found")
+
+        cursor.execute("SELECT course_id FROM course WHERE course_code = %s", (course_code,))
+        if cursor.fetchone():
+            raise ValueError("Course already exists")
+
         cursor.execute(
-            "INSERT INTO course_skill (course_id, skill) VALUES (%s, %s)",
-            (course_id, s)
+            "INSERT INTO course (course_code, num_tas_requested) VALUES (%s, %s)",
+            (course_code, num_tas_requested)
         )
+        course_id = cursor.lastrowid
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+        cursor.execute(
+            "INSERT INTO course_professor (course_id, professor_id) VALUES (%s, %s)",
+            (course_id, prof["professor_id"])
+        )
+
+        # insert skills (unique + non-empty)
+        uniq = []
+        for s in skills:
+            s2 = (s or "").strip()
+            if s2 and s2 not in uniq:
+                uniq.append(s2)
+
+        for s in uniq:
+            cursor.execute(
+                "INSERT INTO course_skill (course_id, skill) VALUES (%s, %s)",
+                (course_id, s)
+            )
+
+        conn.commit()
+        cursor.close()
+    skills_cache.invalidate()
+    invalidate_assignment_results()
     return course_id
 
 
 def remove_course_from_professor_and_delete_if_orphan(course_id: int, username: str):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
 
-    try:
-        # get course_code now (before any delete)
-        cursor.execute("SELECT course_code FROM course WHERE course_id = %s", (course_id,))
-        course_row = cursor.fetchone()
-        course_code = course_row["course_code"] if course_row else f"ID {course_id}"
+        try:
+            # get course_code now (before any delete)
+            cursor.execute("SELECT course_code FROM course WHERE course_id = %s", (course_id,))
+            course_row = cursor.fetchone()
+            course_code = course_row["course_code"] if course_row else f"ID {course_id}"
 
-        # get professor_id
-        cursor.execute(
-            "SELECT professor_id FROM user WHERE username = %s AND professor_id IS NOT NULL",
-            (username,)
-        )
-        prof_row = cursor.fetchone()
-        if not prof_row:
-            raise ValueError("Professor not found for given username")
-        professor_id = prof_row["professor_id"]
+            # get professor_id
+            cursor.execute(
+                "SELECT professor_id FROM user WHERE username = %s AND professor_id IS NOT NULL",
+                (username,)
+            )
+            prof_row = cursor.fetchone()
+            if not prof_row:
+                raise ValueError("Professor not found for given username")
+            professor_id = prof_row["professor_id"]
 
-        # ensure link exists
-        cursor.execute(
-            "SELECT 1 FROM course_professor WHERE course_id = %s AND professor_id = %s",
-            (course_id, professor_id)
-        )
-        if not cursor.fetchone():
-            raise ValueError("This course is not linked to this professor")
+            # ensure link exists
+            cursor.execute(
+                "SELECT 1 FROM course_professor WHERE course_id = %s AND professor_id = %s",
+                (course_id, professor_id)
+            )
+            if not cursor.fetchone():
+                raise ValueError("This course is not linked to this professor")
 
-        # unlink
-        cursor.execute(
-            "DELETE FROM course_professor WHERE course_id = %s AND professor_id = %s",
-            (course_id, professor_id)
-        )
+            # unlink
+            cursor.execute(
+                "DELETE FROM course_professor WHERE course_id = %s AND professor_id = %s",
+                (course_id, professor_id)
+            )
 
-        # delete course if orphan
-        cursor.execute("SELECT COUNT(*) AS cnt FROM course_professor WHERE course_id = %s", (course_id,))
-        remaining = cursor.fetchone()["cnt"]
+            # delete course if orphan
+            cursor.execute("SELECT COUNT(*) AS cnt FROM course_professor WHERE course_id = %s", (course_id,))
+            remaining = cursor.fetchone()["cnt"]
+
+            deleted_course = False
+            if remaining == 0:
+                cursor.execute("DELETE FROM course WHERE course_id = %s", (course_id,))
+                deleted_course = True
+
+            conn.commit()
+            invalidate_assignment_results()
+            if deleted_course:
+                skills_cache.invalidate()
+            return {
+                "message": "Removed course successfully",
+                "course_code": course_code,
+                "deleted_course": deleted_course
+            }
+
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
 
-        deleted_course = False
-        if remaining == 0:
-            cursor.execute("DELETE FROM course WHERE course_id = %s", (course_id,))
-            deleted_course = True
+def get_course_details(course_id: int) -> Optional[Dict[str, Any]]:
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
 
-        conn.commit()
-        return {
-            "message": "Removed course successfully",
-            "course_code": course_code,
-            "deleted_course": deleted_course
-        }
-
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        cursor.close()
-        conn.close()
+        # Base course fields (match your Course model fields)
+        cursor.execute("""
+            SELECT course_id, course_code, ps_lab_sections, enrollment_capacity,
+                   actual_enrollment, num_tas_requested, assigned_tas_count
+            FROM course
+            WHERE course_id = %s
+        """, (course_id,))
+        course = cursor.fetchone()
+        if not course:
+            cursor.close()
+            return None
+
+        # Professors, assigned TAs (names), skills
+        hydrate_courses(cursor, [course])
 
-def get_course_details(course_id: int) -> Optional[Dict[str, Any]]:
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Base course fields (match your Course model fields)
-    cursor.execute("""
-        SELECT course_id, course_code, ps_lab_sections, enrollment_capacity,
-               actual_enrollment, num_tas_requested, assigned_tas_count
-        FROM course
-        WHERE course_id = %s
-    """, (course_id,))
-    course = cursor.fetchone()
-    if not course:
         cursor.close()
-        conn.close()
-        return None
-
-    # Professors
-    cursor.execute("""
-        SELECT p.name
-        FROM course_professor cp
-        JOIN professor p ON cp.professor_id = p.professor_id
-        WHERE cp.course_id = %s
-    """, (course_id,))
-    prof_rows = cursor.fetchall()
-    course["professors"] = [r["name"] for r in prof_rows]
-
-    # Assigned TAs (names)
-    cursor.execute("""
-        SELECT ta.name
-        FROM ta_assignment
-        JOIN ta ON ta_assignment.ta_id = ta.ta_id
-        WHERE ta_assignment.course_id = %s
-    """, (course_id,))
-    ta_rows = cursor.fetchall()
-    course["assignedTAs"] = [r["name"] for r in ta_rows]
-
-    # Skills
-    cursor.execute("SELECT skill FROM course_skill WHERE course_id = %s", (course_id,))
-    skill_rows = cursor.fetchall()
-    course["skills"] = [r["skill"] for r in skill_rows]
-
-    cursor.close()
-    conn.close()
     return course
 
 def get_courses_by_ta_username(username: str) -> list[dict]:
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Get ta_id from username
-    cursor.execute("""
-        SELECT ta_id FROM user
-        WHERE username=%s AND ta_id IS NOT NULL
-    """, (username,))
-    row = cursor.fetchone()
-    if not row:
-        cursor.close()
-        conn.close()
-        return []
-
-    ta_id = row["ta_id"]
-
-    # Courses assigned to this TA
-    cursor.execute("""
-        SELECT
-            c.course_id, c.course_code, c.ps_lab_sections, c.enrollment_capacity,
-            c.actual_enrollment, c.num_tas_requested, c.assigned_tas_count,
-            GROUP_CONCAT(DISTINCT p.name SEPARATOR ', ') AS professor_name
-        FROM ta_assignment a
-        JOIN course c ON a.course_id = c.course_id
-        LEFT JOIN course_professor cp ON cp.course_id = c.course_id
-        LEFT JOIN professor p ON p.professor_id = cp.professor_id
-        WHERE a.ta_id = %s
-        GROUP BY c.course_id
-    """, (ta_id,))
-    courses = cursor.fetchall()
-
-    for course in courses:
-        cid = course["course_id"]
-
-        # Skills
-        cursor.execute("SELECT skill FROM course_skill WHERE course_id=%s", (cid,))
-        skill_rows = cursor.fetchall()
-        course["skills"] = [r["skill"] for r in skill_rows]
-
-        # Assigned TAs (names) for that course
-        cursor.execute("""
-            SELECT ta.name
-            FROM ta_assignment
-            JOIN ta ON ta_assignment.ta_id = ta.ta_id
-            WHERE ta_assignment.course_id = %s
-        """, (cid,))
-        assigned_rows = cursor.fetchall()
-        course["assignedTAs"] = [r["name"] for r in assigned_rows]
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
 
-        # Professor name (first professor if multiple)
+        # Get ta_id from username
         cursor.execute("""
-            SELECT p.name
-            FROM course_professor cp
-            JOIN professor p ON cp.professor_id = p.professor_id
-            WHERE cp.course_id = %s
-            LIMIT 1
-        """, (cid,))
-        prow = cursor.fetchone()
-        course["professor_name"] = prow["name"] if prow else None
+            SELECT ta_id FROM user
+            WHERE username=%s AND ta_id IS NOT NULL
+        """, (username,))
+        row = cursor.fetchone()
+        if not row:
+            cursor.close()
+            return []
 
+        ta_id = row["ta_id"]
 
-    cursor.close()
-    conn.close()
+        # Courses assigned to this TA
+        cursor.execute("""
+            SELECT
+                c.course_id, c.course_code, c.ps_lab_sections, c.enrollment_capacity,
+                c.actual_enrollment, c.num_tas_requested, c.assigned_tas_count
+            FROM ta_assignment a
+            JOIN course c ON a.course_id = c.course_id
+            WHERE a.ta_id = %s
+        """, (ta_id,))
+        courses = cursor.fetchall()
+
+        # Skills, assigned TAs (names) and professor name (first professor if multiple)
+        hydrate_courses(cursor, courses)
+
+        cursor.close()
     return courses
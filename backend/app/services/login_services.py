@@ -1,4 +1,4 @@
-from app.core.database import get_db_connection
+from app.core.database import db_connection
 from app.core.security import verify_password, hash_password
 from typing import Optional, Dict
 
@@ -9,7 +9,7 @@ def authenticate_user(username: str, password: str) -> Optional[Dict]:
     - bcrypt-hashed passwords
     Automatically upgrades plaintext passwords to hashed.
     """
-    with get_db_connection() as conn:
+    with db_connection() as conn:
         cursor = conn.cursor(dictionary=True)
 
         cursor.execute(
@@ -0,0 +1,98 @@
+# backend/app/services/pdf_render.py
+# Rendering helpers shared by the PDF checkers.
+#
+# Clipped rendering: pdfium renders a crop as a window onto the full-size page transform
+# (the crop is converted to whole pixels, see _crop_pts), so geometry is unchanged. Pixel
+# values are not guaranteed bit-identical to a full render: glyphs crossing the clip border
+# differ, and anti-aliased edges can be off by a few gray levels anywhere. Callers pad the
+# clip (CLIP_PAD_PX) and never analyze the margin; detections match a full render, scores
+# can move slightly (see benchmarks/bench_roi_render.py).
+
+import math
+import os
+from typing import Iterable, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+
+from app.services import checker_timings
+
+Box = Tuple[int, int, int, int]  # (x, y, w, h) in page pixels, top-left origin
+
+PdfSource = Union[str, bytes]  # file path, or the PDF's bytes (pdfium loads both directly)
+
+CLIP_PAD_PX = 32  # margin rendered around a clip and never analyzed
+
+
+def source_name(pdf: PdfSource, filename: Optional[str] = None) -> str:
+    """File name for reports: `filename` if given, else the path's basename."""
+    if filename:
+        return os.path.basename(filename)
+    return os.path.basename(pdf) if isinstance(pdf, str) else "upload.pdf"
+
+
+def page_size_px(page: pdfium.PdfPage, scale: float) -> Tuple[int, int]:
+    """(W, H) of a full render at `scale` (same rounding pdfium uses)."""
+    return math.ceil(page.get_width() * scale), math.ceil(page.get_height() * scale)
+
+
+def _crop_pts(px: int, scale: float) -> float:
+    # pdfium does ceil(crop * scale); nudge down so float error can't add a pixel
+    return 0.0 if px <= 0 else (px - 1e-6) / scale
+
+
+def render_gray(page: pdfium.PdfPage, scale: float, clip: Optional[Box] = None) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Render the page (or only `clip`) to grayscale. Returns (gray, (x0, y0)) where (x0, y0)
+    is the page-pixel position of gray[0, 0].
+
+    Same conversion steps as the checkers' original full-page path (render -> RGB2BGR ->
+    BGR2GRAY); with clip=None the result is identical to it.
+    """
+    if clip is None:
+        x0, y0, crop = 0, 0, (0, 0, 0, 0)
+    else:
+        W, H = page_size_px(page, scale)
+        x0, y0, w, h = clip
+        crop = (
+            _crop_pts(x0, scale),
+            _crop_pts(H - (y0 + h), scale),
+            _crop_pts(W - (x0 + w), scale),
+            _crop_pts(y0, scale),
+        )
+    with checker_timings.stage("render"):
+        bitmap = page.render(scale=scale, crop=crop)
+        img = bitmap.to_numpy()
+        checker_timings.add_bytes(img.nbytes)  # pdfium's buffer, not traced
+    with checker_timings.stage("grayscale"):
+        if img.shape[2] == 4:
+            img = img[:, :, :3]
+        bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY), (x0, y0)
+
+
+def scale_box(box: Box, k: float, page_w: int, page_h: int) -> Box:
+    """Box at another render scale (k = new / old), grown out to whole pixels, clamped to the new page."""
+    x, y, w, h = box
+    x1 = max(0, math.floor(x * k))
+    y1 = max(0, math.floor(y * k))
+    x2 = min(page_w, math.ceil((x + w) * k))
+    y2 = min(page_h, math.ceil((y + h) * k))
+    return x1, y1, max(1, x2 - x1), max(1, y2 - y1)
+
+
+def union_box(boxes: Iterable[Box], pad: int = 0, page_w: Optional[int] = None, page_h: Optional[int] = None) -> Optional[Box]:
+    """Smallest box containing all boxes, grown by `pad` and clamped to the page (None if no boxes)."""
+    boxes = list(boxes)
+    if not boxes:
+        return None
+    x1 = max(0, min(b[0] for b in boxes) - pad)
+    y1 = max(0, min(b[1] for b in boxes) - pad)
+    x2 = max(b[0] + b[2] for b in boxes) + pad
+    y2 = max(b[1] + b[3] for b in boxes) + pad
+    if page_w is not None:
+        x2 = min(page_w, x2)
+    if page_h is not None:
+        y2 = min(page_h, y2)
+    return x1, y1, x2 - x1, y2 - y1
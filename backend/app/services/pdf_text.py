@@ -0,0 +1,133 @@
+# backend/app/services/pdf_text.py
+# Text-layer helpers shared by the PDF checkers.
+#
+# PageText reads a page's text layer once (rects, their text, pixel boxes) and serves both
+# label matching and the "candidate overlaps typed text" rejection. Overlap queries go
+# through TextGrid, a uniform grid over the pixel boxes, so a candidate is only compared
+# with the rects sharing a cell with it instead of every rect on the page.
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import pypdfium2 as pdfium
+
+from app.services import checker_timings
+from app.services.pdf_render import Box, scale_box
+
+TEXT_GRID_CELL_PX = 128  # grid cell size at the page's render scale
+
+
+def pdf_box_to_pixel_box(box_pdf, page_h_pts, scale):
+    """PDF box (l,b,r,t) points -> pixel box (x,y,w,h) top-left origin."""
+    l, b, r, t = box_pdf
+    x1 = int(round(l * scale))
+    x2 = int(round(r * scale))
+    y1 = int(round((page_h_pts - t) * scale))
+    y2 = int(round((page_h_pts - b) * scale))
+    x = min(x1, x2)
+    y = min(y1, y2)
+    w = max(1, abs(x2 - x1))
+    h = max(1, abs(y2 - y1))
+    return x, y, w, h
+
+
+def overlap_ratio(boxA: Box, boxB: Box) -> float:
+    """Intersection area as a fraction of boxA's area."""
+    ax, ay, aw, ah = boxA
+    bx, by, bw, bh = boxB
+    x1 = max(ax, bx)
+    y1 = max(ay, by)
+    x2 = min(ax + aw, bx + bw)
+    y2 = min(ay + ah, by + bh)
+    if x2 <= x1 or y2 <= y1:
+        return 0.0
+    inter = (x2 - x1) * (y2 - y1)
+    areaA = aw * ah
+    return inter / areaA if areaA > 0 else 0.0
+
+
+class TextGrid:
+    """Pixel boxes bucketed by grid cell, for overlap queries."""
+
+    def __init__(self, boxes: List[Box], cell: int = TEXT_GRID_CELL_PX):
+        self.boxes = boxes
+        self.cell = max(1, int(cell))
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, box in enumerate(boxes):
+            for key in self._keys(box):
+                self._cells.setdefault(key, []).append(i)
+
+    def _keys(self, box: Box):
+        x, y, w, h = box
+        c = self.cell
+        for gy in range(y // c, (y + max(1, h) - 1) // c + 1):
+            for gx in range(x // c, (x + max(1, w) - 1) // c + 1):
+                yield gx, gy
+
+    def overlaps(self, bbox: Box, min_ratio: float) -> bool:
+        """True if some box covers at least min_ratio of bbox (same test as a linear scan)."""
+        if min_ratio <= 0:
+            return bool(self.boxes)  # every ratio is >= 0
+        seen = set()
+        for key in self._keys(bbox):
+            for i in self._cells.get(key, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                if overlap_ratio(bbox, self.boxes[i]) >= min_ratio:
+                    return True
+        return False
+
+    def __bool__(self) -> bool:
+        return bool(self.boxes)
+
+
+class PageText:
+    """
+    A page's text layer, extracted once. rects are in PDF points (l,b,r,t), boxes_px and
+    grid in page pixels at `scale`. texts (get_text_bounded per rect, "" where that fails),
+    boxes_px and grid are built on first use: pages that only need overlap tests never read
+    the text, pages without a label never build the grid.
+    """
+
+    def __init__(self, page: pdfium.PdfPage, scale: float):
+        self.page = page
+        self.scale = scale
+        with checker_timings.stage("textpage"):
+            self._textpage = page.get_textpage()
+            self.rects = [self._textpage.get_rect(i) for i in range(self._textpage.count_rects())]
+        self._texts: Optional[List[str]] = None
+        self._boxes_px: Optional[List[Box]] = None
+        self._grid: Optional[TextGrid] = None
+
+    @property
+    def boxes_px(self) -> List[Box]:
+        if self._boxes_px is None:
+            page_h_pts = float(self.page.get_height())
+            self._boxes_px = [pdf_box_to_pixel_box(r, page_h_pts, self.scale) for r in self.rects]
+        return self._boxes_px
+
+    @property
+    def grid(self) -> TextGrid:
+        if self._grid is None:
+            self._grid = TextGrid(self.boxes_px)
+        return self._grid
+
+    @property
+    def texts(self) -> List[str]:
+        if self._texts is None:
+            texts = []
+            with checker_timings.stage("textpage"):
+                for rect in self.rects:
+                    try:
+                        txt = self._textpage.get_text_bounded(*rect)
+                    except Exception:
+                        txt = ""
+                    texts.append((txt or "").strip())
+            self._texts = texts
+        return self._texts
+
+    def scaled_grid(self, k: float, page_w: int, page_h: int) -> TextGrid:
+        """Grid of the boxes at another render scale (k = new / old), e.g. for a coarse render."""
+        return TextGrid([scale_box(b, k, page_w, page_h) for b in self.boxes_px],
+                        cell=math.ceil(TEXT_GRID_CELL_PX * k))
@@ -1,101 +1,123 @@
-from app.core.database import get_db_connection
+from app.core.cache import TTLCache, register_cache
+from app.core.database import db_connection, fetch_related
+from app.services.assignment_cache import invalidate_assignment_results
 from typing import Optional, List
 
+# username -> professor display name; invalidated when professors are created or renamed
+professor_name_cache: TTLCache[str, str] = register_cache("professor_names", max_entries=2048)
+
 def get_all_professors():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    query = """
-        SELECT 
-            professor_id,
-            name
-        FROM professor
-        ORDER BY name ASC;
-    """
-    cursor.execute(query)
-    professors = cursor.fetchall()
-
-    # Get preferred TAs for each professor
-    pref_query = """
-        SELECT 
-            t.ta_id,
-            t.name,
-            t.program,
-            t.level,
-            t.max_hours
-        FROM professor_preferred_ta ppt
-        JOIN ta t 
-            ON ppt.ta_id = t.ta_id
-        WHERE ppt.professor_id = %s;
-    """
-
-    for prof in professors:
-        cursor.execute(pref_query, (prof["professor_id"],))
-        preferred_tas = cursor.fetchall()
-        prof["preferred_tas"] = preferred_tas
-
-    cursor.close()
-    conn.close()
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        query = """
+            SELECT 
+                professor_id,
+                name
+            FROM professor
+            ORDER BY name ASC;
+        """
+        cursor.execute(query)
+        professors = cursor.fetchall()
+
+        # Get preferred TAs for all professors in one query, grouped by professor_id
+        pref_map = fetch_related(cursor, """
+            SELECT 
+                ppt.professor_id,
+                t.ta_id,
+                t.name,
+                t.program,
+                t.level,
+                t.max_hours
+            FROM professor_preferred_ta ppt
+            JOIN ta t 
+                ON ppt.ta_id = t.ta_id
+            WHERE ppt.professor_id IN ({ids});
+        """, [prof["professor_id"] for prof in professors], key="professor_id")
+
+        for prof in professors:
+            prof["preferred_tas"] = pref_map.get(prof["professor_id"], [])
+
+        cursor.close()
 
     return professors
 
 def get_professor_by_id(professor_id: int):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute(
-        "SELECT professor_id, name FROM professor WHERE professor_id = %s",
-        (professor_id,),
-    )
-    prof = cursor.fetchone()
-    if not prof:
-        cursor.close()
-        conn.close()
-        return None
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
 
-    # preferred TAs
-    cursor.execute(
-        """
-        SELECT t.ta_id, t.name
-        FROM professor_preferred_ta ppt
-        JOIN ta t ON ppt.ta_id = t.ta_id
-        WHERE ppt.professor_id = %s
-        """,
-        (professor_id,),
-    )
-    rows = cursor.fetchall()
-    prof["preferred_tas"] = [{"ta_id": r["ta_id"], "name": r["name"]} for r in rows]
-
-    cursor.close()
-    conn.close()
+        cursor.execute(
+            "SELECT professor_id, name FROM professor WHERE professor_id = %s",
+            (professor_id,),
+        )
+        prof = cursor.fetchone()
+        if not prof:
+            cursor.close()
+            return None
+
+        # preferred TAs
+        cursor.execute(
+            """
+            SELECT t.ta_id, t.name
+            FROM professor_preferred_ta ppt
+            JOIN ta t ON ppt.ta_id = t.ta_id
+            WHERE ppt.professor_id = %s
+            """,
+            (professor_id,),
+        )
+        rows = cursor.fetchall()
+        prof["preferred_tas"] = [{"ta_id": r["ta_id"], "name": r["name"]} for r in rows]
+
+        cursor.close()
     return prof
 
 
 def update_professor(professor_id: int, name: Optional[str], preferred_ta_ids: List[int]):
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with db_connection() as conn:
+        cursor = conn.cursor()
 
-    try:
-        if name is not None:
-            cursor.execute(
-                "UPDATE professor SET name = %s WHERE professor_id = %s",
-                (name, professor_id),
-            )
+        try:
+            if name is not None:
+                cursor.execute(
+                    "UPDATE professor SET name = %s WHERE professor_id = %s",
+                    (name, professor_id),
+                )
 
-        cursor.execute(
-            "DELETE FROM professor_preferred_ta WHERE professor_id = %s",
-            (professor_id,),
-        )
-        for ta_id in preferred_ta_ids:
             cursor.execute(
-                "INSERT INTO professor_preferred_ta (professor_id, ta_id) VALUES (%s, %s)",
-                (professor_id, ta_id),
+                "DELETE FROM professor_preferred_ta WHERE professor_id = %s",
+                (professor_id,),
             )
+            for ta_id in preferred_ta_ids:
+                cursor.execute(
+                    "INSERT INTO professor_preferred_ta (professor_id, ta_id) VALUES (%s, %s)",
+                    (professor_id, ta_id),
+                )
 
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        cursor.close()
-        conn.close()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    if name is not None:
+        professor_name_cache.invalidate()
+    invalidate_assignment_results()
+
+
+def get_professor_display_name(username: str) -> str:
+    """Professor name for a username (falls back to the username itself)."""
+    def load() -> str:
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT p.name AS name
+                FROM user u
+                JOIN professor p ON u.professor_id = p.professor_id
+                WHERE u.username = %s
+            """, (username,))
+            row = cursor.fetchone()
+            cursor.close()
+        return row["name"] if row and row.get("name") else username
+
+    return professor_name_cache.get_or_load(username, load)
@@ -1,19 +1,28 @@
-from app.core.database import get_db_connection
+from typing import List
+
+from app.core.cache import TTLCache, register_cache
+from app.core.database import db_connection
+
+# Invalidated by every writer of course_skill / ta_skill
+skills_cache: TTLCache[str, List[str]] = register_cache("skills")
 
-def get_all_skills():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
 
-    cursor.execute("""
-        SELECT DISTINCT skill FROM (
-            SELECT skill FROM course_skill
-            UNION
-            SELECT skill FROM ta_skill
-        ) s
-        ORDER BY skill ASC
-    """)
-    rows = cursor.fetchall()
+def _load_all_skills() -> List[str]:
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
 
-    cursor.close()
-    conn.close()
+        cursor.execute("""
+            SELECT DISTINCT skill FROM (
+                SELECT skill FROM course_skill
+                UNION
+                SELECT skill FROM ta_skill
+            ) s
+            ORDER BY skill ASC
+        """)
+        rows = cursor.fetchall()
+
+        cursor.close()
     return [r["skill"] for r in rows]
+
+def get_all_skills():
+    return list(skills_cache.get_or_load("all", _load_all_skills))
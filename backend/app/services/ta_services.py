@@ -1,138 +1,122 @@
-from app.core.database import get_db_connection
+from app.core.database import db_connection, fetch_related
+from app.services.assignment_cache import invalidate_assignment_results
+from app.services.skills_services import skills_cache
 
 def get_all_tas():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Step 1: Get all TAs
-    query = """
-        SELECT 
-            ta_id,
-            name,
-            program,
-            level,
-            max_hours
-        FROM ta
-        ORDER BY name ASC;
-    """
-    cursor.execute(query)
-    tas = cursor.fetchall()
-
-    if not tas:
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        # Step 1: Get all TAs
+        query = """
+            SELECT 
+                ta_id,
+                name,
+                program,
+                level,
+                max_hours
+            FROM ta
+            ORDER BY name ASC;
+        """
+        cursor.execute(query)
+        tas = cursor.fetchall()
+
+        if not tas:
+            cursor.close()
+            return []
+
+        ta_ids = [ta["ta_id"] for ta in tas]
+
+        # Step 2: Get preferred professors for all TAs (rows: professor_id, name)
+        pref_map = fetch_related(cursor, """
+            SELECT 
+                tpp.ta_id,
+                p.professor_id,
+                p.name
+            FROM ta_preferred_professor tpp
+            JOIN professor p ON tpp.professor_id = p.professor_id
+            WHERE tpp.ta_id IN ({ids});
+        """, ta_ids, key="ta_id")
+
+        # Step 3: Get all skills for all TAs
+        skills_map = {
+            tid: [row["skill"] for row in rows]
+            for tid, rows in fetch_related(cursor, """
+                SELECT ta_id, skill
+                FROM ta_skill
+                WHERE ta_id IN ({ids});
+            """, ta_ids, key="ta_id").items()
+        }
+
+        # Combine all data
+        for ta in tas:
+            ta["preferred_professors"] = pref_map.get(ta["ta_id"], [])
+            ta["skills"] = skills_map.get(ta["ta_id"], [])
+
         cursor.close()
-        conn.close()
-        return []
-
-    ta_ids = [ta["ta_id"] for ta in tas]
-
-    # Step 2: Get preferred professors for all TAs
-    pref_query = f"""
-        SELECT 
-            tpp.ta_id,
-            p.professor_id,
-            p.name
-        FROM ta_preferred_professor tpp
-        JOIN professor p ON tpp.professor_id = p.professor_id
-        WHERE tpp.ta_id IN ({','.join(['%s']*len(ta_ids))});
-    """
-    cursor.execute(pref_query, ta_ids)
-    pref_rows = cursor.fetchall()
-
-    # Map preferred professors by TA ID
-    pref_map = {}
-    for row in pref_rows:
-        pref_map.setdefault(row["ta_id"], []).append({
-            "professor_id": row["professor_id"],
-            "name": row["name"]
-        })
-
-    # Step 3: Get all skills for all TAs
-    skills_query = f"""
-        SELECT ta_id, skill
-        FROM ta_skill
-        WHERE ta_id IN ({','.join(['%s']*len(ta_ids))});
-    """
-    cursor.execute(skills_query, ta_ids)
-    skill_rows = cursor.fetchall()
-
-    # Map skills by TA ID
-    skills_map = {}
-    for row in skill_rows:
-        skills_map.setdefault(row["ta_id"], []).append(row["skill"])
-
-    # Combine all data
-    for ta in tas:
-        ta["preferred_professors"] = pref_map.get(ta["ta_id"], [])
-        ta["skills"] = skills_map.get(ta["ta_id"], [])
-
-    cursor.close()
-    conn.close()
 
     return tas
 
 def get_ta_by_id(ta_id: int):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    # Step 1: Get the TA basic info
-    query = """
-        SELECT 
-            ta_id,
-            name,
-            program,
-            level,
-            max_hours
-        FROM ta
-        WHERE ta_id = %s;
-    """
-    cursor.execute(query, (ta_id,))
-    ta = cursor.fetchone()
-
-    if not ta:
+    with db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        # Step 1: Get the TA basic info
+        query = """
+            SELECT 
+                ta_id,
+                name,
+                program,
+                level,
+                max_hours
+            FROM ta
+            WHERE ta_id = %s;
+        """
+        cursor.execute(query, (ta_id,))
+        ta = cursor.fetchone()
+
+        if not ta:
+            cursor.close()
+            return None
+
+        # Step 2: Get preferred professors
+        pref_query = """
+            SELECT 
+                p.professor_id,
+                p.name
+            FROM ta_preferred_professor tpp
+            JOIN professor p ON tpp.professor_id = p.professor_id
+            WHERE tpp.ta_id = %s;
+        """
+        cursor.execute(pref_query, (ta_id,))
+        pref_rows = cursor.fetchall()
+        ta["preferred_professors"] = [{"professor_id": row["professor_id"], "name": row["name"]} for row in pref_rows]
+
+        # Step 3: Get TA skills
+        skills_query = """
+            SELECT skill
+            FROM ta_skill
+            WHERE ta_id = %s;
+        """
+        cursor.execute(skills_query, (ta_id,))
+        skill_rows = cursor.fetchall()
+        ta["skills"] = [row["skill"] for row in skill_rows]
+
+        # Step 4: Get course interests
+        courses_query = """
+            SELECT course_code, interest_level
+            FROM ta_preferred_course
+            JOIN course ON ta_preferred_course.course_id = course.course_id
+            WHERE ta_id = %s;
+        """
+        cursor.execute(courses_query, (ta_id,))
+        course_rows = cursor.fetchall()
+        # Convert to { course_code: interest } format
+        ta["course_interests"] = {row["course_code"]: row["interest_level"] for row in course_rows}
+
         cursor.close()
-        conn.close()
-        return None
-
-    # Step 2: Get preferred professors
-    pref_query = """
-        SELECT 
-            p.professor_id,
-            p.name
-        FROM ta_preferred_professor tpp
-        JOIN professor p ON tpp.professor_id = p.professor_id
-        WHERE tpp.ta_id = %s;
-    """
-    cursor.execute(pref_query, (ta_id,))
-    pref_rows = cursor.fetchall()
-    ta["preferred_professors"] = [{"professor_id": row["professor_id"], "name": row["name"]} for row in pref_rows]
-
-    # Step 3: Get TA skills
-    skills_query = """
-        SELECT skill
-        FROM ta_skill
-        WHERE ta_id = %s;
-    """
-    cursor.execute(skills_query, (ta_id,))
-    skill_rows = cursor.fetchall()
-    ta["skills"] = [row["skill"] for row in skill_rows]
-
-    # Step 4: Get course interests
-    courses_query = """
-        SELECT course_code, interest_level
-        FROM ta_preferred_course
-        JOIN course ON ta_preferred_course.course_id = course.course_id
-        WHERE ta_id = %s;
-    """
-    cursor.execute(courses_query, (ta_id,))
-    course_rows = cursor.fetchall()
-    # Convert to { course_code: interest } format
-    ta["course_interests"] = {row["course_code"]: row["interest_level"] for row in course_rows}
-
-    cursor.close()
-    conn.close()
     return ta
 
-from app.core.database import get_db_connection
+from app.core.database import db_connection
 
 from typing import Optional, List, Dict
 
@@ -144,55 +128,57 @@ def update_ta(
     course_interests: Dict[str, Optional[str]],
     preferred_professor_ids: List[int],
 ):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        if name is not None:
-            cursor.execute("UPDATE ta SET name = %s WHERE ta_id = %s", (name, ta_id))
-        if max_hours is not None:
-            cursor.execute("UPDATE ta SET max_hours = %s WHERE ta_id = %s", (max_hours, ta_id))
-
-        cursor.execute("DELETE FROM ta_skill WHERE ta_id = %s", (ta_id,))
-        for skill in skills:
-            cursor.execute(
-                "INSERT INTO ta_skill (ta_id, skill) VALUES (%s, %s)",
-                (ta_id, skill),
-            )
-
-        cursor.execute("DELETE FROM ta_preferred_professor WHERE ta_id = %s", (ta_id,))
-        for pid in preferred_professor_ids:
-            cursor.execute(
-                "INSERT INTO ta_preferred_professor (ta_id, professor_id) VALUES (%s, %s)",
-                (ta_id, pid),
-            )
-
-        for course_code, interest in course_interests.items():
-            cursor.execute("SELECT course_id FROM course WHERE course_code = %s", (course_code,))
-            row = cursor.fetchone()
-            if not row:
-                continue
-            course_id = row[0]
-
-            if interest is None:
+    with db_connection() as conn:
+        cursor = conn.cursor()
+
+        try:
+            if name is not None:
+                cursor.execute("UPDATE ta SET name = %s WHERE ta_id = %s", (name, ta_id))
+            if max_hours is not None:
+                cursor.execute("UPDATE ta SET max_hours = %s WHERE ta_id = %s", (max_hours, ta_id))
+
+            cursor.execute("DELETE FROM ta_skill WHERE ta_id = %s", (ta_id,))
+            for skill in skills:
                 cursor.execute(
-                    "DELETE FROM ta_preferred_course WHERE ta_id = %s AND course_id = %s",
-                    (ta_id, course_id),
+                    "INSERT INTO ta_skill (ta_id, skill) VALUES (%s, %s)",
+                    (ta_id, skill),
                 )
-            else:
+
+            cursor.execute("DELETE FROM ta_preferred_professor WHERE ta_id = %s", (ta_id,))
+            for pid in preferred_professor_ids:
                 cursor.execute(
-                    """
-                    INSERT INTO ta_preferred_course (course_id, ta_id, interest_level)
-                    VALUES (%s, %s, %s)
-                    ON DUPLICATE KEY UPDATE interest_level = VALUES(interest_level)
-                    """,
-                    (course_id, ta_id, interest),
+                    "INSERT INTO ta_preferred_professor (ta_id, professor_id) VALUES (%s, %s)",
+                    (ta_id, pid),
                 )
 
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        cursor.close()
-        conn.close()
+            for course_code, interest in course_interests.items():
+                cursor.execute("SELECT course_id FROM course WHERE course_code = %s", (course_code,))
+                row = cursor.fetchone()
+                if not row:
+                    continue
+                course_id = row[0]
+
+                if interest is None:
+                    cursor.execute(
+                        "DELETE FROM ta_preferred_course WHERE ta_id = %s AND course_id = %s",
+                        (ta_id, course_id),
+                    )
+                else:
+                    cursor.execute(
+                        """
+                        INSERT INTO ta_preferred_course (course_id, ta_id, interest_level)
+                        VALUES (%s, %s, %s)
+                        ON DUPLICATE KEY UPDATE interest_level = VALUES(interest_level)
+                        """,
+                        (course_id, ta_id, interest),
+                    )
+
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cursor.close()
+
+    skills_cache.invalidate()
+    invalidate_assignment_results()
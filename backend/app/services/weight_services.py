@@ -1,8 +1,13 @@
-from app.core.database import get_db_connection
+from app.core.cache import TTLCache, register_cache
+from app.core.database import db_connection
 from app.models import Weights
+from app.services.assignment_cache import invalidate_assignment_results
 
-def get_weights() -> Weights:
-    with get_db_connection() as conn:
+weights_cache: TTLCache[str, Weights] = register_cache("weights")
+
+
+def _load_weights() -> Weights:
+    with db_connection() as conn:
         cursor = conn.cursor(dictionary=True)  # dictionary=True to get column names
         result = cursor.execute("SELECT * FROM weights LIMIT 1")
         result = cursor.fetchone()
@@ -13,8 +18,12 @@ def get_weights() -> Weights:
             workload_balance=result['workload_balance']
         )
 
+def get_weights() -> Weights:
+    # copy so callers can't mutate the cached instance
+    return weights_cache.get_or_load("current", _load_weights).model_copy()
+
 def update_weights(weights: Weights):
-    with get_db_connection() as conn:
+    with db_connection() as conn:
         cursor = conn.cursor(dictionary=True)
         cursor.execute(
             """
@@ -27,3 +36,5 @@ def update_weights(weights: Weights):
         )
         conn.commit()
         cursor.close()
+    weights_cache.invalidate()
+    invalidate_assignment_results()
@@ -0,0 +1,63 @@
+# backend/benchmarks/bench_assignment_modes.py
+#
+# Greedy vs optimal assignment, end to end through run_assignment_algorithm (no database needed).
+# Run from backend/:
+#   python -m benchmarks.bench_assignment_modes --tas 1000 --courses 300
+#   python -m benchmarks.bench_assignment_modes --save /tmp/term.pkl     # keep the synthetic snapshot
+#   python -m benchmarks.bench_assignment_modes --problem /tmp/term.pkl  # replay a pickled snapshot
+
+import argparse
+import time
+
+from app.services.assignment_problem import AssignmentProblem, dump_problem, load_problem
+from app.services.assignmentAlgorithm import run_assignment_algorithm
+from benchmarks.bench_base_score_matrix import make_inputs
+
+
+def make_problem(n_tas: int, n_courses: int, n_profs: int, seed: int) -> AssignmentProblem:
+    tas, courses, ta_pref_map, prof_pref_map, ta_skills_map, interest_map, weights = make_inputs(
+        n_tas, n_courses, n_profs, seed
+    )
+    return AssignmentProblem(
+        tas=[{**t, "preferred_professors": ta_pref_map[t["name"]]} for t in tas],
+        prof_pref_map=prof_pref_map,
+        courses=courses,
+        ta_skills_map=ta_skills_map,
+        ta_course_interest_map=interest_map,
+        weights=weights,
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tas", type=int, default=1000)
+    ap.add_argument("--courses", type=int, default=300)
+    ap.add_argument("--profs", type=int, default=150)
+    ap.add_argument("--max-same-prof", type=int, default=2)
+    ap.add_argument("--seed", type=int, default=5)
+    ap.add_argument("--problem", help="pickled AssignmentProblem to replay instead of synthetic data")
+    ap.add_argument("--save", help="write the (synthetic) problem to this pickle path")
+    args = ap.parse_args()
+
+    problem = load_problem(args.problem) if args.problem else make_problem(
+        args.tas, args.courses, args.profs, args.seed
+    )
+    if args.save:
+        dump_problem(problem, args.save)
+
+    print(f"TAs={len(problem.tas)} courses={len(problem.courses)}")
+    for mode in ("greedy", "optimal"):
+        t0 = time.perf_counter()
+        result = run_assignment_algorithm(max_same_prof=args.max_same_prof, mode=mode, problem=problem)
+        total_ms = (time.perf_counter() - t0) * 1000.0
+        stats = result["stats"]
+        print(
+            f"{mode:<8} objective={stats['objective']:.4f} "
+            f"filled={stats['filled_slots']}/{stats['total_slots']} "
+            f"cap_violations={stats['cap_violations']} "
+            f"solve={stats['solve_time_ms']:.1f} ms total={total_ms:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_base_score_matrix.py
+#
+# Parity + timing for build_base_score_matrix vs the scalar compute_base_pair_score.
+# Run from backend/:
+#   python -m benchmarks.bench_base_score_matrix --tas 500 --courses 300
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.models import Weights
+from app.services.assignmentAlgorithm import build_base_score_matrix, compute_base_pair_score
+
+
+SKILLS = ["python", "java", "c", "ml", "db", "os", "networks", "theory", "web", "security"]
+LEVELS = ["High", "Medium", "Low", None]
+
+
+def make_inputs(n_tas: int, n_courses: int, n_profs: int, seed: int):
+    rng = random.Random(seed)
+    prof_names = [f"Prof {k}" for k in range(n_profs)]
+    # a few duplicate TA names on purpose: the scalar path keys preferences by name
+    ta_names = [f"TA {i % max(1, n_tas - 5)}" for i in range(n_tas)]
+
+    tas = [{"ta_id": i + 1, "name": ta_names[i]} for i in range(n_tas)]
+    courses = []
+    for j in range(n_courses):
+        courses.append({
+            "course_id": 1000 + j,
+            "course_code": f"COMP{1000 + j}",
+            "num_tas_requested": rng.randint(1, 3),
+            "professors": [{"professor_id": k, "name": prof_names[k]}
+                           for k in rng.sample(range(n_profs), rng.choice([0, 1, 1, 1, 2, 3]))],
+            "skills": rng.sample(SKILLS, rng.randint(0, 3)),
+        })
+
+    ta_pref_map = {t["name"]: rng.sample(prof_names, rng.randint(0, 5)) for t in tas}
+    prof_pref_map = {p: rng.sample(ta_names, rng.randint(0, 6)) for p in prof_names if rng.random() < 0.9}
+    ta_skills_map = {t["ta_id"]: rng.sample(SKILLS, rng.randint(0, 5)) for t in tas}
+    interest_map = {}
+    for t in tas:
+        for c in rng.sample(courses, min(len(courses), 8)):
+            interest_map[(t["ta_id"], c["course_id"])] = rng.choice(LEVELS)
+
+    weights = Weights(ta_pref=0.3, prof_pref=0.25, course_pref=0.35, workload_balance=0.1)
+    return tas, courses, ta_pref_map, prof_pref_map, ta_skills_map, interest_map, weights
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tas", type=int, default=500)
+    ap.add_argument("--courses", type=int, default=300)
+    ap.add_argument("--profs", type=int, default=120)
+    ap.add_argument("--seed", type=int, default=11)
+    args = ap.parse_args()
+
+    tas, courses, ta_pref_map, prof_pref_map, ta_skills_map, interest_map, weights = make_inputs(
+        args.tas, args.courses, args.profs, args.seed
+    )
+
+    t0 = time.perf_counter()
+    scalar = np.array([
+        [compute_base_pair_score(t, c, ta_pref_map, prof_pref_map, ta_skills_map, interest_map, weights)
+         for c in courses]
+        for t in tas
+    ])
+    scalar_t = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    matrix = build_base_score_matrix(tas, courses, ta_pref_map, prof_pref_map, ta_skills_map, interest_map, weights)
+    matrix_t = time.perf_counter() - t0
+
+    assert matrix.shape == scalar.shape
+    assert np.array_equal(matrix, scalar), f"max abs diff {np.abs(matrix - scalar).max()}"
+
+    print(f"TAs={args.tas} courses={args.courses} (bit-identical to scalar)")
+    print(f"scalar: {scalar_t * 1000:.1f} ms")
+    print(f"matrix: {matrix_t * 1000:.1f} ms")
+    print(f"speedup: {scalar_t / matrix_t:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# backend/benchmarks/bench_bulk_writes.py
+#
+# Run-save pipeline: row-by-row INSERTs over separate connections (the old
+# updateDB + save_assignment_run_from_db + save_run_items_from_active sequence with
+# chunk size 1) vs save_algorithm_run (one transaction, batched executemany).
+# Uses an in-memory fake connection that charges a fixed round-trip latency per
+# statement, so no database is needed; results scale with --rtt-ms.
+# Run from backend/:
+#   python -m benchmarks.bench_bulk_writes --pairs 1500 --rtt-ms 0.5
+
+import argparse
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+from app.core.config import settings
+from app.services import assignment_history_services as history
+from app.services import assignmentAlgorithm as algo
+
+
+class FakeStore:
+    def __init__(self, n_tas: int, n_courses: int, rtt_s: float):
+        self.rtt_s = rtt_s
+        self.tas = [{"ta_id": i, "name": f"TA {i:04d}"} for i in range(1, n_tas + 1)]
+        self.courses = [{"course_id": i, "course_code": f"COMP{i:04d}"} for i in range(1, n_courses + 1)]
+        self.ta_assignment: List[tuple] = []
+        self.round_trips = 0
+        self.connections = 0
+        self.commits = 0
+        self._next_run = 1
+
+    def rows_for(self, sql: str) -> List[Dict[str, Any]]:
+        course_code = {c["course_id"]: c["course_code"] for c in self.courses}
+        ta_name = {t["ta_id"]: t["name"] for t in self.tas}
+        if re.search(r"GROUP_CONCAT", sql):
+            cids = sorted({cid for _, cid in self.ta_assignment}, key=lambda c: course_code[c])
+            return [{"course_id": c, "course_code": course_code[c], "professor_id": 1,
+                     "professor_name": "Prof 1"} for c in cids]
+        if re.search(r"SELECT DISTINCT", sql):
+            return [{"course_code": course_code[c], "ta_id": t, "ta_name": ta_name[t]}
+                    for t, c in self.ta_assignment]
+        if re.search(r"FROM ta_assignment", sql):
+            return [{"ta_id": t, "course_id": c} for t, c in self.ta_assignment]
+        if re.search(r"FROM ta\b", sql):
+            return [dict(t) for t in self.tas]
+        if re.search(r"FROM course\b", sql):
+            return [dict(c) for c in self.courses]
+        return []
+
+    @contextmanager
+    def connection(self):
+        store = self
+        store.connections += 1
+
+        class Cursor:
+            lastrowid = 0
+
+            def __init__(self):
+                self._rows: List[Dict[str, Any]] = []
+
+            def _trip(self):
+                store.round_trips += 1
+                time.sleep(store.rtt_s)
+
+            def execute(self, sql, params=()):
+                self._trip()
+                if sql.lstrip().upper().startswith(("DELETE FROM TA_ASSIGNMENT", "TRUNCATE")):
+                    store.ta_assignment = []
+                elif "INSERT INTO assignment_run (" in sql:
+                    self.lastrowid = store._next_run
+                    store._next_run += 1
+                elif "INSERT INTO ta_assignment" in sql:
+                    store.ta_assignment.append(tuple(params))
+                self._rows = store.rows_for(sql) if sql.lstrip().upper().startswith("SELECT") else []
+
+            def executemany(self, sql, seq):
+                self._trip()
+                if "INSERT INTO ta_assignment" in sql:
+                    store.ta_assignment.extend(tuple(p) for p in seq)
+
+            def fetchall(self):
+                rows, self._rows = self._rows, []
+                return rows
+
+            def fetchone(self):
+                return self._rows.pop(0) if self._rows else None
+
+            def close(self):
+                pass
+
+        class Conn:
+            def cursor(self, dictionary=False):
+                return Cursor()
+
+            def commit(self):
+                store.commits += 1
+
+            def rollback(self):
+                pass
+
+        yield Conn()
+
+
+def make_assignments(n_pairs: int, per_course: int = 3) -> Dict[str, Any]:
+    n_courses = (n_pairs + per_course - 1) // per_course
+    out: Dict[str, Any] = {}
+    k = 0
+    for c in range(1, n_courses + 1):
+        tas = []
+        for _ in range(per_course):
+            if k >= n_pairs:
+                break
+            tas.append(f"TA {k % (n_pairs // per_course or 1) + 1:04d}")
+            k += 1
+        out[f"COMP{c:04d}"] = {"professor": "Prof 1", "tas": tas}
+    return out
+
+
+def run(label: str, fn, store: FakeStore) -> None:
+    original = (algo.db_connection, history.db_connection)
+    algo.db_connection = history.db_connection = store.connection
+    try:
+        t0 = time.perf_counter()
+        fn()
+        ms = (time.perf_counter() - t0) * 1000.0
+    finally:
+        algo.db_connection, history.db_connection = original
+    print(f"{label:<28} pairs={len(store.ta_assignment)} round_trips={store.round_trips:<5} "
+          f"connections={store.connections} commits={store.commits} time={ms:.1f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", type=int, default=1500)
+    ap.add_argument("--rtt-ms", type=float, default=0.5)
+    ap.add_argument("--chunk-size", type=int, default=settings.DB_BULK_CHUNK_SIZE)
+    args = ap.parse_args()
+
+    assignments = make_assignments(args.pairs)
+    n_tas, n_courses = args.pairs, len(assignments)
+    rtt_s = args.rtt_ms / 1000.0
+
+    def before():
+        algo.updateDB(assignments)
+        run_id = history.save_assignment_run_from_db(created_by="bench", notes="bench")
+        history.save_run_items_from_active(run_id)
+
+    def after():
+        history.save_algorithm_run(assignments, created_by="bench", notes="bench")
+
+    chunk = settings.DB_BULK_CHUNK_SIZE
+    try:
+        settings.DB_BULK_CHUNK_SIZE = 1  # one INSERT per row, as before batching
+        run("row-by-row, 3 connections", before, FakeStore(n_tas, n_courses, rtt_s))
+        settings.DB_BULK_CHUNK_SIZE = args.chunk_size
+        run(f"batched x{args.chunk_size}, 1 txn", after, FakeStore(n_tas, n_courses, rtt_s))
+    finally:
+        settings.DB_BULK_CHUNK_SIZE = chunk
+
+
+if __name__ == "__main__":
+    main()
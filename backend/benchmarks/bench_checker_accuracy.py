@@ -0,0 +1,265 @@
+# backend/benchmarks/bench_checker_accuracy.py
+#
+# Accuracy + latency baseline for both PDF checkers, so tuning DPI, min_bbox_area,
+# text_overlap_reject etc. shows its effect on both at once. Generates a seeded synthetic
+# set (signed / unsigned / unlabeled strokes / blank, with and without tables, clean and
+# scanned-noise variants), runs each checker over it in-process (workers=1) and reports:
+#   - precision / recall / errors per checker, against the expected overall status
+#   - self time per phase: text (text layer + label matching), render (pdfium + gray),
+#     binarize (threshold, table-line removal, opening), components (labeling + top-k)
+#   - pages/s and peak RSS
+# --out writes the numbers as JSON; --baseline compares against such a file and exits
+# non-zero if precision/recall dropped or a latency/RSS figure grew by more than --tolerance.
+# --set overrides a constant for the run: DPI=180 (checker_engine) or comp590.min_bbox_area=900
+# (a profile field). Run from backend/:
+#   python -m benchmarks.bench_checker_accuracy --docs 40 --out /tmp/checker_baseline.json
+#   python -m benchmarks.bench_checker_accuracy --docs 40 --baseline /tmp/checker_baseline.json
+
+import argparse
+import dataclasses
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.services import checker_engine
+from app.services.checker_cache import params_version
+from benchmarks.bench_roi_render import CHECKERS
+from benchmarks.pdf_fixtures import make_pdf
+
+PHASES = ("text", "render", "binarize", "components")
+
+# engine function -> phase; nested calls count toward the innermost phase only
+WRAPPED = {
+    "PageText": "text",
+    "find_label_boxes_pdf_coords": "text",
+    "render_gray": "render",
+    "_fine_mask": "binarize",
+    "_coarse_mask": "binarize",
+    "_stats": "components",
+    "_component_candidates": "components",
+}
+
+SCENARIOS = ("signed", "unsigned", "mid_signed", "unlabeled_signed", "blank")
+LABELS = ("Supervisor Signature:", "Student Signature:", "Signature of Supervisor:", "Signature:")
+
+# expected overall FOUND per checker: comp590 falls back to a stroke scan of every page when
+# its first/last pages carry no label; comp291-391 only looks next to labels, on every page
+EXPECTED = {
+    "comp590": {"signed": True, "unsigned": False, "mid_signed": True, "unlabeled_signed": True, "blank": False},
+    "comp291-391": {"signed": True, "unsigned": False, "mid_signed": True, "unlabeled_signed": False, "blank": False},
+}
+
+
+# ---- inputs ----
+def synthetic_docs(out_dir: str, n_docs: int, seed: int) -> List[Dict[str, Any]]:
+    """[{path, pages, scenario, noise, table}, ...], scenarios round-robin."""
+    rng = random.Random(seed)
+    docs = []
+    for i in range(n_docs):
+        scenario = SCENARIOS[i % len(SCENARIOS)]
+        n = rng.randint(1, 8)
+        last = n - 1
+        kw: Dict[str, Any] = dict(
+            n_pages=n,
+            table=rng.random() < 0.7,
+            noise=rng.choice([0.0, 0.0, 0.01, 0.03]),
+            label_text=rng.choice(LABELS),
+            seed=seed + i,
+        )
+        if scenario == "signed":
+            kw.update(label_pages=sorted({0, last}), signed_pages=[last])
+        elif scenario == "unsigned":
+            kw.update(label_pages=sorted({0, last}))
+        elif scenario == "mid_signed":
+            mid = n // 2
+            kw.update(label_pages=[mid], signed_pages=[mid])
+        elif scenario == "unlabeled_signed":
+            kw.update(unlabeled_signed_pages=[rng.randrange(n)])
+        path = make_pdf(os.path.join(out_dir, f"{scenario}_{i}.pdf"), **kw)
+        docs.append(dict(path=path, pages=n, scenario=scenario, noise=kw["noise"], table=kw["table"]))
+    return docs
+
+
+def apply_overrides(overrides: List[str]) -> None:
+    for item in overrides:
+        name, _, raw = item.partition("=")
+        value = json.loads(raw)
+        if "." in name:
+            profile_name, field = name.rsplit(".", 1)
+            profile = checker_engine.get_profile(profile_name)
+            checker_engine.PROFILES[profile_name] = dataclasses.replace(profile, **{field: value})
+        elif hasattr(checker_engine, name) and name.isupper():
+            setattr(checker_engine, name, value)
+        else:
+            raise SystemExit(f"unknown setting: {name}")
+
+
+# ---- phase timing ----
+class PhaseClock:
+    """Wraps engine functions (WRAPPED) and adds each call's self time to its phase."""
+
+    def __init__(self):
+        self.ms = {p: 0.0 for p in PHASES}
+        self._stack: List[float] = []  # time spent in nested wrapped calls, per open frame
+        self._saved: Dict[str, Any] = {}
+
+    def _wrap(self, fn, phase):
+        def timed(*args, **kwargs):
+            self._stack.append(0.0)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - t0
+                nested = self._stack.pop()
+                self.ms[phase] += (elapsed - nested) * 1000.0
+                if self._stack:
+                    self._stack[-1] += elapsed
+        return timed
+
+    def __enter__(self):
+        for name, phase in WRAPPED.items():
+            self._saved[name] = getattr(checker_engine, name)
+            setattr(checker_engine, name, self._wrap(self._saved[name], phase))
+        return self
+
+    def __exit__(self, *exc):
+        for name, fn in self._saved.items():
+            setattr(checker_engine, name, fn)
+
+
+def run_checker_pass(name: str, docs: List[Dict[str, Any]]) -> Tuple[List[bool], Dict[str, float], float]:
+    """([found per doc], {phase: ms}, wall ms) for one pass of one checker over docs."""
+    fn = CHECKERS[name]
+    found = []
+    with PhaseClock() as clock:
+        t0 = time.perf_counter()
+        for doc in docs:
+            found.append(fn(doc["path"], workers=1)["overall_status"] == "FOUND")
+        wall = (time.perf_counter() - t0) * 1000.0
+    return found, clock.ms, wall
+
+
+def accuracy(name: str, docs: List[Dict[str, Any]], found: List[bool]) -> Dict[str, Any]:
+    tp = fp = fn = tn = 0
+    errors = []
+    for doc, got in zip(docs, found):
+        want = EXPECTED[name][doc["scenario"]]
+        tp += got and want
+        fp += got and not want
+        fn += want and not got
+        tn += not (got or want)
+        if got != want:
+            errors.append(f"{os.path.basename(doc['path'])} noise={doc['noise']} table={doc['table']} "
+                          f"expected={'FOUND' if want else 'NOT_FOUND'}")
+    return {
+        "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+        "precision": round(tp / (tp + fp), 4) if tp + fp else 1.0,
+        "recall": round(tp / (tp + fn), 4) if tp + fn else 1.0,
+        "errors": errors,
+    }
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0  # KB on Linux
+
+
+# ---- baseline ----
+def regressions(current: Dict[str, Any], baseline: Dict[str, Any], tol: float) -> List[str]:
+    out = []
+    for name, cur in current["checkers"].items():
+        base = baseline["checkers"].get(name)
+        if base is None:
+            continue
+        for key in ("precision", "recall"):
+            if cur[key] < base[key]:
+                out.append(f"{name} {key} {base[key]:.3f} -> {cur[key]:.3f}")
+        for key in ("ms_per_page",) + tuple(f"phase_ms_per_page.{p}" for p in PHASES):
+            a, b = _get(base, key), _get(cur, key)
+            if a is not None and b is not None and b > a * (1 + tol) and b - a > 0.5:
+                out.append(f"{name} {key} {a:.2f} -> {b:.2f} ms")
+    a, b = baseline.get("peak_rss_mb"), current["peak_rss_mb"]
+    if a and b > a * (1 + tol):
+        out.append(f"peak_rss_mb {a:.0f} -> {b:.0f}")
+    return out
+
+
+def _get(d: Dict[str, Any], dotted: str):
+    for part in dotted.split("."):
+        if not isinstance(d, dict) or part not in d:
+            return None
+        d = d[part]
+    return d
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=40)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=2, help="timed passes per checker; the fastest counts")
+    ap.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE")
+    ap.add_argument("--out", help="write the results as JSON")
+    ap.add_argument("--baseline", help="JSON from an earlier --out to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed relative latency/RSS growth")
+    args = ap.parse_args()
+
+    apply_overrides(args.overrides)
+    docs = synthetic_docs(tempfile.mkdtemp(prefix="bench_accuracy_"), args.docs, args.seed)
+    n_pages = sum(d["pages"] for d in docs)
+
+    results: Dict[str, Any] = {
+        "docs": len(docs), "pages": n_pages, "seed": args.seed, "overrides": args.overrides, "checkers": {},
+    }
+    print(f"documents={len(docs)} pages={n_pages}  scenarios={', '.join(SCENARIOS)}")
+    print(f"{'checker':<12} {'prec':>5} {'recall':>6} {'pages/s':>8} {'ms/page':>8}  "
+          + " ".join(f"{p:>10}" for p in PHASES))
+    for name in CHECKERS:
+        best = None
+        for _ in range(max(1, args.repeat)):
+            run = run_checker_pass(name, docs)
+            if best is None or run[2] < best[2]:
+                best = run
+        found, phase_ms, wall = best
+        acc = accuracy(name, docs, found)
+        per_page = {p: round(phase_ms[p] / n_pages, 3) for p in PHASES}
+        results["checkers"][name] = dict(
+            acc,
+            params_version=params_version(name),
+            pages_per_s=round(n_pages / (wall / 1000.0), 2),
+            ms_per_page=round(wall / n_pages, 3),
+            phase_ms_per_page=per_page,
+        )
+        r = results["checkers"][name]
+        print(f"{name:<12} {r['precision']:5.3f} {r['recall']:6.3f} {r['pages_per_s']:8.1f} {r['ms_per_page']:8.2f}  "
+              + " ".join(f"{per_page[p]:10.2f}" for p in PHASES))
+        for err in acc["errors"]:
+            print("  MISS", err)
+    results["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    print(f"peak RSS {results['peak_rss_mb']:.1f} MB  (phase columns: self ms per page)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if (baseline.get("docs"), baseline.get("seed")) != (results["docs"], results["seed"]):
+            print(f"WARNING: baseline has docs={baseline.get('docs')} seed={baseline.get('seed')}; "
+                  "accuracy figures are not comparable")
+        found = regressions(results, baseline, args.tolerance)
+        print(f"regressions vs {args.baseline}: {len(found)}")
+        for line in found:
+            print("  REGRESSION", line)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
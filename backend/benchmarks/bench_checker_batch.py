@@ -0,0 +1,69 @@
+# backend/benchmarks/bench_checker_batch.py
+#
+# Batch checking (checker_batch.stream_batch): time to first streamed result and total
+# time for N files vs. checking them one after another in-process, and whether every
+# streamed report matches the sequential one. Run from backend/:
+#   python -m benchmarks.bench_checker_batch --files 40 --concurrency 4
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+
+from app.services.checker_batch import CHECKERS, batch_concurrency, stream_batch
+from app.services.checker_cache import report_cache
+from app.services.checker_pool import shutdown_page_pool
+from benchmarks.bench_roi_render import same_report
+from benchmarks.pdf_fixtures import corpus
+
+
+async def consume(checker, files, concurrency):
+    t0 = time.perf_counter()
+    first_ms = None
+    results = {}
+    async for raw in stream_batch(checker, files, concurrency=concurrency):
+        line = json.loads(raw)
+        if line["event"] == "file":
+            if first_ms is None:
+                first_ms = (time.perf_counter() - t0) * 1000.0
+            results[line["index"]] = line
+    return results, first_ms, (time.perf_counter() - t0) * 1000.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=40)
+    ap.add_argument("--concurrency", type=int, default=batch_concurrency())
+    args = ap.parse_args()
+    report_cache.max_bytes = 0  # measure checking, not the report cache (files repeat)
+
+    docs = [(p, c) for p, c, _ in corpus(tempfile.mkdtemp(prefix="bench_batch_"))]
+    files = [docs[i % len(docs)] for i in range(args.files)]
+    failures = 0
+
+    for checker in CHECKERS:
+        batch = [(f"{i}.pdf", p) for i, (p, _) in enumerate(files)]
+
+        t0 = time.perf_counter()
+        seq = [CHECKERS[checker](p, workers=1) for _, p in batch]
+        seq_ms = (time.perf_counter() - t0) * 1000.0
+
+        asyncio.run(consume(checker, batch[:1], args.concurrency))  # spawn/import the pool workers once
+        streamed, first_ms, total_ms = asyncio.run(consume(checker, batch, args.concurrency))
+
+        same = all(streamed[i]["ok"] and same_report(streamed[i]["report"], seq[i]) for i in range(len(batch)))
+        failures += 0 if same else 1
+        per_file = [streamed[i]["elapsed_ms"] for i in range(len(batch))]
+        print(f"{checker:<12} files={len(batch)} concurrency={args.concurrency}  "
+              f"sequential={seq_ms:8.1f} ms  "
+              f"batch={total_ms:8.1f} ms (first {first_ms:6.1f})  "
+              f"per-file max={max(per_file):6.1f} ms  identical={same}")
+
+    shutdown_page_pool()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# backend/benchmarks/bench_checker_cache.py
+#
+# Report cache (checker_cache): cold vs repeat check time per fixture document, whether
+# the cached report equals a fresh one, and that changing a threshold constant misses.
+# Uses a throwaway cache directory. Run from backend/:
+#   python -m benchmarks.bench_checker_cache
+
+import dataclasses
+import sys
+import tempfile
+import time
+
+from app.services import checker_cache, checker_engine
+from benchmarks.pdf_fixtures import corpus
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1000.0
+
+
+def main() -> int:
+    checker_cache.report_cache.directory = tempfile.mkdtemp(prefix="bench_cache_dir_")
+    docs = corpus(tempfile.mkdtemp(prefix="bench_cache_"))
+    failures = 0
+    print(f"{'document':<24} {'checker':<12} {'cold ms':>8} {'repeat ms':>9}  same")
+    for path, checker, _expected in docs:
+        cold, cold_ms = timed(checker_cache.run_checker_cached, checker, path)
+        warm, warm_ms = timed(checker_cache.run_checker_cached, checker, path)
+        same = cold == warm
+        failures += 0 if same else 1
+        print(f"{path.rsplit('/', 1)[-1][:-4]:<24} {checker:<12} {cold_ms:8.1f} {warm_ms:9.2f}  {same}")
+
+    path = docs[0][0]
+    profile = checker_engine.PROFILES["comp590"]
+    checker_engine.PROFILES["comp590"] = dataclasses.replace(profile, min_bbox_area=profile.min_bbox_area + 1)
+    _, changed_ms = timed(checker_cache.run_checker_cached, "comp590", path)
+    checker_engine.PROFILES["comp590"] = profile
+    print(f"after changing min_bbox_area: {changed_ms:.1f} ms (expected a miss)")
+    print(checker_cache.report_cache.stats())
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
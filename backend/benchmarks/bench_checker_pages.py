@@ -0,0 +1,60 @@
+# backend/benchmarks/bench_checker_pages.py
+#
+# Sequential vs process-pool page analysis in both PDF checkers on a generated
+# 40-page PDF, with a parity check (reports must be identical). Exits non-zero on mismatch.
+# Run from backend/:
+#   python -m benchmarks.bench_checker_pages --pages 40 --workers 4
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from app.services.checker_pool import page_workers, shutdown_page_pool
+from app.services.internship_report_checker import run_internship_checker
+from app.services.signaturechecker import run_signature_checker
+from benchmarks.bench_roi_render import same_report
+from benchmarks.pdf_fixtures import make_pdf
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, (time.perf_counter() - t0) * 1000.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=40)
+    ap.add_argument("--workers", type=int, default=page_workers())
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_pages_")
+    n = args.pages
+    # comp590: no label on first/last page -> fallback scans every page
+    fallback_pdf = make_pdf(os.path.join(tmp, "fallback.pdf"), n, unlabeled_signed_pages=[n // 2], seed=1)
+    # comp291-391: labels on a few pages, every page analyzed
+    labeled_pdf = make_pdf(os.path.join(tmp, "labeled.pdf"), n, label_pages=[3, n // 2, n - 1],
+                           signed_pages=[n // 2], seed=2)
+
+    print(f"pages={n} workers={args.workers} cpus={os.cpu_count()}")
+    failures = 0
+    for name, fn, path in (
+        ("comp590 fallback", run_signature_checker, fallback_pdf),
+        ("comp291-391", run_internship_checker, labeled_pdf),
+    ):
+        seq, seq_ms = timed(fn, path, workers=1)
+        fn(path, workers=args.workers)  # warm the pool (spawned workers import cv2/pdfium once)
+        par, par_ms = timed(fn, path, workers=args.workers)
+        same = same_report(seq, par)
+        failures += 0 if same else 1
+        print(f"{name:<18} sequential={seq_ms:8.1f} ms  pool={par_ms:8.1f} ms  "
+              f"speedup={seq_ms / par_ms:4.2f}x  identical={same}  status={par['overall_status']}")
+
+    shutdown_page_pool()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
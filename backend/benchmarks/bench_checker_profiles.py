@@ -0,0 +1,53 @@
+# backend/benchmarks/bench_checker_profiles.py
+#
+# Checker engine: one PDF against both profiles with run_profiles (one render and one mask
+# per distinct ROI per page, shared) vs the two checkers run one after the other, on the
+# fixture corpus plus randomized documents. Checks that each run_profiles report matches
+# the single-profile one (bench_roi_render.equivalent; clips differ when profiles are
+# combined). Exits non-zero on mismatch. Run from backend/:
+#   python -m benchmarks.bench_checker_profiles --docs 40
+
+import argparse
+import sys
+import tempfile
+import time
+
+from app.services.checker_engine import run_profiles
+from benchmarks.bench_dpi_pyramid import random_docs
+from benchmarks.bench_roi_render import CHECKERS, equivalent, same_report
+from benchmarks.pdf_fixtures import corpus
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=40, help="randomized documents on top of the labeled corpus")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_profiles_")
+    paths = [d[0] for d in corpus(tmp, seed=args.seed) + random_docs(tmp, args.docs, args.seed + 100)]
+    names = list(CHECKERS)
+
+    t0 = time.perf_counter()
+    separate = [{name: CHECKERS[name](path, workers=1) for name in names} for path in paths]
+    separate_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    combined = [run_profiles(names, path, workers=1) for path in paths]
+    combined_s = time.perf_counter() - t0
+
+    mismatches = [(path, name) for path, a, b in zip(paths, separate, combined)
+                  for name in names if not equivalent(a[name], b[name])]
+    exact = sum(all(same_report(a[name], b[name]) for name in names) for a, b in zip(separate, combined))
+
+    print(f"documents={len(paths)} profiles={names}")
+    print(f"one checker at a time : {separate_s * 1000:8.1f} ms")
+    print(f"run_profiles          : {combined_s * 1000:8.1f} ms  speedup {separate_s / combined_s:.2f}x")
+    print(f"identical documents={exact}/{len(paths)}  mismatches={len(mismatches)}")
+    for path, name in mismatches:
+        print("  MISMATCH", name, path)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_components.py
+#
+# checker_engine._component_candidates (array filtering/scoring + argpartition top-k) vs the
+# per-row Python loop it replaced, on full-page masks of synthetic noisy scans (speckle,
+# strokes, table lines) at DPI. Parity: identical candidates (scores, boxes, order) on the
+# scan masks and on random stats tables with many tied scores, for several max_keep and area
+# limits. Exits non-zero on mismatch. Run from backend/:
+#   python -m benchmarks.bench_components --pages 6
+
+import argparse
+import sys
+import time
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+from app.services.checker_engine import _component_candidates, _fine_mask
+from app.services.signaturechecker import PROFILE
+
+
+def loop_candidates(stats: np.ndarray, max_keep: int, min_area: int, max_area: int) -> List[Tuple[float, int, int, int, int]]:
+    """The previous implementation, for comparison."""
+    cands = []
+    for x, y, w, h, area in stats:
+        bbox_area = w * h
+        if bbox_area <= 0:
+            continue
+        if area < min_area or area > max_area:
+            continue
+        fill = area / float(bbox_area)
+        if fill > 0.75:
+            continue
+        score = float(area) * float(fill)
+        cands.append((score, x, y, w, h))
+    cands.sort(key=lambda t: t[0], reverse=True)
+    return [(s, int(x), int(y), int(w), int(h)) for s, x, y, w, h in cands[:max_keep]]
+
+
+def noisy_scan(rng: np.random.Generator, noise: float, w: int = 1870, h: int = 2420) -> np.ndarray:
+    """Gray page at 220 DPI: paper grain, speckle, a table, text-like dashes, a few strokes."""
+    gray = np.clip(rng.normal(235, 8, (h, w)), 0, 255).astype(np.uint8)
+    gray[rng.random((h, w)) < noise] = 30
+    for y in range(300, 1500, 120):
+        cv2.line(gray, (150, y), (w - 150, y), 40, 2)
+    for x in (150, 900, w - 150):
+        cv2.line(gray, (x, 300), (x, 1380), 40, 2)
+    for _ in range(400):
+        x, y = int(rng.integers(160, w - 300)), int(rng.integers(1500, h - 100))
+        cv2.rectangle(gray, (x, y), (x + int(rng.integers(20, 200)), y + 18), 50, -1)
+    for _ in range(6):
+        pts = np.cumsum(rng.integers(-12, 13, (40, 2)), axis=0) + rng.integers(300, 1500, 2)
+        cv2.polylines(gray, [pts.astype(np.int32)], False, 20, 3)
+    return gray
+
+
+def tied_stats(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Random (x, y, w, h, area) rows drawn from few values, so many scores tie."""
+    w = rng.choice([10, 20, 40], n)
+    h = rng.choice([10, 20, 40], n)
+    area = np.minimum(w * h, rng.choice([100, 200, 300, 400, 800], n))
+    xy = rng.integers(0, 1000, (n, 2))
+    return np.column_stack([xy, w, h, area]).astype(np.int32)
+
+
+def timed(fn, reps: int, *args) -> Tuple[object, float]:
+    best = float("inf")
+    out = None
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return out, best * 1000.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=6)
+    ap.add_argument("--reps", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    rng = np.random.default_rng(args.seed)
+    mismatches = 0
+
+    limits = (PROFILE.min_bbox_area, PROFILE.max_bbox_area)
+    print(f"{'noise':>6} {'components':>10} {'loop ms':>9} {'array ms':>9} {'speedup':>8}  same")
+    for i in range(args.pages):
+        noise = [0.002, 0.01, 0.03][i % 3]
+        _, stats = _fine_mask(noisy_scan(rng, noise))
+        old, old_ms = timed(loop_candidates, args.reps, stats, 3, *limits)
+        new, new_ms = timed(_component_candidates, args.reps, stats, 3, *limits)
+        same = old == new
+        for keep in (1, 2, 50):
+            for lo, hi in ((0, 10 ** 9), (50, 5000), limits):
+                same &= loop_candidates(stats, keep, lo, hi) == _component_candidates(stats, keep, lo, hi)
+        mismatches += 0 if same else 1
+        print(f"{noise:6.3f} {len(stats):10d} {old_ms:9.2f} {new_ms:9.2f} {old_ms / new_ms:7.1f}x  {same}")
+
+    ties_ok = True
+    for n in (0, 1, 5, 50, 5000):
+        stats = tied_stats(rng, n)
+        for keep in (0, 1, 2, 3, 10, n + 1):
+            for lo, hi in ((0, 10 ** 9), (150, 400)):
+                ties_ok &= loop_candidates(stats, keep, lo, hi) == _component_candidates(stats, keep, lo, hi)
+    mismatches += 0 if ties_ok else 1
+    print(f"tied-score tables identical: {ties_ok}")
+    print(f"mismatches={mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
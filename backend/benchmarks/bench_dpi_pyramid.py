@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_dpi_pyramid.py
+#
+# Coarse-to-fine (COARSE_DPI screen, DPI only where needed) vs always-DPI in both PDF
+# checkers. Runs the labeled fixture corpus plus randomized documents (labels, strokes,
+# tables, scan noise) and reports throughput, accuracy on the labeled corpus, and parity
+# with the always-DPI reports (same decisions, see bench_roi_render.equivalent).
+# Exits non-zero on any parity mismatch. Run from backend/:
+#   python -m benchmarks.bench_dpi_pyramid --docs 40
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.services import checker_engine
+from benchmarks.bench_roi_render import CHECKERS, equivalent
+from benchmarks.pdf_fixtures import corpus, make_pdf
+
+
+def random_docs(out_dir: str, n_docs: int, seed: int) -> list:
+    """[(path, checker, None), ...]: unlabeled random mixes for parity only."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(n_docs):
+        n = rng.randint(1, 6)
+        kw = dict(n_pages=n, noise=rng.choice([0.0, 0.0, 0.01, 0.03]), table=rng.random() < 0.7, seed=seed + i)
+        r = rng.random()
+        if r < 0.4:
+            labeled = [p for p in range(n) if rng.random() < 0.6]
+            kw.update(label_pages=labeled, signed_pages=[p for p in labeled if rng.random() < 0.5])
+        elif r < 0.7:
+            kw.update(unlabeled_signed_pages=[p for p in range(n) if rng.random() < 0.4])
+        path = make_pdf(os.path.join(out_dir, f"rand_{i}.pdf"), **kw)
+        out.append((path, "comp590" if i % 2 == 0 else "comp291-391", None))
+    return out
+
+
+def run_all(docs, coarse_dpi: int):
+    checker_engine.COARSE_DPI = coarse_dpi
+    reports = []
+    t0 = time.perf_counter()
+    for path, checker, _expected in docs:
+        reports.append(CHECKERS[checker](path, workers=1))
+    return reports, time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=40, help="randomized documents on top of the labeled corpus")
+    ap.add_argument("--coarse-dpi", type=int, default=checker_engine.COARSE_DPI)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_pyramid_")
+    docs = corpus(tmp, seed=args.seed) + random_docs(tmp, args.docs, args.seed + 100)
+    pages = sum(len(r["pages"]) for r in run_all(docs, 0)[0])  # also warms up
+
+    full, full_s = run_all(docs, 0)
+    pyr, pyr_s = run_all(docs, args.coarse_dpi)
+
+    mismatches = [d[0] for d, a, b in zip(docs, full, pyr) if not equivalent(a, b)]
+    labeled = [(d, a, b) for d, a, b in zip(docs, full, pyr) if d[2] is not None]
+    acc_full = sum((a["overall_status"] == "FOUND") == d[2] for d, a, _ in labeled)
+    acc_pyr = sum((b["overall_status"] == "FOUND") == d[2] for d, _, b in labeled)
+
+    print(f"documents={len(docs)} reported pages={pages} DPI={checker_engine.DPI} coarse={args.coarse_dpi}")
+    print(f"always DPI : {full_s * 1000:8.1f} ms  {pages / full_s:6.1f} pages/s  accuracy {acc_full}/{len(labeled)}")
+    print(f"pyramid    : {pyr_s * 1000:8.1f} ms  {pages / pyr_s:6.1f} pages/s  accuracy {acc_pyr}/{len(labeled)}")
+    print(f"speedup {full_s / pyr_s:.2f}x  parity mismatches={len(mismatches)}")
+    for path in mismatches:
+        print("  MISMATCH", path)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# backend/benchmarks/bench_event_loop.py
+#
+# Login latency while PDF checks run. Starts uvicorn (in a subprocess) on a small app with
+# the real checker routes, the old on-loop variant of the comp590 route for comparison,
+# and a login stand-in that does login's CPU work (bcrypt verify) without the database.
+# Reports login p50/p95/max idle, with checks on the event loop (old), and with checks on
+# the bounded executor (current). Run from backend/:
+#   python -m benchmarks.bench_event_loop --clients 3 --seconds 6
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from fastapi import FastAPI, File, UploadFile
+from pydantic import BaseModel
+
+from app.core.security import pwd_context, verify_password
+from app.routes import checkers
+from app.routes import metrics
+from app.services.signaturechecker import run_signature_checker
+
+# ---- server side (imported by uvicorn in the subprocess) ----
+app = FastAPI()
+app.include_router(checkers.router, prefix="/api/checkers")
+app.include_router(metrics.router, prefix="/api/metrics")
+
+_HASH = pwd_context.using(bcrypt__rounds=4).hash("secret")
+
+
+class _Login(BaseModel):
+    username: str
+    password: str
+
+
+@app.post("/api/login")
+def login(req: _Login):
+    return {"ok": verify_password(req.password, _HASH)}
+
+
+@app.post("/inline/comp590")
+async def check_inline(file: UploadFile = File(...)):
+    """The comp590 route before the executor: blocking save + checker on the event loop."""
+    path = os.path.join(tempfile.mkdtemp(prefix="pdf_"), "upload.pdf")
+    with open(path, "wb") as f:
+        f.write(file.file.read())
+    return run_signature_checker(path, debug=False)
+
+
+# ---- client side ----
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _request(port: int, method: str, path: str, body: bytes = b"", headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    conn.request(method, path, body=body, headers=headers or {})
+    resp = conn.getresponse()
+    data = resp.read()
+    conn.close()
+    return resp.status, data
+
+
+def _multipart(pdf_bytes: bytes):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"r.pdf\"\r\n"
+        f"Content-Type: application/pdf\r\n\r\n"
+    ).encode() + pdf_bytes + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+def _login_latencies(port: int, seconds: float):
+    body = json.dumps({"username": "u", "password": "secret"}).encode()
+    out = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        t0 = time.perf_counter()
+        status, _ = _request(port, "POST", "/api/login", body, {"Content-Type": "application/json"})
+        assert status == 200, status
+        out.append((time.perf_counter() - t0) * 1000.0)
+        time.sleep(0.05)
+    return out
+
+
+def _summary(name: str, lat, extra: str = "") -> None:
+    lat = sorted(lat)
+    p = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))]
+    print(f"{name:<28} n={len(lat):4d}  p50={p(0.5):7.1f} ms  p95={p(0.95):7.1f} ms  max={lat[-1]:7.1f} ms  {extra}")
+
+
+def _under_load(port: int, path: str, pdf_bytes: bytes, clients: int, seconds: float, name: str) -> None:
+    stop = threading.Event()
+    codes = {}
+
+    def client():
+        while not stop.is_set():
+            body, headers = _multipart(pdf_bytes)
+            status, _ = _request(port, "POST", path, body, headers)
+            codes[status] = codes.get(status, 0) + 1
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    time.sleep(0.5)
+    lat = _login_latencies(port, seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    _summary(name, lat, f"checker responses={codes}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=3, help="concurrent checker uploads")
+    ap.add_argument("--seconds", type=float, default=6.0)
+    args = ap.parse_args()
+
+    from benchmarks.pdf_fixtures import make_pdf
+
+    # no label on first/last page: full fallback scan, the slowest path (~0.3-0.5 s)
+    pdf_path = make_pdf(os.path.join(tempfile.mkdtemp(prefix="bench_loop_"), "r.pdf"), 8,
+                        unlabeled_signed_pages=[4], seed=3)
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+
+    port = _free_port()
+    env = dict(os.environ, CHECKER_CACHE_MAX_MB="0")  # every upload really runs the checker
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_event_loop:app", "--port", str(port),
+         "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        for _ in range(100):
+            try:
+                _request(port, "GET", "/api/metrics/executors")
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        print(f"cpus={os.cpu_count()} clients={args.clients} seconds={args.seconds}")
+        _summary("idle", _login_latencies(port, args.seconds))
+        _under_load(port, "/inline/comp590", pdf_bytes, args.clients, args.seconds, "checks on event loop (old)")
+        _under_load(port, "/api/checkers/comp590", pdf_bytes, args.clients, args.seconds, "checks on executor")
+        print("executor:", json.loads(_request(port, "GET", "/api/metrics/executors")[1])["checker"])
+        print("scratch:", json.loads(_request(port, "GET", "/api/metrics/scratch")[1]))
+    finally:
+        server.terminate()
+        server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# backend/benchmarks/bench_roi_pipeline.py
+#
+# ROI preprocessing (binarize -> table-line removal -> opening -> components) with the
+# kernel cache and per-thread scratch buffers (checker_engine.BUFFER_POOL) vs the previous
+# allocate-everything version, on the label ROIs of the fixture corpus plus randomized
+# documents, full-DPI and coarse. Reports time per ROI and the peak traced numpy memory
+# while processing one ROI; masks and stats must be identical. Exits non-zero on mismatch.
+# Run from backend/:
+#   python -m benchmarks.bench_roi_pipeline --docs 20 --repeat 5
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+import pypdfium2 as pdfium
+
+from app.services import checker_engine, internship_report_checker, signaturechecker
+from app.services.checker_engine import (
+    DPI, _coarse_mask, _fine_mask, _odd, build_rois_for_label, find_label_boxes_pdf_coords,
+)
+from app.services.pdf_render import page_size_px, render_gray
+from app.services.pdf_text import PageText, pdf_box_to_pixel_box
+from benchmarks.bench_dpi_pyramid import random_docs
+from benchmarks.pdf_fixtures import corpus
+
+
+# ---- previous implementation, for comparison ----
+def _old_binarize(gray, blur=5, block=31):
+    gray = cv2.GaussianBlur(gray, (blur, blur), 0)
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, block, 10)
+
+
+def _old_remove_table_lines(bw):
+    h, w = bw.shape
+    h_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(30, w // 25), 1))
+    h_lines = cv2.morphologyEx(bw, cv2.MORPH_OPEN, h_kernel, iterations=1)
+    v_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(30, h // 25)))
+    v_lines = cv2.morphologyEx(bw, cv2.MORPH_OPEN, v_kernel, iterations=1)
+    lines = cv2.bitwise_or(h_lines, v_lines)
+    return cv2.bitwise_and(bw, cv2.bitwise_not(lines))
+
+
+def old_fine_mask(gray):
+    bw = _old_remove_table_lines(_old_binarize(gray))
+    bw = cv2.morphologyEx(bw, cv2.MORPH_OPEN, np.ones((3, 3), np.uint8), iterations=1)
+    return bw, cv2.connectedComponentsWithStats(bw, connectivity=8)[2][1:]
+
+
+def old_coarse_mask(gray, k):
+    bw = _old_remove_table_lines(_old_binarize(gray, blur=_odd(5 * k), block=_odd(31 * k)))
+    return bw, cv2.connectedComponentsWithStats(bw, connectivity=8)[2][1:]
+
+
+# ---- inputs ----
+def label_rois(paths, profiles):
+    """Gray crops of every label ROI (right and below) of `profiles`, at DPI and at COARSE_DPI."""
+    scale = DPI / 72.0
+    k = checker_engine.COARSE_DPI / DPI
+    fine, coarse = [], []
+    for path in paths:
+        pdf = pdfium.PdfDocument(path)
+        for pidx in range(len(pdf)):
+            text = PageText(pdf[pidx], scale)
+            W, H = page_size_px(text.page, scale)
+            for profile in profiles:
+                for hit in find_label_boxes_pdf_coords(profile, text):
+                    lx, ly, lw, lh = pdf_box_to_pixel_box(hit["box_pdf"], float(text.page.get_height()), scale)
+                    for box in build_rois_for_label(profile, lx, ly, lw, lh, W, H):
+                        fine.append(render_gray(text.page, scale, box)[0])
+                        coarse.append(cv2.resize(fine[-1], None, fx=k, fy=k, interpolation=cv2.INTER_AREA))
+        pdf.close()
+    return fine, coarse
+
+
+def run(fn, rois, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for g in rois:
+            fn(g)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0 / len(rois)
+
+
+def memory(fn, rois):
+    """Mean peak traced KB while processing one ROI (numpy/OpenCV outputs are traced)."""
+    peaks = []
+    tracemalloc.start()
+    for g in rois:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        fn(g)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return sum(peaks) / len(peaks) / 1024.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=20, help="randomized documents on top of the labeled corpus")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_roi_pipe_")
+    paths = [d[0] for d in corpus(tmp) + random_docs(tmp, args.docs, 7)]
+    fine, coarse = label_rois(paths, [signaturechecker.PROFILE, internship_report_checker.PROFILE])
+    k = checker_engine.COARSE_DPI / DPI
+    cases = [
+        ("full DPI", fine, old_fine_mask, _fine_mask),
+        ("coarse", coarse, lambda g: old_coarse_mask(g, k), lambda g: _coarse_mask(g, k)),
+    ]
+
+    mismatches = 0
+    print(f"ROIs={len(fine)}  mean size={np.mean([g.size for g in fine]) / 1e3:.0f} kpx at DPI")
+    print(f"{'pass':<9} {'old ms':>7} {'new ms':>7} {'old peak KB':>12} {'new peak KB':>12}  same")
+    for name, rois, old, new in cases:
+        same = True
+        for g in rois:
+            (ma, sa), (mb, sb) = old(g), new(g)
+            same &= np.array_equal(ma, mb) and np.array_equal(sa, sb)
+        mismatches += 0 if same else 1
+        old_ms, new_ms = run(old, rois, args.repeat), run(new, rois, args.repeat)
+        old_peak, new_peak = memory(old, rois), memory(new, rois)
+        print(f"{name:<9} {old_ms:7.3f} {new_ms:7.3f} {old_peak:12.1f} {new_peak:12.1f}  {same}")
+    print(f"mismatches={mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
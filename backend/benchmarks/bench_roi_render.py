@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_roi_render.py
+#
+# Full-page vs ROI-only rendering (RENDER_ROIS_ONLY) in both PDF checkers: wall time and
+# peak traced memory per document on the fixture corpus, plus a parity check. Clipped
+# renders can differ from a full render by a few gray levels on anti-aliased edges, so
+# parity means same statuses, ROIs and candidate boxes, with scores within SCORE_RTOL;
+# "exact" reports whether the whole report is identical. Exits non-zero on mismatch.
+# Run from backend/:
+#   python -m benchmarks.bench_roi_render --repeat 3
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict
+
+from app.services import checker_engine, internship_report_checker, signaturechecker
+from benchmarks.pdf_fixtures import corpus
+
+CHECKERS = {
+    "comp590": signaturechecker.run_signature_checker,
+    "comp291-391": internship_report_checker.run_internship_checker,
+}
+
+SCORE_RTOL = 0.02
+
+TIMING_KEYS = ("phase_ms", "timings")  # wall-clock fields, never equal between runs
+
+
+def same_report(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """Reports identical apart from TIMING_KEYS."""
+    return ({k: v for k, v in a.items() if k not in TIMING_KEYS}
+            == {k: v for k, v in b.items() if k not in TIMING_KEYS})
+
+
+def equivalent(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """Reports equal except candidate scores, which may differ by SCORE_RTOL."""
+    if a.get("overall_status") != b.get("overall_status") or len(a["pages"]) != len(b["pages"]):
+        return False
+    for pa, pb in zip(a["pages"], b["pages"]):
+        if pa["page_status"] != pb["page_status"] or len(pa["hits"]) != len(pb["hits"]):
+            return False
+        for ha, hb in zip(pa["hits"], pb["hits"]):
+            ca, cb = ha["candidates"], hb["candidates"]
+            if {k: v for k, v in ha.items() if k != "candidates"} != {k: v for k, v in hb.items() if k != "candidates"}:
+                return False
+            if len(ca) != len(cb):
+                return False
+            for x, y in zip(ca, cb):
+                if x["where"] != y["where"] or x["bbox_px"] != y["bbox_px"]:
+                    return False
+                if abs(x["score"] - y["score"]) > SCORE_RTOL * max(abs(x["score"]), abs(y["score"])):
+                    return False
+    return True
+
+
+def measure(fn, path, rois_only: bool, repeat: int):
+    """(report, best wall ms, peak traced MB). numpy buffers are traced, pdfium's are not."""
+    checker_engine.RENDER_ROIS_ONLY = rois_only
+    best = float("inf")
+    report = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        report = fn(path, workers=1)
+        best = min(best, (time.perf_counter() - t0) * 1000.0)
+    tracemalloc.start()
+    fn(path, workers=1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return report, best, peak / 1e6
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    docs = corpus(tempfile.mkdtemp(prefix="bench_roi_"))
+    print(f"{'document':<24} {'checker':<12} {'full ms':>8} {'roi ms':>8} {'full MB':>8} {'roi MB':>8}  same  exact")
+    failures = 0
+    totals = [0.0, 0.0]
+    for path, checker, _expected in docs:
+        fn = CHECKERS[checker]
+        full, full_ms, full_mb = measure(fn, path, False, args.repeat)
+        roi, roi_ms, roi_mb = measure(fn, path, True, args.repeat)
+        same = equivalent(full, roi)
+        failures += 0 if same else 1
+        totals[0] += full_ms
+        totals[1] += roi_ms
+        name = path.rsplit("/", 1)[-1][:-4]
+        print(f"{name:<24} {checker:<12} {full_ms:8.1f} {roi_ms:8.1f} {full_mb:8.1f} {roi_mb:8.1f}  {str(same):<5} {same_report(full, roi)}")
+
+    print(f"total: full={totals[0]:.1f} ms  roi={totals[1]:.1f} ms  mismatches={failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# backend/benchmarks/check_query_counts.py
+#
+# Query-count regression check: list endpoints must issue a constant number of
+# statements no matter how many rows they return (no N+1). Uses a fake
+# connection, so no database is needed. Exits non-zero on regression.
+# Run from backend/:
+#   python -m benchmarks.check_query_counts
+
+import re
+import sys
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.services import course_services, professors_services, ta_services
+
+
+class FakeCursor:
+    def __init__(self, db: "FakeDB"):
+        self.db = db
+        self._rows: List[Dict[str, Any]] = []
+
+    def execute(self, sql: str, params=()):
+        self.db.statements.append(sql)
+        self._rows = [dict(r) for r in self.db.answer(sql, list(params or ()))]
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    """Answers SQL by the first table-ish pattern that matches; counts statements."""
+
+    def __init__(self, routes: List[Tuple[str, Callable[[List[Any]], List[Dict[str, Any]]]]]):
+        self.routes = [(re.compile(p, re.IGNORECASE | re.DOTALL), fn) for p, fn in routes]
+        self.statements: List[str] = []
+
+    def answer(self, sql: str, params: List[Any]):
+        for pattern, fn in self.routes:
+            if pattern.search(sql):
+                return fn(params)
+        return []
+
+    @contextmanager
+    def connection(self):
+        db = self
+
+        class Conn:
+            def cursor(self, dictionary=False):
+                return FakeCursor(db)
+
+            def commit(self):
+                pass
+
+        yield Conn()
+
+
+def professors_db(n: int) -> FakeDB:
+    profs = [{"professor_id": i, "name": f"Prof {i:04d}"} for i in range(1, n + 1)]
+    return FakeDB([
+        (r"FROM professor_preferred_ta", lambda ids: [
+            {"professor_id": pid, "ta_id": pid * 10 + k, "name": f"TA {pid}-{k}",
+             "program": "PhD", "level": "G", "max_hours": 10}
+            for pid in ids for k in range(2)
+        ]),
+        (r"FROM professor", lambda _p: profs),
+    ])
+
+
+def tas_db(n: int) -> FakeDB:
+    tas = [{"ta_id": i, "name": f"TA {i:04d}", "program": "PhD", "level": "G", "max_hours": 10}
+           for i in range(1, n + 1)]
+    return FakeDB([
+        (r"FROM ta_preferred_professor", lambda ids: [
+            {"ta_id": tid, "professor_id": 1, "name": "Prof 1"} for tid in ids
+        ]),
+        (r"FROM ta_skill", lambda ids: [{"ta_id": tid, "skill": "python"} for tid in ids]),
+        (r"FROM ta\b", lambda _p: tas),
+    ])
+
+
+def courses_db(n: int) -> FakeDB:
+    courses = [{"course_id": i, "course_code": f"COMP{i:04d}", "ps_lab_sections": None,
+                "enrollment_capacity": 60, "actual_enrollment": 55, "num_tas_requested": 2,
+                "assigned_tas_count": 0} for i in range(1, n + 1)]
+    return FakeDB([
+        (r"FROM user", lambda _p: [{"professor_id": 1, "ta_id": 1}]),
+        (r"FROM course_skill", lambda ids: [{"course_id": cid, "skill": "python"} for cid in ids]),
+        (r"FROM course_professor cp\s+JOIN professor", lambda ids: [
+            {"course_id": cid, "name": f"Prof {k}"} for cid in ids for k in range(2)
+        ]),
+        (r"FROM ta_assignment\s+JOIN ta\b", lambda ids: [
+            {"course_id": cid, "name": f"TA {cid}"} for cid in ids
+        ]),
+        (r"FROM (course|ta_assignment)\b", lambda _p: courses),
+    ])
+
+
+CHECKS = [
+    # (name, module whose db_connection is patched, callable, db factory, expected statements)
+    ("get_all_professors", professors_services, professors_services.get_all_professors, professors_db, 2),
+    ("get_all_tas", ta_services, ta_services.get_all_tas, tas_db, 3),
+    ("get_courses", course_services, course_services.get_courses, courses_db, 4),
+    ("get_courses_by_professor_username", course_services,
+     lambda: course_services.get_courses_by_professor_username("prof"), courses_db, 4),
+    ("get_courses_by_ta_username", course_services,
+     lambda: course_services.get_courses_by_ta_username("ta"), courses_db, 5),
+]
+
+
+def main() -> int:
+    failures = 0
+    for name, module, fn, make_db, expected in CHECKS:
+        counts = []
+        for n in (3, 300):
+            db = make_db(n)
+            original = module.db_connection
+            module.db_connection = db.connection
+            try:
+                fn()
+            finally:
+                module.db_connection = original
+            counts.append(len(db.statements))
+        ok = all(c == expected for c in counts)
+        failures += 0 if ok else 1
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: statements for 3 / 300 rows = {counts} (expected {expected})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# backend/benchmarks/pdf_fixtures.py
+#
+# Synthetic PDFs for the checker benchmarks: typed paragraphs, optional "... Signature:"
+# labels, hand-drawn-looking strokes (the "signature"), table grid lines, and an optional
+# scanned-noise variant (a speckled raster image under the text).
+# Needs reportlab (dev only, not in requirements.txt): pip install reportlab
+
+import random
+from typing import Iterable
+
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+except ImportError as e:  # pragma: no cover - dev dependency
+    raise SystemExit("benchmarks need reportlab: pip install reportlab") from e
+
+import numpy as np
+
+WORDS = (
+    "internship report project course supervisor student department work week task "
+    "system design implementation testing results analysis team company software data"
+).split()
+
+
+def _paragraph(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def _draw_signature(c: "canvas.Canvas", rng: random.Random, x: float, y: float, width: float = 150.0) -> None:
+    """A few overlapping bezier loops, roughly signature-sized."""
+    c.setLineWidth(rng.uniform(1.2, 2.0))
+    px, py = x, y
+    for _ in range(rng.randint(4, 7)):
+        dx = width / 5.0
+        c.bezier(
+            px, py,
+            px + rng.uniform(0, dx), py + rng.uniform(8, 22),
+            px + rng.uniform(0, dx), py - rng.uniform(8, 22),
+            px + dx, py + rng.uniform(-6, 6),
+        )
+        px, py = px + dx * rng.uniform(0.6, 0.9), py + rng.uniform(-4, 4)
+
+
+def _noise_image(rng: random.Random, w: int, h: int, density: float):
+    arr = np.full((h, w), 255, dtype=np.uint8)
+    n = int(w * h * density)
+    ys = np.array([rng.randrange(h) for _ in range(n)])
+    xs = np.array([rng.randrange(w) for _ in range(n)])
+    arr[ys, xs] = 0
+    from PIL import Image  # reportlab depends on pillow
+    return ImageReader(Image.fromarray(arr, mode="L"))
+
+
+def make_pdf(
+    path: str,
+    n_pages: int,
+    label_pages: Iterable[int] = (),
+    signed_pages: Iterable[int] = (),
+    unlabeled_signed_pages: Iterable[int] = (),
+    label_text: str = "Supervisor Signature:",
+    table: bool = True,
+    noise: float = 0.0,
+    seed: int = 0,
+) -> str:
+    """
+    Write an n_pages PDF to `path` (page numbers below are 0-based):
+      label_pages:            pages with a typed signature label
+      signed_pages:           labeled pages that also get strokes right of the label
+      unlabeled_signed_pages: strokes with no label (exercises the fallback scan)
+      table:                  a ruled table on every page (line-removal path)
+      noise:                  fraction of speckled pixels in a background raster (0 = none)
+    """
+    rng = random.Random(seed)
+    label_pages, signed_pages, unlabeled = set(label_pages), set(signed_pages), set(unlabeled_signed_pages)
+    W, H = letter
+    c = canvas.Canvas(path, pagesize=letter)
+
+    for p in range(n_pages):
+        if noise > 0:
+            c.drawImage(_noise_image(rng, 306, 396, noise), 0, 0, width=W, height=H)
+
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(72, H - 72, f"Weekly report, page {p + 1}")
+        c.setFont("Helvetica", 10)
+        y = H - 100
+        for _ in range(rng.randint(8, 14)):
+            c.drawString(72, y, _paragraph(rng, rng.randint(8, 12)))
+            y -= 14
+
+        if table:
+            top, rows, cols = y - 20, 5, 4
+            for r in range(rows + 1):
+                c.line(72, top - r * 18, W - 72, top - r * 18)
+            for k in range(cols + 1):
+                x = 72 + k * (W - 144) / cols
+                c.line(x, top, x, top - rows * 18)
+            y = top - rows * 18 - 30
+
+        if p in label_pages:
+            c.setFont("Helvetica", 11)
+            c.drawString(72, 120, label_text)
+            if p in signed_pages:
+                _draw_signature(c, rng, 72 + c.stringWidth(label_text, "Helvetica", 11) + 20, 124)
+        elif p in unlabeled:
+            _draw_signature(c, rng, W / 2, 110)
+
+        c.showPage()
+
+    c.save()
+    return path
+
+
+def corpus(out_dir: str, seed: int = 0) -> list:
+    """
+    Small labeled corpus: [(path, checker, expected_found), ...] covering signed/unsigned,
+    labeled/unlabeled, table and noisy variants for both checkers.
+    """
+    import os
+
+    os.makedirs(out_dir, exist_ok=True)
+    specs = [
+        # name, kwargs, checker, expected overall FOUND
+        ("c590_signed_last", dict(n_pages=6, label_pages=[5], signed_pages=[5]), "comp590", True),
+        ("c590_unsigned_last", dict(n_pages=6, label_pages=[5]), "comp590", False),
+        ("c590_signed_first", dict(n_pages=4, label_pages=[0], signed_pages=[0]), "comp590", True),
+        ("c590_fallback_signed", dict(n_pages=5, unlabeled_signed_pages=[2]), "comp590", True),
+        ("c590_signed_noisy", dict(n_pages=3, label_pages=[2], signed_pages=[2], noise=0.01), "comp590", True),
+        ("c291_signed_mid", dict(n_pages=15, label_pages=[7], signed_pages=[7]), "comp291-391", True),
+        ("c291_unsigned", dict(n_pages=15, label_pages=[7, 14]), "comp291-391", False),
+        ("c291_signed_two", dict(n_pages=12, label_pages=[3, 11], signed_pages=[11],
+                                 label_text="Student Signature:"), "comp291-391", True),
+        ("c291_no_label", dict(n_pages=8), "comp291-391", False),
+        ("c291_signed_noisy", dict(n_pages=6, label_pages=[5], signed_pages=[5], noise=0.01), "comp291-391", True),
+    ]
+    out = []
+    for i, (name, kw, checker, expected) in enumerate(specs):
+        path = os.path.join(out_dir, f"{name}.pdf")
+        make_pdf(path, seed=seed + i, **kw)
+        out.append((path, checker, expected))
+    return out
@@ -6,6 +6,7 @@ import { Badge } from './ui/badge';
 import { Slider } from './ui/slider';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from './ui/tabs';
 import { apiUrl } from '../lib/api';
+import { runAssignmentJob } from '../lib/assignmentJobs';
 import {
   Dialog,
   DialogContent,
@@ -176,7 +177,7 @@ export default function TAAssignmentCoordinator({
   const runAssignment = async () => {
     setLoading(true);
     try {
-      await fetch(apiUrl(`/api/run-assignment?user=Admin`));
+      await runAssignmentJob('Admin');
       
       const saved = await fetch(apiUrl("/api/get-assignments"));
       const savedData = await saved.json();
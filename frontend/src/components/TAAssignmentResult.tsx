@@ -3,7 +3,7 @@ import { Loader2 } from "lucide-react";
 import { Card, CardContent, CardHeader, CardTitle } from "./ui/card";
 import { Badge } from "./ui/badge";
 import { Button } from "./ui/button";
-import { apiUrl } from "../lib/api";
+import { runAssignmentJob } from "../lib/assignmentJobs";
 
 interface AssignmentResult {
   assignments: Record<string, string[]>;
@@ -19,9 +19,7 @@ export default function TAAssignmentResult() {
     async function fetchAssignment() {
       setLoading(true);
       try {
-        const res = await fetch(apiUrl("/api/run-assignment"));
-        if (!res.ok) throw new Error("Failed to fetch assignments");
-        const data = await res.json();
+        const data = await runAssignmentJob<AssignmentResult>();
         setResult(data);
       } catch (err: any) {
         console.error(err);
@@ -0,0 +1,56 @@
+import { apiUrl } from "./api";
+
+export type AssignmentMode = "greedy" | "optimal";
+
+export type JobStatus = "queued" | "running" | "succeeded" | "failed";
+
+export type Job<T = any> = {
+  job_id: string;
+  kind: string;
+  params: Record<string, any>;
+  status: JobStatus;
+  phase: string | null;
+  progress: number;
+  result?: T | null;
+  error: string | null;
+};
+
+export type JobSubmission = {
+  job_id: string;
+  status: JobStatus;
+  coalesced: boolean;
+  mode: AssignmentMode;
+  user: string;
+  status_url: string;
+};
+
+const POLL_MS = 1000;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Queue an assignment run (POST /api/run-assignment/jobs), then poll GET /api/jobs/{id}
+// until it finishes. Resolves with the run's result, rejects with the job's error (or the
+// 409 message when a run in the other mode is already in progress).
+export async function runAssignmentJob<T = any>(
+  user = "System",
+  mode: AssignmentMode = "greedy",
+  onProgress?: (job: Job<T>) => void
+): Promise<T> {
+  const params = new URLSearchParams({ user, mode });
+  const res = await fetch(apiUrl(`/api/run-assignment/jobs?${params}`), { method: "POST" });
+  if (!res.ok) {
+    const text = await res.text().catch(() => "");
+    throw new Error(text || `Failed to start assignment run (${res.status})`);
+  }
+  const submission = (await res.json()) as JobSubmission;
+
+  for (;;) {
+    const poll = await fetch(apiUrl(`/api/jobs/${submission.job_id}`));
+    if (!poll.ok) throw new Error(`Failed to fetch job status (${poll.status})`);
+    const job = (await poll.json()) as Job<T>;
+    onProgress?.(job);
+    if (job.status === "succeeded") return job.result as T;
+    if (job.status === "failed") throw new Error(job.error || "Assignment run failed");
+    await sleep(POLL_MS);
+  }
+}